@@ -0,0 +1,49 @@
+"""
+Benchmark for drawing and discarding with a deck near the maximum size.
+
+Run from the repository root:
+    python -m benchmarks.card_pile_benchmark
+"""
+import timeit
+import utils.constants as c
+from core.registries import Registries
+from core.combatants import Combatant
+from gameplay.combat_session import CombatSession
+
+CARD_ID = "IRON_LONGSWORD"
+CYCLES = 2000
+SEED = 0
+
+def create_combatant(registries) -> Combatant:
+    """
+    Create a combatant whose deck is at the maximum deck size.
+    """
+    deck_list = [{"card": CARD_ID, "quantity": c.MAX_DECK_SIZE}]
+    return Combatant(
+        "Benchmark", c.STARTING_HEALTH, c.STARTING_STAMINA,
+        c.STARTING_MAGICKA, deck_list, registries, True,
+        registries.statuses.event_manager
+        )
+
+def main():
+    """
+    Time full-hand draw and discard cycles.
+    """
+    registries = Registries(CombatSession.create_event_manager(), seed=SEED)
+    combatant = create_combatant(registries)
+    card_manager = combatant.card_manager
+
+    def cycle():
+        card_manager.draw(combatant, registries, c.MAX_HAND_SIZE)
+        card_manager.discard_hand(combatant)
+
+    seconds = timeit.timeit(cycle, number=CYCLES)
+    per_cycle = seconds / CYCLES * 1e6
+    print(
+        f"Draw and discard {c.MAX_HAND_SIZE} cards from a "
+        f"{c.MAX_DECK_SIZE}-card deck: {per_cycle:.1f} us per cycle"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory benchmark for the objects created by combat and simulation workers.
+
+Run from the repository root:
+    python -m benchmarks.memory_benchmark
+"""
+import gc
+import tracemalloc
+from core.registries import Registries
+from core.player import Player
+from gameplay.combat_session import CombatSession
+
+COMBATANT_PAIRS = 200
+ENEMY_ID = "CLIFF_RACER"
+CHARACTER_CLASS = "FIGHTER"
+SEED = 0
+
+def measure(function) -> tuple:
+    """
+    Return the result of calling the function and the bytes it left
+    allocated.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+def measure_worker() -> int:
+    """
+    Measure the registries a simulation worker keeps loaded.
+    """
+    _, allocated = measure(
+        lambda: Registries(CombatSession.create_event_manager(), seed=SEED)
+        )
+    return allocated
+
+def measure_combat(registries) -> int:
+    """
+    Measure one player and enemy pair, averaged over many pairs.
+    """
+    event_manager = registries.statuses.event_manager
+    def create_pairs():
+        return [
+            (
+                Player(registries, CHARACTER_CLASS, event_manager),
+                registries.enemies.create_enemy(ENEMY_ID, registries, None)
+            )
+            for _ in range(COMBATANT_PAIRS)
+            ]
+    _, allocated = measure(create_pairs)
+    return allocated // COMBATANT_PAIRS
+
+def main():
+    """
+    Print the memory used per simulation worker and per combat.
+    """
+    registries = Registries(CombatSession.create_event_manager(), seed=SEED)
+    # Warm up lazily created effects and card templates
+    measure_combat(registries)
+    print(f"Registries per worker: {measure_worker() / 1024:.1f} KiB")
+    print(f"Player and enemy per combat: {measure_combat(registries) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """Game controller module."""
+from utils.constants import LogLevel
 
 class Controller:
     """Game controller to manage game state and GUI."""
@@ -20,11 +21,11 @@ class Controller:
     
     def display_hand(self, hand):
         """Display the player's hand in the GUI."""
-        self.app.game.screen.hand.clear_hand()
-        for card in reversed(hand[:]):
-            self.app.game.screen.hand.draw(
-                card.get_card_data(self.game.player, self.game.registries.attributes)
-                )
+        cards_data = [
+            card.get_card_data(self.game.player, self.game.registries.attributes)
+            for card in hand
+            ]
+        self.app.game.screen.hand.sync_hand(cards_data)
 
     # Game events
 
@@ -39,55 +40,56 @@ class Controller:
         self.event_manager.subscribe('end_enemy_turn', self.handle_end_enemy_turn)
         self.event_manager.subscribe('end_combat', self.handle_end_combat)
         self.event_manager.subscribe('debug_command_executed', self.handle_debug_command_executed)
+        self.event_manager.subscribe('update_stats', self.handle_update_stats)
 
     def handle_start_game(self):
         """Handle starting the game."""
-        self.event_manager.logger.log("Game event fired: start_game", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: start_game", subsystem="events")
         self.app.run()
 
     def handle_start_quest(self, quest):
         """Handle starting a quest."""
-        self.event_manager.logger.log("Game event fired: start_quest", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: start_quest", subsystem="events")
         self.app.game.start_quest(quest)
 
     def handle_start_combat(self, enemy):
         """Handle starting combat."""
-        self.event_manager.logger.log("Game event fired: start_combat", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: start_combat", subsystem="events")
         self.app.game.start_combat(self.game.player.get_combatant_data(), enemy.get_combatant_data())
     
     def handle_start_action_phase(self, hand):
         """Handle starting the action phase."""
-        self.event_manager.logger.log("Game event fired: start_action_phase", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: start_action_phase", subsystem="events")
         self.send_logs()
-        self.app.game.screen.update_stats('player', self.game.player.get_combatant_data())
+        self.event_manager.dispatch('update_stats', 'player')
         self.display_hand(hand)
 
     def handle_card_not_playable(self):
         """Handle a card that cannot be played."""
-        self.event_manager.logger.log("Game event fired: card_not_playable", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: card_not_playable", subsystem="events")
         self.send_logs()
         self.app.game.screen.invalid_play()
 
     def handle_card_resolved(self):
         """Handle a card that has been resolved."""
-        self.event_manager.logger.log("Game event fired: card_resolved", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: card_resolved", subsystem="events")
         self.send_logs()
-        self.app.game.screen.update_stats('player', self.game.player.get_combatant_data())
-        self.app.game.screen.update_stats('enemy', self.game.enemy.get_combatant_data())
+        self.event_manager.dispatch('update_stats', 'player')
+        self.event_manager.dispatch('update_stats', 'enemy')
         self.app.game.screen.animation_layer.children[-1].show_card_effect()
         self.display_hand(self.game.player.card_manager.hand)
 
     def handle_end_enemy_turn(self):
         """Handle end of enemy turn."""
-        self.event_manager.logger.log("Game event fired: end_enemy_turn", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: end_enemy_turn", subsystem="events")
         self.send_logs()
-        self.app.game.screen.update_stats('player', self.game.player.get_combatant_data())
-        self.app.game.screen.update_stats('enemy', self.game.enemy.get_combatant_data())
+        self.event_manager.dispatch('update_stats', 'player')
+        self.event_manager.dispatch('update_stats', 'enemy')
         self.event_manager.dispatch('start_player_turn')
     
     def handle_end_combat(self):
         """Handle end of combat."""
-        self.event_manager.logger.log("Game event fired: end_combat", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "Game event fired: end_combat", subsystem="events")
         if self.game.player.is_alive():
             self.game.player.combat_cleanup(self.game.registries)
             rewards = self.game.enemy.get_rewards(
@@ -102,12 +104,21 @@ class Controller:
     
     def handle_debug_command_executed(self, command, success, message):
         """Handle a debug command being executed."""
-        self.event_manager.logger.log(f"Game event fired: debug_command_executed with success={success} and message='{message}'", True)
+        self.event_manager.logger.log(
+            LogLevel.DEBUG,
+            "Game event fired: debug_command_executed with success={} and message='{}'",
+            success, message, subsystem="events"
+            )
         self.display_hand(self.game.player.card_manager.hand)
-        self.app.game.screen.update_stats('player', self.game.player.get_combatant_data())
-        self.app.game.screen.update_stats('enemy', self.game.enemy.get_combatant_data())
+        self.event_manager.dispatch('update_stats', 'player')
+        self.event_manager.dispatch('update_stats', 'enemy')
         self.app.game.screen.dev_console.show_result(command, success, message)
 
+    def handle_update_stats(self, subject):
+        """Handle a combatant's stats changing."""
+        combatant = self.game.player if subject == 'player' else self.game.enemy
+        self.app.game.screen.update_stats(subject, combatant.get_combatant_data())
+
     # GUI events
 
     def subscribe_to_gui_events(self):
@@ -123,44 +134,47 @@ class Controller:
 
     def handle_initiate_quest(self):
         """Handle initiating a quest."""
-        self.event_manager.logger.log("GUI event fired: initiate_quest", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: initiate_quest", subsystem="events")
         self.game.start_quest()
 
     def handle_initiate_encounter(self):
         """Handle initiating an encounter."""
-        self.event_manager.logger.log("GUI event fired: initiate_encounter", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: initiate_encounter", subsystem="events")
         self.game.start_encounter()
     
     def handle_start_player_turn(self):
         """Handle starting player turn."""
-        self.event_manager.logger.log("GUI event fired: start_player_turn", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: start_player_turn", subsystem="events")
         self.game.combat_manager.beginning_of_turn(self.game.player, self.game.enemy, self.game.registries)
         statuses = self.game.player.get_combatant_data()['statuses']
         self.app.game.screen.start_player_turn(statuses)
 
     def handle_play_card(self, index_in_hand):
         """Handle playing a card."""
-        self.event_manager.logger.log("GUI event fired: play_card", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: play_card", subsystem="events")
         card = self.game.player.card_manager.hand[index_in_hand]
         self.game.combat_manager.play_card(self.game.player, self.game.enemy, card, self.game.registries)
 
     def handle_end_turn(self):
         """Handle ending the turn."""
-        self.event_manager.logger.log("GUI event fired: end_turn", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: end_turn", subsystem="events")
         self.game.combat_manager.end_of_turn(self.game.player, self.game.registries.statuses)
         self.game.combat_manager.do_enemy_turn(self.game.player, self.game.enemy, self.game.registries)
 
     def handle_back_to_quest(self):
         """Handle going back to the quest screen."""
-        self.event_manager.logger.log("GUI event fired: back_to_quest", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: back_to_quest", subsystem="events")
         self.app.game.start_quest(self.game.quest)
     
     def handle_game_over(self):
         """Handle game over."""
-        self.event_manager.logger.log("GUI event fired: game_over", True)
+        self.event_manager.logger.log(LogLevel.DEBUG, "GUI event fired: game_over", subsystem="events")
         self.app.stop()
     
     def handle_debug_command_submitted(self, command):
         """Handle a debug command entered in the dev console."""
-        self.event_manager.logger.log(f"GUI event fired: debug_command with command '{command}'", True)
+        self.event_manager.logger.log(
+            LogLevel.DEBUG, "GUI event fired: debug_command with command '{}'",
+            command, subsystem="events"
+            )
         self.game.debug_tools.execute_command(command, self.game.player, self.game.enemy)
@@ -16,6 +16,8 @@ class AttributeRegistry:
         self.attributes = data["ATTRIBUTES"]
         self.starting_attributes = data["STARTING_ATTRIBUTES"]
         self.card_type_index = self._setup_card_type_index()
+        # (card_type, subtypes, effect_id) -> (attribute, modifier)
+        self.context_table = {}
 
     def _setup_card_type_index(self) -> dict:
         """
@@ -55,11 +57,40 @@ class AttributeRegistry:
         """
         return self.starting_attributes.get(char_class, {})
 
+    def precompute_contexts(self, card_prototypes):
+        """
+        Fill the context table for the cost and every effect of the given
+        card prototypes.
+        """
+        for prototype in card_prototypes.values():
+            subtypes = tuple(prototype.subtypes)
+            self.get_attribute_by_context(prototype.card_type, subtypes)
+            for effect_id in prototype.effects:
+                self.get_attribute_by_context(
+                    prototype.card_type, subtypes, effect_id
+                    )
+
     def get_attribute_by_context(self, card_type, subtypes, effect_id=None) -> tuple[str, float]:
         """
         Get the relevant attribute and modifier for a given card type, subtypes,
         and effect.
         """
+        if not isinstance(subtypes, tuple):
+            subtypes = tuple(subtypes or ())
+        key = (card_type, subtypes, effect_id)
+        context = self.context_table.get(key)
+        if context is None:
+            context = self._resolve_attribute_by_context(
+                card_type, subtypes, effect_id
+                )
+            self.context_table[key] = context
+        return context
+
+    def _resolve_attribute_by_context(self, card_type, subtypes, effect_id) -> tuple[str, float]:
+        """
+        Work out the attribute and modifier for a context without using the
+        context table.
+        """
         attr_name = self.card_type_index.get(card_type, None)
         # If no attribute affects this card type, return None
         if not attr_name:
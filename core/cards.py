@@ -1,31 +1,104 @@
 """
-This module defines the Card class, CardPrototype and CardRegistry.
+This module defines the Card and CardTemplate classes, CardPrototype and
+CardRegistry.
 """
+from itertools import count
 from math import floor
 from utils.utils import Prototype
 from utils.formatter import Formatter
 from utils.constants import CardTypes, Resources, MIN_COST
 from core.leveled_mechanics import LeveledMechanic
 
-class Card:
+class CardTemplate:
     """
-    Represents a card in game.
+    Holds the data that every copy of a card shares and never changes.
     """
+    __slots__ = ("name", "card_id", "card_type", "cost", "value", "subtypes", "effects")
+
     def __init__(self, name, card_type, cost, value, effects, subtypes):
         """
-        Initialize a new Card.
+        Initialize a new CardTemplate.
         """
         self.name = name
         self.card_id = hash(name)
         self.card_type = card_type
         self.cost = cost
-        # self.cost_modifier = 0
-        # self.temp_cost_modifier = 0
-        # self.override_cost = -1
         self.value = value
-        self.subtypes = subtypes
-        self.effects = effects
-        self.formatter = Formatter()
+        self.subtypes = tuple(subtypes)
+        self.effects = tuple(effects)
+
+
+class Card:
+    """
+    Represents a card in game. Copies of the same card share one CardTemplate
+    and only hold their own instance id and cached values.
+
+    The cost and effect levels depend on the owner's attributes, so they are
+    cached together with the owner's attribute version and recalculated only
+    when that changes.
+    """
+    __slots__ = ("template", "instance_id", "cost_cache", "levels_cache")
+
+    formatter = Formatter()
+    _instance_ids = count()
+
+    def __init__(self, template):
+        """
+        Initialize a new Card.
+        """
+        self.template = template
+        self.instance_id = next(Card._instance_ids)
+        self.cost_cache = None
+        self.levels_cache = None
+
+    @property
+    def name(self) -> str:
+        """
+        Get the display name of the card.
+        """
+        return self.template.name
+
+    @property
+    def card_id(self) -> int:
+        """
+        Get the numeric id of the card.
+        """
+        return self.template.card_id
+
+    @property
+    def card_type(self) -> str:
+        """
+        Get the card type id.
+        """
+        return self.template.card_type
+
+    @property
+    def cost(self) -> int:
+        """
+        Get the unmodified cost of the card.
+        """
+        return self.template.cost
+
+    @property
+    def value(self) -> int:
+        """
+        Get the gold value of the card.
+        """
+        return self.template.value
+
+    @property
+    def subtypes(self) -> tuple:
+        """
+        Get the card subtype ids.
+        """
+        return self.template.subtypes
+
+    @property
+    def effects(self) -> tuple:
+        """
+        Get the leveled effects on the card.
+        """
+        return self.template.effects
 
     def get_card_data(self, owner=None, attribute_registry=None) -> dict:
         """
@@ -37,6 +110,7 @@ class Card:
         return {
             "name": self.name,
             "id": self.card_id,
+            "instance_id": self.instance_id,
             "type": self.card_type,
             "cost": self.get_cost(owner, attribute_registry),
             "value": self.value,
@@ -56,15 +130,27 @@ class Card:
         """
         Get the stamina or magicka cost of the card.
         """
-        if owner is not None:
-            if attribute_registry is not None:
-                attribute, modifier = attribute_registry.get_attribute_by_context(
-                    self.card_type, self.subtypes
-                )
-                if attribute is not None:
-                    multiplier = 1 - modifier * owner.get_attribute_level(attribute)
-                    modified_cost = floor(self.cost * multiplier)
-                    return max(modified_cost, MIN_COST)
+        if owner is None or attribute_registry is None:
+            return max(self.cost, MIN_COST)
+        cache = self.cost_cache
+        if cache is not None and cache[0] is owner \
+                and cache[1] == owner.attribute_version:
+            return cache[2]
+        cost = self._calculate_cost(owner, attribute_registry)
+        self.cost_cache = (owner, owner.attribute_version, cost)
+        return cost
+
+    def _calculate_cost(self, owner, attribute_registry) -> int:
+        """
+        Calculate the cost of the card modified by the owner's attributes.
+        """
+        attribute, modifier = attribute_registry.get_attribute_by_context(
+            self.card_type, self.subtypes
+        )
+        if attribute is not None:
+            multiplier = 1 - modifier * owner.get_attribute_level(attribute)
+            modified_cost = floor(self.cost * multiplier)
+            return max(modified_cost, MIN_COST)
         return max(self.cost, MIN_COST)
         # if enable_override and self.override_cost >= MIN_COST:
         #     return self.override_cost
@@ -111,6 +197,24 @@ class Card:
         # self.reset_temp_cost_modifier()
         # self.reset_override_cost()
 
+    def get_effect_levels(self, owner=None, attribute_registry=None) -> tuple:
+        """
+        Get the level of each effect on the card, in the same order as the
+        effects.
+        """
+        if owner is None or attribute_registry is None:
+            return tuple(effect.get_level() for effect in self.effects)
+        cache = self.levels_cache
+        if cache is not None and cache[0] is owner \
+                and cache[1] == owner.attribute_version:
+            return cache[2]
+        levels = tuple(
+            effect.get_level(self, owner, attribute_registry)
+            for effect in self.effects
+            )
+        self.levels_cache = (owner, owner.attribute_version, levels)
+        return levels
+
     def matches(self, card_property) -> bool:
         """
         Check if a card has a certain type or subtype.
@@ -118,7 +222,7 @@ class Card:
         return card_property == self.card_type or card_property in self.subtypes
 
 
-class CardPrototype(Card, Prototype):
+class CardPrototype(Prototype):
     """
     This class represents a specific card that may be 'printed' any number of
     times.
@@ -134,24 +238,39 @@ class CardPrototype(Card, Prototype):
             subtypes = []
         elif isinstance(subtypes, str):
             subtypes = [subtypes]
-        super().__init__(name, card_type, cost, value, effects, subtypes)
+        self.name = name
+        self.card_id = hash(name)
+        self.card_type = card_type
+        self.cost = cost
+        self.value = value
+        self.effects = effects
+        self.subtypes = subtypes
         self.enchantments = enchantments
         self.enchanted_name = enchanted_name
+        self.template = None
 
     required_fields = ["name", "card_type", "cost", "value", "effects"]
 
+    def get_template(self, effect_registry) -> CardTemplate:
+        """
+        Get the shared template for this card, creating it on first use.
+        """
+        if self.template is None:
+            effects = []
+            for effect, level in self.effects.items():
+                # Use the effect registry to get the actual effect instance based on the prototype's effect
+                effects.append(LeveledMechanic(effect_registry.get_effect(effect), level))
+            self.template = CardTemplate(
+                self.name, self.card_type, self.cost, self.value, effects,
+                self.subtypes
+                )
+        return self.template
+
     def clone(self, effect_registry) -> Card:
         """
         Create an instance of this card.
         """
-        effects = []
-        for effect, level in self.effects.items():
-            # Use the effect registry to get the actual effect instance based on the prototype's effect
-            effects.append(LeveledMechanic(effect_registry.get_effect(effect), level))
-        return Card(
-            self.name, self.card_type, self.cost, self.value, effects,
-            self.subtypes
-            )
+        return Card(self.get_template(effect_registry))
 
 
 class CardRegistry:
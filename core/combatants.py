@@ -5,6 +5,7 @@ from gameplay.card_manager import CardManager
 from gameplay.status_manager import StatusManager
 from gameplay.modifier_manager import ModifierManager
 from gameplay.damage_calculator import DamageCalculator
+from gameplay.state_hash import StateHash
 from core.resources import Resource
 from utils.constants import Resources as Res, Attributes
 from utils.formatter import Formatter
@@ -23,23 +24,27 @@ class Combatant:
         """
         self.name = name
         self.is_enemy = is_enemy
+        self.state_hash = StateHash("ENEMY" if is_enemy else "PLAYER")
         health_id = Res.HEALTH.name
         stamina_id = Res.STAMINA.name
         magicka_id = Res.MAGICKA.name
         self.resources = {
-            health_id: Resource(health_id, max_health),
-            stamina_id: Resource(stamina_id, max_stamina),
-            magicka_id: Resource(magicka_id, max_magicka)
+            health_id: Resource(health_id, max_health, self.state_hash),
+            stamina_id: Resource(stamina_id, max_stamina, self.state_hash),
+            magicka_id: Resource(magicka_id, max_magicka, self.state_hash)
         }
         self.card_manager = CardManager(
-            starting_deck, registries.cards, event_manager, registries.effects
+            starting_deck, registries.cards, event_manager, registries.effects,
+            registries.rng, self.state_hash
             )
-        self.status_manager = StatusManager(event_manager)
+        self.status_manager = StatusManager(event_manager, self.state_hash)
         self.modifier_manager = ModifierManager(registries.statuses)
         self.cards_played_this_turn = 0
         self.event_manager = event_manager
         self.formatter = Formatter()
         self.damage_calculator = DamageCalculator()
+        # Incremented whenever an attribute or attribute delta changes
+        self.attribute_version = 0
         # Initialize self.attributes and self.attribute_deltas:
         self.initialize_attributes(starting_attributes)
 
@@ -55,6 +60,7 @@ class Combatant:
                 self.attributes[attribute.name] = initial_values[attribute.name]
             else:
                 self.attributes[attribute.name] = 0
+        self.attribute_version += 1
     
     def reset_attribute_deltas(self):
         """
@@ -62,6 +68,61 @@ class Combatant:
         """
         for attribute in Attributes:
             self.attribute_deltas[attribute.name] = 0
+        self.attribute_version += 1
+
+    def set_attribute(self, attribute_id, value):
+        """
+        Set the base level of a character attribute.
+        """
+        self.attributes[attribute_id] = value
+        self.attribute_version += 1
+
+    def change_attribute_delta(self, attribute_id, amount):
+        """
+        Change the temporary modifier on a character attribute.
+        """
+        self.attribute_deltas[attribute_id] += amount
+        self.attribute_version += 1
+
+    def snapshot(self) -> tuple:
+        """
+        Capture the combat state: resources, attributes, statuses, modifiers,
+        card piles, cards played this turn, and the state hash.
+        """
+        return (
+            tuple(
+                (resource.current, resource.max_value)
+                for resource in self.resources.values()
+                ),
+            tuple(self.attributes.items()),
+            tuple(self.attribute_deltas.items()),
+            self.status_manager.snapshot(),
+            self.modifier_manager.snapshot(),
+            self.card_manager.snapshot(),
+            self.cards_played_this_turn,
+            self.state_hash.snapshot()
+            )
+
+    def restore(self, snapshot):
+        """
+        Put the combat state back the way it was when the snapshot was taken.
+        """
+        (
+            resources, attributes, attribute_deltas, statuses, modifiers,
+            piles, cards_played_this_turn, state_hash
+            ) = snapshot
+        for resource, (current, max_value) in zip(self.resources.values(), resources):
+            resource.current = current
+            resource.max_value = max_value
+        self.attributes.update(attributes)
+        self.attribute_deltas.update(attribute_deltas)
+        # Bump rather than restore the version so cached card values recompute
+        self.attribute_version += 1
+        self.status_manager.restore(statuses)
+        self.modifier_manager.restore(modifiers)
+        self.card_manager.restore(piles)
+        self.cards_played_this_turn = cards_played_this_turn
+        self.state_hash.restore(state_hash)
 
     def get_combatant_data(self) -> dict:
         """
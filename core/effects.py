@@ -266,68 +266,87 @@ class JumpEffect(Effect):
 class EffectRegistry:
     """
     This class holds effect data and provides access to the effects.
+
+    Effects are created from their id the first time they are looked up and
+    reused after that, so only effects that are actually used get built.
     """
     def __init__(self, effects_path, status_registry):
         """
         Initialize a new EffectRegistry.
         """
-        self.effects = self._register_effects(effects_path, status_registry)
+        data = load_json(effects_path)
+        self.descriptions = {
+            effect_id: effect_data["description"]
+            for effect_id, effect_data in data.items()
+            }
+        self.status_registry = status_registry
+        self.effects = {}
 
-    def _register_effects(self, effects_path, status_registry) -> dict:
+    def _create_effect(self, effect_id) -> Effect:
         """
-        Create the Effect objects and file them in the dict.
-        """
-        effects = {}
+        Parse the effect id and create the matching Effect, or return None if
+        the id doesn't describe a valid effect.
 
-        data = load_json(effects_path)
-        descriptions = { effect_id: effect_data["description"] for effect_id, effect_data in data.items() }
+        Effect ids take one of these forms:
+            NO_EFFECT, DRAW, DISCARD, JUMP
+            RESTORE_<resource>_SELF
+            APPLY_<status>_<target>, REMOVE_<status>_<target>
+            <damage type>_DAMAGE_<target>
+            DISPEL_<target>
+        """
+        names = c.EffectNames
+        descriptions = self.descriptions
 
         # Single-target effects:
-        effects[c.EffectNames.NO_EFFECT.name] = NoEffect()
-
-        draw = c.EffectNames.DRAW
-        effects[draw.name] = HandEffect(draw, descriptions[draw.name], True)
-
-        discard = c.EffectNames.DISCARD
-        effects[discard.name] = HandEffect(discard, descriptions[discard.name], False)
+        if effect_id == names.NO_EFFECT.name:
+            return NoEffect()
+        if effect_id == names.DRAW.name:
+            return HandEffect(names.DRAW, descriptions[names.DRAW.name], True)
+        if effect_id == names.DISCARD.name:
+            return HandEffect(
+                names.DISCARD, descriptions[names.DISCARD.name], False
+                )
+        if effect_id == names.JUMP.name:
+            return JumpEffect(descriptions[names.JUMP.name])
+
+        # Multi-target effects end with the target type:
+        base_id, _, target_name = effect_id.rpartition("_")
+        if target_name not in c.TargetTypes.__members__:
+            return None
+        target_type = c.TargetTypes[target_name]
+
+        if base_id == names.DISPEL.name:
+            return DispelEffect(
+                names.DISPEL, descriptions[names.DISPEL.name], target_type
+                )
 
-        jump = c.EffectNames.JUMP
-        effects[jump.name] = JumpEffect(descriptions[jump.name])
+        damage_suffix = f"_{names.DAMAGE.name}"
+        if base_id.endswith(damage_suffix):
+            damage_type_name = base_id[:-len(damage_suffix)]
+            if damage_type_name not in c.DamageTypes.__members__:
+                return None
+            return DamageEffect(
+                descriptions[names.DAMAGE.name], target_type,
+                c.DamageTypes[damage_type_name]
+                )
 
-        restore = c.EffectNames.RESTORE
-        for resource in c.Resources:
-            restore_effect = ChangeResourceEffect(
-                restore, descriptions[restore.name], c.TargetTypes.SELF, resource
+        effect_name, _, subject_id = base_id.partition("_")
+        if effect_name == names.RESTORE.name:
+            if target_type != c.TargetTypes.SELF \
+                    or subject_id not in c.Resources.__members__:
+                return None
+            return ChangeResourceEffect(
+                names.RESTORE, descriptions[names.RESTORE.name], target_type,
+                c.Resources[subject_id]
                 )
-            effects[restore_effect.effect_id] = restore_effect
-
-        # Multi-target effects:
-        for target_type in c.TargetTypes:
-            apply = c.EffectNames.APPLY
-            remove = c.EffectNames.REMOVE
-            apply_description = descriptions[apply.name]
-            remove_description = descriptions[remove.name]
-            for status_id in status_registry.list_statuses():
-                status = status_registry.get_status(status_id)
-                apply_status_effect = ChangeStatusEffect(
-                    c.EffectNames.APPLY, apply_description, target_type, status
-                    )
-                remove_status_effect = ChangeStatusEffect(
-                    c.EffectNames.REMOVE, remove_description, target_type, status
-                    )
-                effects[apply_status_effect.effect_id] = apply_status_effect
-                effects[remove_status_effect.effect_id] = remove_status_effect
-
-            for damage_type in c.DamageTypes:
-                damage_description = descriptions[c.EffectNames.DAMAGE.name]
-                damage_effect = DamageEffect(damage_description, target_type, damage_type)
-                effects[damage_effect.effect_id] = damage_effect
-
-            dispel_description = descriptions[c.EffectNames.DISPEL.name]
-            dispel_effect = DispelEffect(c.EffectNames.DISPEL, dispel_description, target_type)
-            effects[dispel_effect.effect_id] = dispel_effect
-
-        return effects
+        if effect_name in (names.APPLY.name, names.REMOVE.name):
+            if subject_id not in self.status_registry.statuses:
+                return None
+            return ChangeStatusEffect(
+                names[effect_name], descriptions[effect_name], target_type,
+                self.status_registry.get_status(subject_id)
+                )
+        return None
 
     def get_effect(self, effect_id) -> Effect:
         """
@@ -335,4 +354,8 @@ class EffectRegistry:
         """
         if effect_id in self.effects:
             return self.effects[effect_id]
-        return None
+        effect = self._create_effect(effect_id)
+        if effect is None or effect.effect_id != effect_id:
+            return None
+        self.effects[effect_id] = effect
+        return effect
@@ -23,6 +23,7 @@ class Enchantment:
         """
         enchanted_card = copy(card_prototype)
         enchanted_card.effects = deepcopy(card_prototype.effects)
+        enchanted_card.template = None
 
         for effect_id, level in self.effects_dict.items():
             enchanted_card.effects[effect_id] = enchanted_card.effects.get(
@@ -17,7 +17,7 @@ class Enemy(Combatant):
             name, max_health, max_stamina, max_magicka, deck,
             registries, True, event_manager
             )
-        self.loot = Treasure(loot, card_rewards)
+        self.loot = Treasure(loot, card_rewards, registries.rng)
     
     def get_rewards(self, player_class, card_registry) -> dict:
         """
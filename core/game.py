@@ -12,20 +12,22 @@ class Game:
     """
     Holds the data needed for the game.
     """
-    def __init__(self, event_manager):
+    def __init__(self, event_manager, seed=None, enemy_policy=None):
         """
         Initialize a new Game.
         """
         self.event_manager = event_manager
-        self.combat_manager = CombatManager(self.event_manager)
-        self.registries = Registries(self.event_manager)
+        self.combat_manager = CombatManager(self.event_manager, enemy_policy)
+        self.registries = Registries(self.event_manager, seed=seed)
 
         default_class = ClassSpecializations.FIGHTER.name
         default_name = "Player"
         self.player = Player(self.registries, default_class, self.event_manager)
         self.player.name = default_name
         self.town = Town()
-        self.debug_tools = DebugTools(self.event_manager, self.registries)
+        self.debug_tools = DebugTools(
+            self.event_manager, self.registries, self.combat_manager
+            )
 
     def start_game(self):
         """
@@ -46,5 +48,5 @@ class Game:
     def start_encounter(self):
         """Start the next encounter."""
         encounter = self.quest.encounters.pop(0)
-        self.enemy = encounter.enemy
+        self.enemy = encounter.create_enemy(self.registries)
         self.combat_manager.start_combat(self.player, self.enemy)
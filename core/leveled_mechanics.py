@@ -10,6 +10,8 @@ class LeveledMechanic:
     """
     Represents an effect or status instance along with its level.
     """
+    __slots__ = ("reference", "str_id", "name", "base_level", "min_level", "num_id")
+
     def __init__(self, reference, level):
         """
         Initialize a new LeveledMechanic.
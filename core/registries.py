@@ -2,22 +2,51 @@
 This module defines the Registries class, containing lookup dictionaries for
 statuses, effects, enchantments, cards, enemies, and quests.
 """
+import random
 from core.effects import EffectRegistry
 from core.statuses import StatusRegistry
 from core.enchantments import EnchantmentRegistry
 from core.attributes import AttributeRegistry
 from core.cards import CardRegistry
 from core.enemies import EnemyRegistry
+from core.registry_bundle import RegistryBundle
 from gameplay.quests import QuestRegistry
-from utils.constants import JSON_PATHS as paths
+from utils.constants import JSON_PATHS as paths, DATA_DIRECTORY, REGISTRY_BUNDLE_PATH
 
 class Registries:
     """
     This class holds all the registries for the game.
     """
-    def __init__(self, event_manager):
+    # Registries that are loaded from the bundle instead of rebuilt
+    COMPILED_REGISTRIES = [
+        "attributes", "statuses", "effects", "enchantments", "cards", "enemies"
+        ]
+
+    def __init__(self, event_manager, use_bundle=True, seed=None):
+        """
+        Initialize the Registries. Every random roll in a game session goes
+        through self.rng, so the same seed replays the same session.
+        """
+        self.rng = random.Random(seed)
+        compiled = None
+        if use_bundle:
+            bundle = RegistryBundle(DATA_DIRECTORY, REGISTRY_BUNDLE_PATH)
+            compiled = bundle.load(event_manager)
+        if compiled is None:
+            self._compile_registries(event_manager)
+            if use_bundle:
+                self._save_bundle(bundle, event_manager)
+        else:
+            for name in self.COMPILED_REGISTRIES:
+                setattr(self, name, compiled[name])
+        # Quests roll their encounters randomly, so they are never cached
+        self.quests = QuestRegistry(
+            paths['quests'], paths['enemy_groups'], self.enemies, self.rng
+            )
+
+    def _compile_registries(self, event_manager):
         """
-        Initialize the Registries.
+        Load the registries from the JSON data files.
         """
         self.attributes = AttributeRegistry(paths['attributes'])
         self.statuses = StatusRegistry(paths['statuses'], event_manager)
@@ -26,7 +55,17 @@ class Registries:
             paths['enchantments'], self.effects
             )
         self.cards = CardRegistry(paths['cards'], self.enchantments)
+        self.attributes.precompute_contexts(self.cards.card_prototypes)
         self.enemies = EnemyRegistry(paths['enemies'], event_manager)
-        self.quests = QuestRegistry(
-            paths['quests'], paths['enemy_groups'], self
-            )
+
+    def _save_bundle(self, bundle, event_manager):
+        """
+        Write the freshly compiled registries to the bundle.
+        """
+        compiled = {name: getattr(self, name) for name in self.COMPILED_REGISTRIES}
+        try:
+            bundle.save(compiled, event_manager)
+        except OSError as e:
+            event_manager.logger.log(
+                f"Could not write registry bundle: {e}", True
+                )
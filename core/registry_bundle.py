@@ -0,0 +1,144 @@
+"""
+This module defines the RegistryBundle class, a compiled cache of the
+registries that is rebuilt only when the data files or the source of the
+pickled classes change.
+"""
+import hashlib
+import importlib.util
+import io
+import os
+import pickle
+
+EVENT_MANAGER_ID = "event_manager"
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class _BundlePickler(pickle.Pickler):
+    """
+    Pickler that stores the event manager as a reference instead of by value,
+    and notes the module of everything it pickles.
+    """
+    def __init__(self, file, event_manager):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.event_manager = event_manager
+        self.module_names = set()
+
+    def persistent_id(self, obj):
+        if obj is self.event_manager:
+            return EVENT_MANAGER_ID
+        return None
+
+    def reducer_override(self, obj):
+        # An instance's base classes decide its state as much as its class,
+        # and classes and functions are pickled by reference to their module
+        for cls in type(obj).__mro__:
+            self.module_names.add(cls.__module__)
+        if isinstance(obj, type):
+            for cls in obj.__mro__:
+                self.module_names.add(cls.__module__)
+        module_name = getattr(obj, "__module__", None)
+        if isinstance(module_name, str):
+            self.module_names.add(module_name)
+        return NotImplemented
+
+
+class _BundleUnpickler(pickle.Unpickler):
+    """
+    Unpickler that reconnects event manager references to the live one.
+    """
+    def __init__(self, file, event_manager):
+        super().__init__(file)
+        self.event_manager = event_manager
+
+    def persistent_load(self, pid):
+        if pid == EVENT_MANAGER_ID:
+            return self.event_manager
+        raise pickle.UnpicklingError(f"Unknown persistent id '{pid}'.")
+
+
+class RegistryBundle:
+    """
+    Reads and writes the compiled registries, keyed by a content hash of the
+    data directory. The bundle also lists the project modules its objects
+    come from and a hash of their source, so changing a pickled class
+    rebuilds the bundle without anyone having to remember to.
+    """
+    def __init__(self, data_directory, bundle_path):
+        """
+        Initialize a new RegistryBundle.
+        """
+        self.data_directory = data_directory
+        self.bundle_path = bundle_path
+        self.data_hash = self._hash_data_directory()
+
+    def _hash_data_directory(self) -> str:
+        """
+        Hash the relative path and contents of every file under the data
+        directory.
+        """
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(self.data_directory):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                relative_path = os.path.relpath(path, self.data_directory)
+                digest.update(relative_path.replace(os.sep, "/").encode())
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+        return digest.hexdigest()
+
+    def _hash_sources(self, module_names) -> str:
+        """
+        Hash the name and source of every project module in module_names.
+        Modules from outside the project, such as the standard library, are
+        left out.
+        """
+        digest = hashlib.sha256()
+        for module_name in sorted(module_names):
+            try:
+                spec = importlib.util.find_spec(module_name)
+            except (ImportError, ValueError):
+                spec = None
+            path = spec.origin if spec is not None else None
+            if not path or not os.path.isfile(path) \
+                    or not os.path.abspath(path).startswith(PROJECT_DIRECTORY + os.sep):
+                continue
+            digest.update(module_name.encode())
+            with open(path, "rb") as file:
+                digest.update(file.read())
+        return digest.hexdigest()
+
+    def load(self, event_manager) -> dict:
+        """
+        Return the compiled registries, or None if the bundle is missing,
+        stale, or unreadable.
+        """
+        try:
+            with open(self.bundle_path, "rb") as file:
+                data_hash, module_names, source_hash = pickle.load(file)
+                if data_hash != self.data_hash \
+                        or source_hash != self._hash_sources(module_names):
+                    return None
+                registries = _BundleUnpickler(file, event_manager).load()
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError):
+            return None
+        return registries
+
+    def save(self, registries, event_manager):
+        """
+        Write the compiled registries to disk, after a header with the data
+        hash and the modules they need.
+        """
+        buffer = io.BytesIO()
+        pickler = _BundlePickler(buffer, event_manager)
+        pickler.dump(registries)
+        module_names = sorted(pickler.module_names)
+        header = (self.data_hash, module_names, self._hash_sources(module_names))
+        directory = os.path.dirname(self.bundle_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.bundle_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.write(buffer.getvalue())
+        os.replace(temp_path, self.bundle_path)
@@ -7,13 +7,24 @@ class Resource:
     """
     Represents health, stamina, or magicka.
     """
-    def __init__(self, resource_id, max_value):
+    __slots__ = ("resource_id", "max_value", "current", "state_hash")
+
+    def __init__(self, resource_id, max_value, state_hash):
         """
         Initialize a new Resource.
         """
         self.resource_id = resource_id
         self.max_value = max_value
-        self.current = max_value
+        self.current = 0
+        self.state_hash = state_hash
+        self.set_current(max_value)
+
+    def set_current(self, value):
+        """
+        Set the current value, keeping the state hash up to date.
+        """
+        self.state_hash.change_level("RESOURCE", self.resource_id, self.current, value)
+        self.current = value
 
     def clamp_value(self, value, modifier_manager) -> int:
         """
@@ -28,7 +39,8 @@ class Resource:
         """
         new_value = self.current + amount
         new_value = self.clamp_value(new_value, modifier_manager)
-        self.current = new_value
+        if new_value != self.current:
+            self.set_current(new_value)
 
     def try_spend(self, amount, modifier_manager) -> bool:
         """
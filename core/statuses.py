@@ -3,7 +3,8 @@ This module defines the Status class, its child classes, and the
 StatusRegistry.
 """
 import utils.constants as c
-from utils.utils import load_json, roll_random_chance
+from utils.utils import load_json, roll_random_chance, get_luck_chance
+from utils.formatter import Formatter
 
 class Status:
     """
@@ -16,6 +17,9 @@ class Status:
         self.status_id = status_id
         self.name = c.StatusNames[status_id].value
         self.description = description
+        self.description_templates = Formatter().compile_description_templates(
+            description
+            )
         self.applies_immediately = applies_immediately
 
     def modify_value(self, old_value, amount, is_reduction, min_result) -> int:
@@ -26,7 +30,7 @@ class Status:
             return max(old_value - amount, min_result)
         return old_value + amount
 
-    def trigger_on_turn(self, subject, level, status_registry=None):
+    def trigger_on_turn(self, subject, level, registries=None):
         """
         Base method for polymorphism. Activate the status effect at the
         beginning of the turn.
@@ -66,7 +70,7 @@ class ModifyEffectStatus(Status):
         self.affected_effect = affected_effect
         self.sign_factor = sign_factor
 
-    def trigger_on_turn(self, subject, level, status_registry):
+    def trigger_on_turn(self, subject, level, registries):
         """
         Recalculate effects at the start of each turn.
         """
@@ -220,7 +224,9 @@ class ModifyAttributeStatus(Status):
         """
         Update the subject's attribute delta.
         """
-        subject.attribute_deltas[self.attribute_id] += change * self.sign_factor
+        subject.change_attribute_delta(
+            self.attribute_id, change * self.sign_factor
+            )
         
 
 
@@ -259,12 +265,12 @@ class PoisonStatus(Status):
         """
         super().__init__(status_id, description, applies_immediately=False)
 
-    def trigger_on_turn(self, subject, level, status_registry):
+    def trigger_on_turn(self, subject, level, registries):
         """
         Activate the status effect when requested by caller.
         """
         damage_type = c.DamageTypes.POISON.name
-        subject.take_damage(None, level, damage_type, status_registry)
+        subject.take_damage(None, level, damage_type, registries)
 
 
 class RegenerationStatus(Status):
@@ -277,7 +283,7 @@ class RegenerationStatus(Status):
         """
         super().__init__(status_id, description, applies_immediately=False)
 
-    def trigger_on_turn(self, subject, level, status_registry):
+    def trigger_on_turn(self, subject, level, registries):
         subject.change_resource(c.Resources.HEALTH.name, level)
 
 
@@ -291,13 +297,20 @@ class EvasionStatus(Status):
         """
         super().__init__(status_id, description, applies_immediately=False)
 
-    def calculate_evasion_damage(self, level, incoming_damage, luck) -> int:
+    def get_evasion_chance(self, level, luck) -> float:
+        """
+        Get the chance of evading an attack.
+        """
+        base_probability = c.BASE_EVASION_PROBABILITY
+        return get_luck_chance(min(base_probability * level, 1.0), luck)
+
+    def calculate_evasion_damage(self, level, incoming_damage, luck, rng) -> int:
         """
         Return the damage to be taken after winning or losing the dice roll.
         """
         base_probability = c.BASE_EVASION_PROBABILITY
         success_probability = min(base_probability * level, 1.0)
-        success = roll_random_chance(success_probability, luck)
+        success = roll_random_chance(success_probability, luck, rng)
         return 0 if success else incoming_damage
 
 
@@ -311,13 +324,20 @@ class CriticalHitStatus(Status):
         """
         super().__init__(status_id, description, applies_immediately=False)
 
-    def calculate_damage_multiplier(self, level, luck) -> int:
+    def get_crit_chance(self, level, luck) -> float:
+        """
+        Get the chance of a critical hit.
+        """
+        base_probability = c.BASE_CRIT_PROBABILITY
+        return get_luck_chance(min(base_probability * level, 1.0), luck)
+
+    def calculate_damage_multiplier(self, level, luck, rng) -> int:
         """
         Randomly calculate the damage multiplier.
         """
         base_probability = c.BASE_CRIT_PROBABILITY
         success_probability = min(base_probability * level, 1.0)
-        success = roll_random_chance(success_probability, luck)
+        success = roll_random_chance(success_probability, luck, rng)
         return c.CRIT_MULTIPLIER if success else 1
 
 
@@ -1,36 +1,50 @@
 """
 This module defines the CardManager class.
 """
+from collections import deque
 from math import floor
-import random
 import utils.constants as c
 from gameplay.library import Library
 
 class CardManager:
     """
     This class handles the movement of cards between piles.
+
+    The deck, discard pile and consumed pile are deques with the top card on
+    the left, so drawing and discarding don't shift the rest of the pile. The
+    hand is a list so cards can be looked up by index.
+
+    Every move between piles is also recorded in the state hash, which sees
+    each pile as a multiset of card names.
     """
-    def __init__(self, starting_deck, card_registry, event_manager, effect_registry):
+    def __init__(
+            self, starting_deck, card_registry, event_manager, effect_registry,
+            rng, state_hash
+            ):
         """
         Initialize a new CardManager.
         """
+        self.state_hash = state_hash
         self.deck = self._create_deck(starting_deck, card_registry, effect_registry)
         self.hand = []
-        self.discard_pile = []
-        self.consumed_pile = []
+        self.discard_pile = deque()
+        self.consumed_pile = deque()
         self.library = Library()
         self.event_manager = event_manager
+        self.rng = rng
 
-    def _create_deck(self, deck_list, card_registry, effect_registry) -> list:
+    def _create_deck(self, deck_list, card_registry, effect_registry) -> deque:
         """
         From a list of card ids, generate Card objects.
         """
-        deck = []
+        deck = deque()
         for entry in deck_list:
             card_id = entry.get("card")
             quantity = entry.get("quantity")
             for _ in range(quantity):
-                deck.append(card_registry.create_card(card_id, effect_registry))
+                card = card_registry.create_card(card_id, effect_registry)
+                deck.append(card)
+                self.state_hash.add_card("DECK", card.name)
         return deck
 
     def try_add_to_deck(self, card) -> tuple[bool, bool, bool]:
@@ -51,14 +65,43 @@ class CardManager:
             allowed = False
             too_many_cards = True
         if allowed:
-            self.deck.insert(0, card)
+            self.deck.appendleft(card)
+            self.state_hash.add_card("DECK", card.name)
         return allowed, too_many_copies, too_many_cards
 
+    def snapshot(self) -> tuple:
+        """
+        Capture the contents of every pile. Cards aren't changed during
+        combat, so the snapshot shares them instead of copying.
+        """
+        return (
+            tuple(self.deck), tuple(self.hand),
+            tuple(self.discard_pile), tuple(self.consumed_pile)
+            )
+
+    def restore(self, snapshot):
+        """
+        Put every pile back the way it was when the snapshot was taken. The
+        piles are refilled in place so outside references stay valid. The
+        state hash is restored separately.
+        """
+        deck, hand, discard_pile, consumed_pile = snapshot
+        self.deck.clear()
+        self.deck.extend(deck)
+        self.hand[:] = hand
+        self.discard_pile.clear()
+        self.discard_pile.extend(discard_pile)
+        self.consumed_pile.clear()
+        self.consumed_pile.extend(consumed_pile)
+
     def shuffle(self):
         """
         Randomize the order of cards in the deck.
         """
-        random.shuffle(self.deck)
+        cards = list(self.deck)
+        self.rng.shuffle(cards)
+        self.deck.clear()
+        self.deck.extend(cards)
 
     def draw(self, subject, registries, cards_to_draw=1) -> bool:
         """
@@ -71,18 +114,22 @@ class CardManager:
             if len(self.hand) >= c.MAX_HAND_SIZE:
                 return False
             if len(self.deck) == 0:
-                self.deck = self.discard_pile[:]
-                self.discard_pile = []
+                for discarded_card in self.discard_pile:
+                    self.state_hash.move_card(discarded_card.name, "DISCARD", "DECK")
+                self.deck = self.discard_pile
+                self.discard_pile = deque()
                 self.shuffle()
                 self.event_manager.dispatch('empty_discard_pile')
             if not self.deck:
                 return False
-            card = self.deck.pop(0)
+            card = self.deck.popleft()
             self.hand.append(card)
+            self.state_hash.move_card(card.name, "DECK", "HAND")
             cards_to_draw -= 1
             if not subject.is_enemy:
                 self.event_manager.logger.log(
-                    f"{subject.name} drew {card.name}.", True
+                    c.LogLevel.DEBUG, "{} drew {}.",
+                    subject.name, card.name, subsystem="cards"
                     )
         return True
         # self.recalculate_for_new_card(subject, registries)
@@ -140,16 +187,20 @@ class CardManager:
 
         # card.reset_card()
         if card.matches(c.CardTypes.CONSUMABLE.name) and is_being_played:
-            self.consumed_pile.insert(0, card)
+            self.consumed_pile.appendleft(card)
+            self.state_hash.move_card(card.name, "HAND", "CONSUMED")
             # TODO: log
         else:
             water_walking_id = c.StatusNames.WATER_WALKING.name
             if water_walking_id in status_manager.statuses and is_being_played:
-                self.deck.insert(0, card) # TODO: log
+                self.deck.appendleft(card) # TODO: log
+                self.state_hash.move_card(card.name, "HAND", "DECK")
             else:
-                self.discard_pile.insert(0, card)
+                self.discard_pile.appendleft(card)
+                self.state_hash.move_card(card.name, "HAND", "DISCARD")
                 self.event_manager.logger.log(
-                    f"{subject.name} discarded {card.name}.", True
+                    c.LogLevel.DEBUG, "{} discarded {}.",
+                    subject.name, card.name, subsystem="cards"
                     )
         self.hand.remove(card)
 
@@ -162,7 +213,7 @@ class CardManager:
         Randomly discard up to the given quantity of cards.
         """
         while len(self.hand) > 0 and quantity > 0:
-            card = random.choice(self.hand)
+            card = self.rng.choice(self.hand)
             self.discard(card, subject)
             quantity -= 1
 
@@ -179,18 +230,33 @@ class CardManager:
         """
         hand_size = subject.modifier_manager.calculate_cards_to_draw()
         assert self.discard_pile and len(self.hand) < hand_size
-        card = self.discard_pile.pop(card_index)
+        card = self.discard_pile[card_index]
+        del self.discard_pile[card_index]
         self.hand.append(card)
+        self.state_hash.move_card(card.name, "DISCARD", "HAND")
         # self.recalculate_for_new_card(subject, status_registry)
 
+    def remove_from_deck(self, card):
+        """
+        Take the card out of the deck.
+        """
+        self.deck.remove(card)
+        self.state_hash.remove_card("DECK", card.name)
+
     def reset_cards(self):
         """
         Return cards to the deck at the end of combat.
         """
+        for pile, cards in (
+                ("CONSUMED", self.consumed_pile), ("DISCARD", self.discard_pile),
+                ("HAND", self.hand)
+                ):
+            for card in cards:
+                self.state_hash.move_card(card.name, pile, "DECK")
         self.deck.extend(self.consumed_pile)
-        self.consumed_pile = []
+        self.consumed_pile = deque()
         self.deck.extend(self.discard_pile)
-        self.discard_pile = []
+        self.discard_pile = deque()
         self.deck.extend(self.hand)
         self.hand = []
         self.shuffle()
@@ -3,19 +3,47 @@ This Module defines the CombatManager class.
 """
 import utils.constants as c
 from core.statuses import FilterEffectStatus, RestrictCardTypeStatus, LimitCardPlayStatus
+from gameplay.state_hash import get_zobrist_key
 
 class CombatManager:
     """
     This class controls the flow of combat and coordinates between combatants,
     statuses, and effects.
     """
-    def __init__(self, event_manager):
+    def __init__(self, event_manager, enemy_policy=None):
         """
-        Initialize a new CombatManager.
+        Initialize a new CombatManager. Without an enemy policy, the enemy
+        plays the first playable card in hand.
         """
         self.event_manager = event_manager
+        self.enemy_policy = enemy_policy
         self.turn_number = 0
 
+    def snapshot(self, player, enemy) -> tuple:
+        """
+        Capture the state of a combat so it can be restored later, for
+        example to try out a line of play.
+        """
+        return (self.turn_number, player.snapshot(), enemy.snapshot())
+
+    def restore(self, snapshot, player, enemy):
+        """
+        Put a combat back the way it was when the snapshot was taken.
+        """
+        turn_number, player_snapshot, enemy_snapshot = snapshot
+        self.turn_number = turn_number
+        player.restore(player_snapshot)
+        enemy.restore(enemy_snapshot)
+
+    def get_state_hash(self, player, enemy) -> int:
+        """
+        Get a 64-bit hash of the combat position: both combatants' card
+        piles, status levels and resources, and the turn number. Positions
+        reached by different orders of play hash the same.
+        """
+        return player.state_hash.value ^ enemy.state_hash.value \
+            ^ get_zobrist_key("TURN", self.turn_number)
+
     def is_combat_over(self, player, enemy) -> bool:
         """
         Check if either combatant is dead.
@@ -38,7 +66,7 @@ class CombatManager:
         combatant.reset_for_turn()
         combatant.card_manager.draw_hand(combatant, registries)
         combatant.status_manager.trigger_statuses_on_turn(
-            combatant, registries.statuses
+            combatant, registries
             )
         if self.is_combat_over(combatant, opponent):
             self.event_manager.dispatch('end_combat')
@@ -84,17 +112,19 @@ class CombatManager:
             f"{combatant.name} played {card.name}."
             )
 
-        for effect in card.effects:
+        for index, effect in enumerate(card.effects):
             if not self.effect_can_resolve(combatant, effect.str_id):
                 # TODO give a reason why the effect can't resolve
                 self.event_manager.logger.log(f"{effect.name} has no effect.")
                 continue
-            level = effect.get_level(card, combatant, registries.attributes)
+            # Earlier effects may have changed attributes, so look this up each time
+            level = card.get_effect_levels(combatant, registries.attributes)[index]
             effect.reference.resolve(
                 combatant, opponent, level, registries
                 )
             self.event_manager.logger.log(
-                f"{card.name} resolved {effect.name} at level {level}.", True
+                c.LogLevel.DEBUG, "{} resolved {} at level {}.",
+                card.name, effect.name, level, subsystem="combat"
                 )
             if self.is_combat_over(combatant, opponent):
                 self.event_manager.dispatch('end_combat')
@@ -139,23 +169,40 @@ class CombatManager:
                     return False
         return True
 
+    def find_playable_card(self, combatant, registries):
+        """
+        Return the first card in hand that the combatant can afford and is
+        allowed to play, or None if there isn't one.
+        """
+        for card in combatant.card_manager.hand:
+            resource_id = card.get_resource()
+            if card.get_cost(combatant, registries.attributes) <= combatant.resources[resource_id].current and \
+                self.card_can_be_played(combatant, card):
+                return card
+        return None
+
+    def choose_enemy_card(self, player, enemy, registries):
+        """
+        Ask the enemy policy for the next card to play, or None to end the
+        turn.
+        """
+        if self.enemy_policy is None:
+            return self.find_playable_card(enemy, registries)
+        return self.enemy_policy.choose_card(self, player, enemy, registries)
+
     def do_enemy_turn(self, player, enemy, registries):
         """
         Process enemy actions.
         """
         self.beginning_of_turn(enemy, player, registries)
-        playable_card_exists = True
-        while playable_card_exists and not self.is_combat_over(player, enemy):
-            playable_card_exists = False
-            for card in enemy.card_manager.hand:
-                resource_id = card.get_resource()
-                if card.get_cost(enemy, registries.attributes) <= enemy.resources[resource_id].current and \
-                    self.card_can_be_played(enemy, card):
-                    playable_card_exists = True
-                    self.play_card(enemy, player, card, registries)
-                    if self.is_combat_over(player, enemy):
-                        return
-                    break
+        card = None
+        if not self.is_combat_over(player, enemy):
+            card = self.choose_enemy_card(player, enemy, registries)
+        while card is not None:
+            self.play_card(enemy, player, card, registries)
+            if self.is_combat_over(player, enemy):
+                return
+            card = self.choose_enemy_card(player, enemy, registries)
         self.end_of_turn(enemy, registries.statuses)
         self.turn_number += 1
         self.event_manager.dispatch('end_enemy_turn')
@@ -0,0 +1,110 @@
+"""
+This module defines the CombatSession and CombatResult classes, which run a
+whole combat without the GUI or the Controller.
+"""
+import utils.constants as c
+from utils.event_manager import EventManager
+from utils.logger import Logger
+from gameplay.combat_manager import CombatManager
+
+class CombatResult:
+    """
+    This class holds the outcome of a finished combat.
+    """
+    def __init__(self, player_won, turns, player_health, enemy_health, timed_out, logs):
+        """
+        Initialize a new CombatResult.
+        """
+        self.player_won = player_won
+        self.turns = turns
+        self.player_health = player_health
+        self.enemy_health = enemy_health
+        self.timed_out = timed_out
+        self.logs = logs
+
+    def get_result_data(self) -> dict:
+        """
+        Get a dictionary of the result's data.
+        """
+        return {
+            "player_won": self.player_won,
+            "turns": self.turns,
+            "player_health": self.player_health,
+            "enemy_health": self.enemy_health,
+            "timed_out": self.timed_out
+        }
+
+
+class CombatSession:
+    """
+    This class owns the turn loop for a single combat and runs it to the end
+    synchronously. The player plays the first affordable card in hand until
+    they can't play any more, and the enemy follows its policy, which does
+    the same by default.
+    """
+    def __init__(self, player, enemy, registries, max_turns=c.MAX_COMBAT_TURNS,
+                 enemy_policy=None):
+        """
+        Initialize a new CombatSession.
+        """
+        self.player = player
+        self.enemy = enemy
+        self.registries = registries
+        self.event_manager = registries.statuses.event_manager
+        self.combat_manager = CombatManager(self.event_manager, enemy_policy)
+        self.max_turns = max_turns
+
+    @staticmethod
+    def create_event_manager() -> EventManager:
+        """
+        Create an event manager with no listeners that doesn't print debug
+        messages, for use with headless registries.
+        """
+        return EventManager(Logger(print_debug=False, level=c.LogLevel.INFO))
+
+    def is_combat_over(self) -> bool:
+        """
+        Check if either combatant is dead.
+        """
+        return self.combat_manager.is_combat_over(self.player, self.enemy)
+
+    def run(self) -> CombatResult:
+        """
+        Play the combat until one side dies or the turn limit is reached.
+        """
+        self.event_manager.logger.get_combat_logs()
+        self.combat_manager.start_combat(self.player, self.enemy)
+        while not self.is_combat_over() and \
+                self.combat_manager.turn_number < self.max_turns:
+            self.play_player_turn()
+            if self.is_combat_over():
+                break
+            self.combat_manager.do_enemy_turn(
+                self.player, self.enemy, self.registries
+                )
+        return CombatResult(
+            player_won=self.player.is_alive() and not self.enemy.is_alive(),
+            turns=self.combat_manager.turn_number,
+            player_health=self.player.get_health(),
+            enemy_health=self.enemy.get_health(),
+            timed_out=not self.is_combat_over(),
+            logs=self.event_manager.logger.get_combat_logs()
+        )
+
+    def play_player_turn(self):
+        """
+        Start the player's turn, play cards until none are playable, then end
+        the turn.
+        """
+        combat_manager = self.combat_manager
+        player = self.player
+        combat_manager.beginning_of_turn(player, self.enemy, self.registries)
+        if self.is_combat_over():
+            return
+        card = combat_manager.find_playable_card(player, self.registries)
+        while card is not None:
+            combat_manager.play_card(player, self.enemy, card, self.registries)
+            if self.is_combat_over():
+                return
+            card = combat_manager.find_playable_card(player, self.registries)
+        combat_manager.end_of_turn(player, self.registries.statuses)
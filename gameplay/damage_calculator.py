@@ -1,8 +1,72 @@
 """
-This module defines the DamageCalculator class.
+This module defines the DefenderState and DamageCalculator classes.
 """
 from math import floor
-from utils.constants import DamageTypes, StatusNames, Attributes, Resources
+from gameplay.modifier_manager import ModifierManager
+from utils.constants import DamageTypes, StatusNames, Attributes, Resources, CRIT_MULTIPLIER
+
+class DefenderState:
+    """
+    The levels that decide how much of a hit a defender takes, along with
+    the attacker's Hidden level and Luck, which decide critical hits.
+    Without an attacker, nothing is reflected.
+    """
+    __slots__ = (
+        "defense", "evasion", "luck", "damage_modifiers", "willpower",
+        "reflect", "spell_absorption", "attacker_hidden", "attacker_luck",
+        "has_attacker"
+        )
+
+    def __init__(
+            self, defense=0, evasion=0, luck=0, damage_modifiers=None,
+            willpower=0, reflect=0, spell_absorption=0, attacker_hidden=0,
+            attacker_luck=0, has_attacker=True
+            ):
+        """
+        Initialize a new DefenderState. damage_modifiers maps a damage type to
+        the net weakness (positive) or resistance (negative) contribution.
+        """
+        self.defense = defense
+        self.evasion = evasion
+        self.luck = luck
+        self.damage_modifiers = damage_modifiers or {}
+        self.willpower = willpower
+        self.reflect = reflect
+        self.spell_absorption = spell_absorption
+        self.attacker_hidden = attacker_hidden
+        self.attacker_luck = attacker_luck
+        self.has_attacker = has_attacker
+
+    @staticmethod
+    def from_combatants(defender, attacker=None):
+        """
+        Create a DefenderState from the current state of live combatants.
+        """
+        defender_statuses = defender.status_manager.statuses
+        attacker_hidden = 0
+        attacker_luck = 0
+        if attacker is not None:
+            hidden = attacker.status_manager.statuses.get(StatusNames.HIDDEN.name)
+            attacker_hidden = hidden.get_level() if hidden is not None else 0
+            attacker_luck = attacker.get_attribute_level(Attributes.LUCK.name)
+
+        def status_level(status_id):
+            leveled_status = defender_statuses.get(status_id)
+            return leveled_status.get_level() if leveled_status is not None else 0
+
+        return DefenderState(
+            defense=status_level(StatusNames.DEFENSE.name),
+            evasion=status_level(StatusNames.EVASION.name),
+            luck=defender.get_attribute_level(Attributes.LUCK.name),
+            damage_modifiers=dict(defender.modifier_manager.damage_totals),
+            willpower=defender.get_attribute_level(Attributes.WILLPOWER.name),
+            reflect=status_level(StatusNames.REFLECT.name),
+            spell_absorption=status_level(StatusNames.SPELL_ABSORPTION.name),
+            attacker_hidden=attacker_hidden,
+            attacker_luck=attacker_luck,
+            has_attacker=attacker is not None and attacker is not defender
+            )
+
 
 class DamageCalculator:
     """
@@ -17,11 +81,11 @@ class DamageCalculator:
         status_registry = registries.statuses
         attribute_registry = registries.attributes
 
-        amount = self.process_evasion(defender, amount)
+        amount = self.process_evasion(defender, amount, registries.rng)
         if amount <= 0:
             return 0
 
-        amount = self.process_hidden(defender, attacker, amount)
+        amount = self.process_hidden(defender, attacker, amount, registries.rng)
 
         amount = self.process_weakness_resist(defender, amount, damage_type)
         if amount <= 0:
@@ -46,7 +110,142 @@ class DamageCalculator:
                 return 0
         
         return amount
-    
+
+    def calculate_damage_distribution(
+            self, defender, attacker, amount, damage_type, registries
+            ) -> dict:
+        """
+        Get the exact distribution of the damage calculate_damage would
+        deal, as a map from damage to probability. Nothing is rolled and
+        neither combatant is changed.
+        """
+        if amount <= 0:
+            return {0: 1.0}
+        evade_chance = self.get_evade_chance(defender)
+        crit_chance = self.get_crit_chance(attacker)
+        outcomes = (
+            (0, evade_chance),
+            (amount, (1 - evade_chance) * (1 - crit_chance)),
+            (amount * CRIT_MULTIPLIER, (1 - evade_chance) * crit_chance)
+            )
+        distribution = {}
+        for outcome_amount, probability in outcomes:
+            if probability <= 0:
+                continue
+            damage = self.calculate_mitigated_damage(
+                defender, attacker, outcome_amount, damage_type, registries
+                )
+            distribution[damage] = distribution.get(damage, 0.0) + probability
+        return distribution
+
+    def calculate_expected_damage(
+            self, defender, attacker, amount, damage_type, registries
+            ) -> float:
+        """
+        Get the mean of the damage calculate_damage would deal.
+        """
+        distribution = self.calculate_damage_distribution(
+            defender, attacker, amount, damage_type, registries
+            )
+        return sum(damage * probability for damage, probability in distribution.items())
+
+    def calculate_mitigated_damage(
+            self, defender, attacker, amount, damage_type, registries
+            ) -> int:
+        """
+        Get the damage left once the defender's mitigation is applied to an
+        amount that has already been through the evasion and critical hit
+        rolls. Unlike the process methods, this has no side effects.
+        """
+        state = DefenderState.from_combatants(defender, attacker)
+        return self.get_mitigated_hit(
+            state, amount, damage_type, state.defense, registries
+            )[0]
+
+    def get_mitigated_hit(self, state, amount, damage_type, defense, registries) -> tuple:
+        """
+        Apply weakness/resistance, then Defense to physical damage or
+        willpower, reflect and spell absorption to the rest, for a defender
+        in the given state with the given Defense level. Return the damage
+        taken and the Defense left afterwards. This is the one place the
+        expected damage of a hit is worked out, for the damage distribution,
+        the DamageMatrix and the PlaySolver alike.
+        """
+        if amount <= 0:
+            return 0, defense
+        amount = ModifierManager.apply_net_contribution(
+            state.damage_modifiers.get(damage_type, 0), amount
+            )
+        statuses = registries.statuses
+        if damage_type == DamageTypes.PHYSICAL.name:
+            if defense <= 0:
+                return amount, defense
+            damage = statuses.get_status(StatusNames.DEFENSE.name).modify_value(
+                amount, defense, True, 0
+                )
+            return damage, defense - (amount - damage)
+
+        amount = self.get_willpower_damage(amount, state.willpower, registries.attributes)
+        blocks = [(StatusNames.SPELL_ABSORPTION.name, state.spell_absorption)]
+        if state.has_attacker:
+            blocks.insert(0, (StatusNames.REFLECT.name, state.reflect))
+        for status_id, level in blocks:
+            if level > 0:
+                amount, _ = statuses.get_status(status_id).calculate_block(
+                    amount, damage_type, level
+                    )
+        return amount, defense
+
+    def get_willpower_damage(self, amount, willpower_level, attribute_registry) -> int:
+        """
+        Get the damage left after a defender's willpower reduces it.
+        """
+        if willpower_level <= 0:
+            return amount
+        modifier = attribute_registry.get_attribute_modifier(Attributes.WILLPOWER.name)
+        return max(floor(amount * (1 - modifier * willpower_level)), 0)
+
+    def get_roll_chances(self, state, registries) -> tuple:
+        """
+        Get the chance of evading and of a critical hit for a defender
+        state. Nothing is rolled without the status.
+        """
+        statuses = registries.statuses
+        evade_chance = crit_chance = 0.0
+        if state.evasion > 0:
+            evade_chance = statuses.get_status(StatusNames.EVASION.name).get_evasion_chance(
+                state.evasion, state.luck
+                )
+        if state.attacker_hidden > 0:
+            crit_chance = statuses.get_status(StatusNames.HIDDEN.name).get_crit_chance(
+                state.attacker_hidden, state.attacker_luck
+                )
+        return evade_chance, crit_chance
+
+    def get_evade_chance(self, defender) -> float:
+        """
+        Get the chance that the defender evades an attack.
+        """
+        evasion = defender.status_manager.get_leveled_status(StatusNames.EVASION.name)
+        if evasion is None:
+            return 0.0
+        return evasion.reference.get_evasion_chance(
+            evasion.get_level(), defender.get_attribute_level(Attributes.LUCK.name)
+            )
+
+    def get_crit_chance(self, attacker) -> float:
+        """
+        Get the chance that the attacker lands a critical hit.
+        """
+        if attacker is None:
+            return 0.0
+        hidden = attacker.status_manager.get_leveled_status(StatusNames.HIDDEN.name)
+        if hidden is None:
+            return 0.0
+        return hidden.reference.get_crit_chance(
+            hidden.get_level(), attacker.get_attribute_level(Attributes.LUCK.name)
+            )
+
     def process_willpower(self, defender, amount, attribute_registry) -> int:
         """
         Process willpower attribute for the defender.
@@ -55,9 +254,9 @@ class DamageCalculator:
             Attributes.WILLPOWER.name
             )
         if willpower_level > 0:
-            modifier = attribute_registry.get_attribute_modifier(Attributes.WILLPOWER.name)
-            reduction_percent = modifier * willpower_level
-            reduced_amount = max(floor(amount * (1 - reduction_percent)), 0)
+            reduced_amount = self.get_willpower_damage(
+                amount, willpower_level, attribute_registry
+                )
             difference = amount - reduced_amount
             if difference > 0:
                 defender.event_manager.logger.log(
@@ -152,7 +351,7 @@ class DamageCalculator:
                 )
         return amount
 
-    def process_hidden(self, defender, attacker, amount) -> int:
+    def process_hidden(self, defender, attacker, amount, rng) -> int:
         """
         Process hidden status for the attacker.
         """
@@ -162,7 +361,7 @@ class DamageCalculator:
                 hidden_level = hidden.get_level()
                 hidden_status = hidden.reference
                 luck = attacker.get_attribute_level(Attributes.LUCK.name)
-                mult = hidden_status.calculate_damage_multiplier(hidden_level, luck)
+                mult = hidden_status.calculate_damage_multiplier(hidden_level, luck, rng)
                 amount *= mult
                 if mult > 1:
                     defender.event_manager.logger.log(
@@ -170,7 +369,7 @@ class DamageCalculator:
                         )
         return amount
     
-    def process_evasion(self, defender, amount) -> int:
+    def process_evasion(self, defender, amount, rng) -> int:
         """
         Process evasion status for the defender.
         """
@@ -179,7 +378,7 @@ class DamageCalculator:
             evasion_status = evasion.reference
             evasion_level = evasion.get_level()
             luck = defender.get_attribute_level(Attributes.LUCK.name)
-            amount = evasion_status.calculate_evasion_damage(evasion_level, amount, luck)
+            amount = evasion_status.calculate_evasion_damage(evasion_level, amount, luck, rng)
             if amount == 0:
                 defender.event_manager.logger.log(
                     f"{defender.name} evaded the attack!"
@@ -0,0 +1,172 @@
+"""
+This module defines the DamageMatrix class, which computes the expected
+damage of every card against many defender configurations at once for
+balance work. The configurations are DamageCalculator DefenderStates. NumPy
+is required for the DamageMatrix.
+"""
+from core.effects import DamageEffect
+# DefenderState is also imported so callers can get it along with the matrix
+from gameplay.damage_calculator import DamageCalculator, DefenderState
+import utils.constants as c
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DAMAGE_TYPE_IDS = [damage_type.name for damage_type in c.DamageTypes]
+PHYSICAL_ID = c.DamageTypes.PHYSICAL.name
+# Multiplier on a hit's amount for each outcome of the evasion/crit rolls
+EVADED, NORMAL, CRITICAL = 0, 1, c.CRIT_MULTIPLIER
+
+class DamageMatrix:
+    """
+    Computes the expected damage of cards against defender states in one
+    batched pass. The chances of evading and of critical hits, and the
+    damage each hit deals, come from the DamageCalculator: every amount a
+    hit can have is resolved once per state and Defense level, and the
+    batched pass looks the results up. Evasion and critical hits use their
+    exact probabilities instead of being rolled.
+    """
+    def __init__(self, registries):
+        """
+        Initialize a new DamageMatrix.
+        """
+        if np is None:
+            raise ImportError(
+                "DamageMatrix requires NumPy. Install it with 'pip install numpy'."
+                )
+        self.registries = registries
+        self.damage_calculator = DamageCalculator()
+
+    def get_damage_hits(self, card, attacker=None) -> list:
+        """
+        Get a (damage type, amount) pair for each effect of the card that
+        damages the opponent. Other effects are ignored.
+        """
+        levels = card.get_effect_levels(attacker, self.registries.attributes)
+        hits = []
+        for effect, level in zip(card.effects, levels):
+            reference = effect.reference
+            if isinstance(reference, DamageEffect) \
+                    and reference.target_type_enum == c.TargetTypes.TARGET:
+                hits.append((reference.damage_type_enum.name, level))
+        return hits
+
+    def calculate_expected_damage(self, states, card_ids=None, attacker=None) -> tuple:
+        """
+        Return the card ids and a cards x states array of the expected damage
+        each card deals to a defender in each state. With an attacker, card
+        levels include the attacker's attributes.
+        """
+        card_registry = self.registries.cards
+        if card_ids is None:
+            card_ids, cards = [], []
+            for card_id in card_registry.card_prototypes:
+                # Leave out cards whose data references unknown effects
+                try:
+                    card = card_registry.create_card(card_id, self.registries.effects)
+                except ValueError:
+                    continue
+                card_ids.append(card_id)
+                cards.append(card)
+        else:
+            card_ids = list(card_ids)
+            cards = [
+                card_registry.create_card(card_id, self.registries.effects)
+                for card_id in card_ids
+                ]
+        card_hits = [self.get_damage_hits(card, attacker) for card in cards]
+        max_hits = max((len(hits) for hits in card_hits), default=0)
+        if not cards or not states or max_hits == 0:
+            return card_ids, np.zeros((len(cards), len(states)))
+
+        # Cards with fewer hits are padded with zero damage hits, which never
+        # change the outcome
+        amounts = np.zeros((len(cards), max_hits))
+        type_indices = np.zeros((len(cards), max_hits), dtype=np.intp)
+        for card_index, hits in enumerate(card_hits):
+            for hit_index, (damage_type, amount) in enumerate(hits):
+                amounts[card_index, hit_index] = amount
+                type_indices[card_index, hit_index] = DAMAGE_TYPE_IDS.index(damage_type)
+
+        calculator = self.damage_calculator
+        chances = np.array([
+            calculator.get_roll_chances(state, self.registries) for state in states
+            ])
+        evade_chance, crit_chance = chances[:, 0], chances[:, 1]
+        # Every amount a hit can have once the rolls are made
+        values = np.unique(np.concatenate([
+            amounts.ravel() * multiplier for multiplier in (EVADED, NORMAL, CRITICAL)
+            ]))
+        damage_table, defense_table = self._create_hit_tables(
+            states, values, set(type_indices.ravel())
+            )
+
+        # Each branch is (probability, remaining defense, damage dealt so far)
+        shape = (len(cards), len(states))
+        state_indices = np.arange(len(states))[None, :]
+        branches = [(
+            np.ones(shape),
+            np.broadcast_to(
+                np.array([int(state.defense) for state in states], dtype=np.intp), shape
+                ),
+            np.zeros(shape)
+            )]
+        outcomes = [
+            (EVADED, evade_chance),
+            (NORMAL, (1 - evade_chance) * (1 - crit_chance)),
+            (CRITICAL, (1 - evade_chance) * crit_chance)
+            ]
+        for hit_index in range(max_hits):
+            hit_types = type_indices[:, hit_index][:, None]
+            new_branches = []
+            for multiplier, chance in outcomes:
+                value_indices = np.searchsorted(
+                    values, amounts[:, hit_index] * multiplier
+                    )[:, None]
+                for probability, defense, dealt in branches:
+                    index = (state_indices, hit_types, value_indices, defense)
+                    new_branches.append((
+                        probability * chance, defense_table[index],
+                        dealt + damage_table[index]
+                        ))
+            branches = new_branches
+
+        expected_damage = sum(probability * dealt for probability, _, dealt in branches)
+        return card_ids, expected_damage
+
+    def _create_hit_tables(self, states, values, type_indices) -> tuple:
+        """
+        Resolve a hit of every amount in values and every damage type used
+        against every state, at every Defense level up to the state's own.
+        Return states x damage types x amounts x Defense arrays of the damage
+        taken and the Defense left.
+        """
+        max_defense = max(int(state.defense) for state in states)
+        shape = (len(states), len(DAMAGE_TYPE_IDS), len(values), max_defense + 1)
+        damage_table = np.zeros(shape)
+        defense_table = np.broadcast_to(
+            np.arange(max_defense + 1, dtype=np.intp), shape
+            ).copy()
+        get_mitigated_hit = self.damage_calculator.get_mitigated_hit
+        registries = self.registries
+        values = values.tolist()
+        for state_index, state in enumerate(states):
+            for type_index in type_indices:
+                damage_type = DAMAGE_TYPE_IDS[type_index]
+                # Only physical hits depend on Defense
+                defense_levels = range(int(state.defense) + 1) \
+                    if damage_type == PHYSICAL_ID else (0,)
+                for value_index, value in enumerate(values):
+                    for defense in defense_levels:
+                        damage, remaining_defense = get_mitigated_hit(
+                            state, value, damage_type, defense, registries
+                            )
+                        if damage_type == PHYSICAL_ID:
+                            damage_table[state_index, type_index, value_index, defense] = damage
+                            defense_table[state_index, type_index, value_index, defense] = \
+                                remaining_defense
+                        else:
+                            damage_table[state_index, type_index, value_index] = damage
+        return damage_table, defense_table
@@ -4,10 +4,19 @@ This module defines the Encounter class.
 
 class Encounter:
     """
-    This class represents an encounter in a quest.
+    This class represents an encounter in a quest. The enemy is only created
+    when the encounter is reached.
     """
-    def __init__(self, enemy):
+    __slots__ = ("enemy_id",)
+
+    def __init__(self, enemy_id):
         """
         Initialize a new Encounter.
         """
-        self.enemy = enemy
+        self.enemy_id = enemy_id
+
+    def create_enemy(self, registries):
+        """
+        Create the Enemy to fight in this encounter.
+        """
+        return registries.enemies.create_enemy(self.enemy_id, registries, None)
@@ -0,0 +1,309 @@
+"""
+This module defines the enemy policies, which decide which card an enemy
+plays next: the EnemyPolicy interface, the FirstPlayablePolicy, and the
+MCTSPolicy, which searches over card orderings with Monte Carlo tree search.
+"""
+import math
+import random
+from time import perf_counter
+import utils.constants as c
+from utils.event_manager import EventManager
+from utils.logger import Logger
+from gameplay.combat_manager import CombatManager
+from gameplay.state_hash import TranspositionTable
+
+class EnemyPolicy:
+    """
+    The base class for deciding which card an enemy plays.
+    """
+    def choose_card(self, combat_manager, player, enemy, registries):
+        """
+        Return the card the enemy should play next, or None to end the turn.
+        """
+        raise NotImplementedError
+
+
+class FirstPlayablePolicy(EnemyPolicy):
+    """
+    Plays the first card in hand that the enemy can afford and is allowed to
+    play.
+    """
+    def choose_card(self, combat_manager, player, enemy, registries):
+        """
+        Return the first playable card in hand, or None if there isn't one.
+        """
+        return combat_manager.find_playable_card(enemy, registries)
+
+
+class SearchNode:
+    """
+    A position in the search tree. Orders of play that reach the same
+    position share its node, which is looked up by state hash.
+    """
+    __slots__ = ("visits", "edges")
+
+    def __init__(self):
+        """
+        Initialize a new SearchNode.
+        """
+        self.visits = 0
+        self.edges = {}
+
+
+class SearchEdge:
+    """
+    The results of taking one action from a position.
+    """
+    __slots__ = ("visits", "total_value")
+
+    def __init__(self):
+        """
+        Initialize a new SearchEdge.
+        """
+        self.visits = 0
+        self.total_value = 0.0
+
+
+class MCTSPolicy(EnemyPolicy):
+    """
+    Chooses cards with Monte Carlo tree search over the order in which the
+    enemy plays its hand. Every simulated play goes through the real
+    CombatManager.play_card on the live combatants, which are restored from a
+    snapshot afterwards. Each turn gets budget_ms milliseconds of search,
+    shared between its decisions.
+
+    The enemy can't know the order of either deck or the outcome of future
+    rolls, so each iteration shuffles the decks and reseeds the registries'
+    random number generator from the policy's own one. While searching,
+    the combatants and their card and status managers use a silent event
+    manager, so no event reaches the GUI.
+
+    Nodes are kept in a transposition table keyed on the combat's state
+    hash, so playing the same cards in a different order leads to the same
+    node, and what one decision learned carries over to the next decision
+    of the turn.
+    """
+    END_TURN = None
+    # Stops rollouts that could otherwise keep playing free cards forever
+    MAX_ROLLOUT_PLAYS = 30
+
+    def __init__(self, budget_ms=c.ENEMY_SEARCH_BUDGET_MS, max_iterations=None,
+                 exploration=math.sqrt(2), seed=None):
+        """
+        Initialize a new MCTSPolicy. With max_iterations and a seed, searches
+        don't depend on timing and are reproducible.
+        """
+        self.budget_ms = budget_ms
+        self.max_iterations = max_iterations
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        # Plays made while searching must not reach the GUI
+        self.search_manager = CombatManager(
+            EventManager(Logger(print_debug=False, level=c.LogLevel.OFF))
+            )
+        self.turn_deadline = 0.0
+        self.nodes = TranspositionTable()
+
+    def choose_card(self, combat_manager, player, enemy, registries):
+        """
+        Search for the best next card, or None to end the turn.
+        """
+        now = perf_counter()
+        if enemy.cards_played_this_turn == 0:
+            self.turn_deadline = now + self.budget_ms / 1000
+            self.nodes.clear()
+        actions = self.get_actions(enemy, registries)
+        if actions == [self.END_TURN]:
+            return None
+        # Give this decision half of what's left of the turn's budget
+        deadline = now + max(self.turn_deadline - now, 0) / 2
+
+        root = self.get_node(player, enemy)
+        snapshot = combat_manager.snapshot(player, enemy)
+        rng_state = registries.rng.getstate()
+        logger = registries.statuses.event_manager.logger
+        log_level = logger.level
+        logger.set_level(c.LogLevel.OFF)
+        event_managers = self.swap_event_managers(
+            player, enemy, self.search_manager.event_manager
+            )
+        try:
+            iterations = 0
+            while self.max_iterations is None or iterations < self.max_iterations:
+                if self.max_iterations is None and iterations > 0 \
+                        and perf_counter() >= deadline:
+                    break
+                self.determinize(player, enemy, registries)
+                self.run_iteration(root, player, enemy, registries)
+                combat_manager.restore(snapshot, player, enemy)
+                iterations += 1
+        finally:
+            registries.rng.setstate(rng_state)
+            logger.set_level(log_level)
+            for owner, event_manager in event_managers:
+                owner.event_manager = event_manager
+
+        best_action = max(
+            actions, key=lambda action: self.get_visits(root, action)
+            )
+        return self.find_card(enemy, best_action, registries)
+
+    def swap_event_managers(self, player, enemy, event_manager) -> list:
+        """
+        Give both combatants and their card and status managers another
+        event manager, and return the owners with the ones they had.
+        """
+        swapped = []
+        for combatant in (player, enemy):
+            for owner in (combatant, combatant.card_manager, combatant.status_manager):
+                swapped.append((owner, owner.event_manager))
+                owner.event_manager = event_manager
+        return swapped
+
+    def determinize(self, player, enemy, registries):
+        """
+        Replace what the enemy can't know with a random guess: shuffle both
+        decks and reseed the registries' random number generator.
+        """
+        for combatant in (player, enemy):
+            deck = combatant.card_manager.deck
+            cards = list(deck)
+            self.rng.shuffle(cards)
+            deck.clear()
+            deck.extend(cards)
+        registries.rng.seed(self.rng.getrandbits(64))
+
+    def get_visits(self, node, action) -> int:
+        """
+        Get how often the search tried an action from a node.
+        """
+        edge = node.edges.get(action)
+        return edge.visits if edge is not None else 0
+
+    def get_node(self, player, enemy) -> SearchNode:
+        """
+        Get the node for the current position, creating it if the search
+        hasn't reached the position before.
+        """
+        key = self.search_manager.get_state_hash(player, enemy)
+        node = self.nodes.get(key)
+        if node is None:
+            node = SearchNode()
+            self.nodes.store(key, node)
+        return node
+
+    def get_actions(self, enemy, registries) -> list:
+        """
+        Get the card ids of every playable card in hand, each once, plus
+        ending the turn.
+        """
+        actions = []
+        combat_manager = self.search_manager
+        for card in enemy.card_manager.hand:
+            if card.card_id in actions:
+                continue
+            resource = enemy.resources[card.get_resource()]
+            if card.get_cost(enemy, registries.attributes) <= resource.current \
+                    and combat_manager.card_can_be_played(enemy, card):
+                actions.append(card.card_id)
+        actions.append(self.END_TURN)
+        return actions
+
+    def find_card(self, enemy, action, registries):
+        """
+        Get the first playable card in hand for an action.
+        """
+        if action is self.END_TURN:
+            return None
+        for card in enemy.card_manager.hand:
+            if card.card_id == action:
+                return card
+        return None
+
+    def run_iteration(self, root, player, enemy, registries):
+        """
+        Select a line of play down the tree, expand it by one card, finish the
+        turn with random plays, and record the result along the path.
+        """
+        combat_manager = self.search_manager
+        node = root
+        path = []
+        ended = False
+        while not ended and not combat_manager.is_combat_over(player, enemy):
+            actions = self.get_actions(enemy, registries)
+            untried = [action for action in actions if action not in node.edges]
+            if untried:
+                action = self.rng.choice(untried)
+                edge = node.edges[action] = SearchEdge()
+            else:
+                action, edge = self.select_edge(node, actions)
+            path.append((node, edge))
+            ended = self.apply_action(action, player, enemy, registries)
+            if untried or ended:
+                break
+            node = self.get_node(player, enemy)
+            # Cards that come back to the hand can lead to a position already
+            # on the path
+            if any(node is visited for visited, _ in path):
+                break
+
+        if not ended:
+            self.rollout(player, enemy, registries)
+        value = self.evaluate(player, enemy)
+        for node, edge in path:
+            node.visits += 1
+            edge.visits += 1
+            edge.total_value += value
+
+    def select_edge(self, node, actions) -> tuple:
+        """
+        Pick the action with the best upper confidence bound among the
+        actions that are currently possible.
+        """
+        log_visits = math.log(node.visits)
+        best_score = -math.inf
+        best = None
+        for action in actions:
+            edge = node.edges[action]
+            score = edge.total_value / edge.visits \
+                + self.exploration * math.sqrt(log_visits / edge.visits)
+            if score > best_score:
+                best_score = score
+                best = (action, edge)
+        return best
+
+    def apply_action(self, action, player, enemy, registries) -> bool:
+        """
+        Play the card for an action. Return true if the action ended the turn.
+        """
+        if action is self.END_TURN:
+            return True
+        card = self.find_card(enemy, action, registries)
+        self.search_manager.play_card(enemy, player, card, registries)
+        return False
+
+    def rollout(self, player, enemy, registries):
+        """
+        Finish the turn by making random choices.
+        """
+        combat_manager = self.search_manager
+        for _ in range(self.MAX_ROLLOUT_PLAYS):
+            if combat_manager.is_combat_over(player, enemy):
+                return
+            action = self.rng.choice(self.get_actions(enemy, registries))
+            if self.apply_action(action, player, enemy, registries):
+                return
+
+    def evaluate(self, player, enemy) -> float:
+        """
+        Score a position from the enemy's side, between 0 and 1: winning is
+        1, losing is 0, and anything else weighs the player's missing health
+        against the enemy's remaining health.
+        """
+        if not player.is_alive():
+            return 1.0
+        if not enemy.is_alive():
+            return 0.0
+        player_damage = 1 - player.get_health() / max(player.get_max_health(), 1)
+        enemy_health = enemy.get_health() / max(enemy.get_max_health(), 1)
+        return (player_damage + enemy_health) / 2
@@ -19,7 +19,9 @@ class Library:
         """
         deck = card_manager.deck
         while True:
-            deck.sort(key=lambda card: card.name)
+            sorted_deck = sorted(deck, key=lambda card: card.name)
+            deck.clear()
+            deck.extend(sorted_deck)
             self.stored_cards.sort(key=lambda card: card.name)
             menu_choice = text_interface.library_options_prompt()
             if menu_choice == 0:  # show deck
@@ -27,7 +29,7 @@ class Library:
                     deck, deck, text_interface, effect_registry, False
                     )
                 if cards:
-                    self.deposit_cards(cards, deck)
+                    self.deposit_cards(cards, card_manager)
             elif menu_choice == 1:  # show stored cards
                 cards = self.handle_storage_menu(
                     self.stored_cards, deck, text_interface, effect_registry,
@@ -70,10 +72,11 @@ class Library:
             return cards
         return []
 
-    def deposit_cards(self, cards, deck):
+    def deposit_cards(self, cards, card_manager):
         """
         Move the card from the deck to the library.
         """
+        deck = card_manager.deck
         for card in cards:
             if card not in deck:
                 raise ValueError("Card is not in deck.")
@@ -81,7 +84,7 @@ class Library:
                 raise ValueError(
                     f"Deck cannot have fewer than {c.MIN_DECK_SIZE} cards."
                     )
-            deck.remove(card)
+            card_manager.remove_from_deck(card)
             self.stored_cards.append(card)
 
     def withdraw_cards(self, cards, card_manager, text_interface):
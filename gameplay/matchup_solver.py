@@ -0,0 +1,1015 @@
+"""
+This module defines the MatchupSolver, CombatantModel, AttributeLevels and
+MatchupResult classes, which work out the exact odds of a combat between
+small decks instead of estimating them from many CombatSession runs.
+"""
+from math import comb, factorial, floor
+from core.effects import ChangeResourceEffect, ChangeStatusEffect, DamageEffect, NoEffect
+from core.player import Player
+from core.statuses import (
+    DefenseStatus, LimitCardPlayStatus, ModifyAttributeStatus, RestrictCardTypeStatus
+    )
+from gameplay.damage_calculator import DefenderState
+import utils.constants as c
+
+RESOURCE_IDS = [resource.name for resource in c.Resources]
+HEALTH_INDEX = RESOURCE_IDS.index(c.Resources.HEALTH.name)
+PHYSICAL_ID = c.DamageTypes.PHYSICAL.name
+PLAYER_WON, PLAYER_LOST = True, False
+# What a card does to the combatants' health and statuses, in the order the
+# solver replays it
+DAMAGE, RESTORE, CHANGE_STATUS = range(3)
+
+class MatchupResult:
+    """
+    This class holds the odds of a matchup.
+    """
+    def __init__(
+            self, win_chance, loss_chance, timeout_chance, unresolved_chance,
+            expected_turns, expected_turns_to_kill, states
+            ):
+        """
+        Initialize a new MatchupResult. unresolved_chance is the chance of
+        the combats the solver stopped following before they ended, and is
+        zero for an exact solution. expected_turns is the mean of
+        CombatResult.turns over the combats that were resolved, and
+        expected_turns_to_kill is the mean number of turns the player takes
+        to win, counted the way the Tournament counts them. Both are None
+        when more than the tolerance is unresolved, since the longest combats
+        are the ones left out. states is the number of states the solver
+        went through.
+        """
+        self.win_chance = win_chance
+        self.loss_chance = loss_chance
+        self.timeout_chance = timeout_chance
+        self.unresolved_chance = unresolved_chance
+        self.expected_turns = expected_turns
+        self.expected_turns_to_kill = expected_turns_to_kill
+        self.states = states
+
+    def get_result_data(self) -> dict:
+        """
+        Get a dictionary of the result's data.
+        """
+        return {
+            "win_chance": self.win_chance,
+            "loss_chance": self.loss_chance,
+            "timeout_chance": self.timeout_chance,
+            "unresolved_chance": self.unresolved_chance,
+            "expected_turns": self.expected_turns,
+            "expected_turns_to_kill": self.expected_turns_to_kill,
+            "states": self.states
+        }
+
+
+class AttributeLevels:
+    """
+    Stands in for a combatant when working out card costs and effect levels
+    with other attribute deltas, so the combatant itself is never changed.
+    """
+    __slots__ = ("attributes", "attribute_deltas", "attribute_version")
+
+    def __init__(self, attributes, attribute_deltas):
+        """
+        Initialize a new AttributeLevels.
+        """
+        self.attributes = attributes
+        self.attribute_deltas = attribute_deltas
+        self.attribute_version = 0
+
+    def get_attribute_level(self, attribute_id) -> int:
+        """
+        Get the level of a character attribute, including deltas.
+        """
+        return self.attributes.get(attribute_id, 0) + self.attribute_deltas.get(attribute_id, 0)
+
+
+class CombatantModel:
+    """
+    What the solver needs to know about one side of a matchup. Cards that
+    always behave the same are grouped into kinds, and the side's cards are
+    worked out turn by turn into scripts: the chance of each way the deck and
+    discard pile can end up, along with what the cards played did, in order.
+    A turn's script depends only on the side's own cards and the statuses
+    that change how its turn plays out, such as attribute changes, diseases
+    and paralysis, so it is worked out once and replayed against any opponent.
+    """
+    def __init__(self, combatant, status_ids, registries):
+        """
+        Initialize a new CombatantModel. status_ids lists every status either
+        side's cards can change, in the order the solver keeps their levels.
+        """
+        card_manager = combatant.card_manager
+        if card_manager.hand:
+            raise ValueError(
+                f"{combatant.name or 'The player'} must have an empty hand to be solved."
+                )
+        self.combatant = combatant
+        self.registries = registries
+        self.is_enemy = combatant.is_enemy
+        self.status_ids = status_ids
+        statuses = [registries.statuses.get_status(status_id) for status_id in status_ids]
+        self.attribute_statuses = [
+            (index, status) for index, status in enumerate(statuses)
+            if isinstance(status, ModifyAttributeStatus)
+            ]
+        # Statuses that change how this side's turn plays out
+        self.turn_indices = [
+            index for index, status in enumerate(statuses) if isinstance(
+                status, (ModifyAttributeStatus, RestrictCardTypeStatus, LimitCardPlayStatus)
+                )
+            ]
+        self.turn_statuses = [statuses[index] for index in self.turn_indices]
+        self.has_play_limit = any(
+            isinstance(status, LimitCardPlayStatus) for status in self.turn_statuses
+            )
+        self.defense_index = None
+        for index, status in enumerate(statuses):
+            if isinstance(status, DefenseStatus):
+                self.defense_index = index
+
+        self.max_values = tuple(
+            combatant.resources[resource_id].get_max(combatant.modifier_manager)
+            for resource_id in RESOURCE_IDS
+            )
+        self.speed_modifier = registries.attributes.get_attribute_modifier(
+            c.Attributes.SPEED.name
+            )
+        # Attribute deltas that don't come from statuses the solver tracks
+        self.base_deltas = dict(combatant.attribute_deltas)
+        for index, status in self.attribute_statuses:
+            level = self.get_status_levels()[index]
+            self.base_deltas[status.attribute_id] -= level * status.sign_factor
+        self.turn_values = {}
+        self.scripts = {}
+        # The opponent's Defense each action list and turn can take off
+        self.defense_reach = {}
+        self.actions_reach = {}
+        # Turn states and action lists are numbered so positions are cheap to
+        # merge and each draw from a turn state is only worked out once
+        self.turn_states = []
+        self.turn_state_ids = {}
+        self.transitions = {}
+        self.draws = {}
+        self.draw_chances = {}
+        self.action_lists = [()]
+        self.action_ids = {(): 0}
+        self.combined_actions = {}
+
+        self.kinds = []
+        self.cards = []
+        self.kind_indices = {}
+        for card in (*card_manager.deck, *card_manager.discard_pile):
+            if card.name in self.kind_indices:
+                continue
+            signature = self._get_signature(card)
+            if signature not in self.kinds:
+                self.kinds.append(signature)
+                self.cards.append(card)
+            self.kind_indices[card.name] = self.kinds.index(signature)
+        self.resource_indices = [RESOURCE_IDS.index(card.get_resource()) for card in self.cards]
+        self.is_consumable = [card.matches(c.CardTypes.CONSUMABLE.name) for card in self.cards]
+        self.can_become_playable = any(
+            self._can_unlock_cards(card) for card in self.cards
+            )
+        self.empty_pile = (0,) * len(self.kinds)
+
+    def _get_signature(self, card):
+        """
+        Get what decides how a card plays. Cards that no tracked status can
+        change are described by their resource, cost and effect levels, so
+        cards that play the same way count as one kind. Any other card is
+        its own kind.
+        """
+        attribute_registry = self.registries.attributes
+        tracked = {status.attribute_id for _, status in self.attribute_statuses}
+        contexts = [attribute_registry.get_attribute_by_context(card.card_type, card.subtypes)]
+        for effect in card.effects:
+            contexts.append(attribute_registry.get_attribute_by_context(
+                card.card_type, card.subtypes, effect.str_id
+                ))
+        if any(attribute in tracked for attribute, _ in contexts):
+            return card.name
+        turn_levels = self.get_turn_levels(self.get_status_levels())
+        levels = self.get_turn_values(turn_levels, (card,))[1][0]
+        return (
+            card.get_resource(), card.matches(c.CardTypes.CONSUMABLE.name),
+            card.get_cost(self.combatant, attribute_registry),
+            tuple(zip((effect.str_id for effect in card.effects), levels))
+            )
+
+    def _can_unlock_cards(self, card) -> bool:
+        """
+        Check if playing the card could make a card that couldn't be played
+        playable later in the turn, by restoring stamina or magicka or by
+        changing a status that affects costs or which cards can be played.
+        """
+        for effect in card.effects:
+            reference = effect.reference
+            if reference.target_type_enum == c.TargetTypes.TARGET:
+                continue
+            if isinstance(reference, ChangeResourceEffect) \
+                    and reference.resource_enum != c.Resources.HEALTH:
+                return True
+            if isinstance(reference, ChangeStatusEffect) and isinstance(
+                    reference.status_ref, (ModifyAttributeStatus, RestrictCardTypeStatus)
+                    ):
+                return True
+        return False
+
+    def get_status_levels(self) -> tuple:
+        """
+        Get the combatant's current level of each status the solver tracks.
+        Any other active status can't be solved.
+        """
+        statuses = self.combatant.status_manager.statuses
+        for status_id in statuses:
+            if status_id not in self.status_ids:
+                raise ValueError(f"The {status_id} status is not supported by the solver.")
+        return tuple(
+            statuses[status_id].get_level() if status_id in statuses else 0
+            for status_id in self.status_ids
+            )
+
+    def get_turn_levels(self, status_levels) -> tuple:
+        """
+        Get the levels of the statuses that change how this side's turn
+        plays out.
+        """
+        return tuple(status_levels[index] for index in self.turn_indices)
+
+    def get_pile_counts(self, pile) -> tuple:
+        """
+        Count the cards of each kind in a pile.
+        """
+        counts = [0] * len(self.kinds)
+        for card in pile:
+            counts[self.kind_indices[card.name]] += 1
+        return tuple(counts)
+
+    def get_turn_values(self, turn_levels, cards=None) -> tuple:
+        """
+        Get the cost and effect levels of each kind of card, the number of
+        cards drawn at the start of a turn, the willpower level, whether each
+        kind of card is allowed to be played and the most cards that can be
+        played in a turn, or None, while the statuses that change the turn
+        are at the given levels.
+        """
+        if cards is None:
+            values = self.turn_values.get(turn_levels)
+            if values is not None:
+                return values
+        attribute_registry = self.registries.attributes
+        deltas = dict(self.base_deltas)
+        for status, level in zip(self.turn_statuses, turn_levels):
+            if isinstance(status, ModifyAttributeStatus):
+                deltas[status.attribute_id] += level * status.sign_factor
+        owner = AttributeLevels(dict(self.combatant.attributes), deltas)
+        speed_level = owner.get_attribute_level(c.Attributes.SPEED.name)
+        cards_to_draw = floor(self.speed_modifier * speed_level) + c.HAND_SIZE
+        costs = tuple(
+            card.get_cost(owner, attribute_registry) for card in cards or self.cards
+            )
+        levels = tuple(
+            card.get_effect_levels(owner, attribute_registry) for card in cards or self.cards
+            )
+        willpower_level = owner.get_attribute_level(c.Attributes.WILLPOWER.name)
+        # Statuses that stop cards being played, as CombatManager.card_can_be_played checks
+        allowed = [True] * len(cards or self.cards)
+        play_limit = None
+        for status, level in zip(self.turn_statuses, turn_levels):
+            if level == 0:
+                continue
+            if isinstance(status, RestrictCardTypeStatus):
+                for index, card in enumerate(cards or self.cards):
+                    if not status.is_card_playable(card.card_type):
+                        allowed[index] = False
+            elif isinstance(status, LimitCardPlayStatus):
+                play_limit = status.card_limit if play_limit is None \
+                    else min(play_limit, status.card_limit)
+        values = (
+            costs, levels, min(cards_to_draw, c.MAX_HAND_SIZE), willpower_level,
+            tuple(allowed), play_limit
+            )
+        if cards is None:
+            self.turn_values[turn_levels] = values
+        return values
+
+    def calculate_damage(self, amount, damage_type, status_levels) -> tuple:
+        """
+        Get the damage the combatant takes from a hit and its status levels
+        afterwards, as DamageCalculator.calculate_damage works them out.
+        """
+        if amount <= 0:
+            return 0, status_levels
+        index = self.defense_index
+        defense = status_levels[index] if index is not None else 0
+        state = DefenderState(
+            damage_modifiers=self.combatant.modifier_manager.damage_totals,
+            willpower=self.get_turn_values(self.get_turn_levels(status_levels))[3]
+            )
+        damage, remaining_defense = self.combatant.damage_calculator.get_mitigated_hit(
+            state, amount, damage_type, defense, self.registries
+            )
+        if remaining_defense != defense:
+            status_levels = status_levels[:index] + (remaining_defense,) \
+                + status_levels[index + 1:]
+        return damage, status_levels
+
+    def get_scripts(self, deck, discard, status_levels) -> list:
+        """
+        Get every way a turn can go for the side's cards, grouped by what the
+        cards played did, as (actions id, chance, piles) tuples where piles
+        lists the (deck, discard pile, chance) each group can leave. The id
+        indexes action_lists, where each action is a tuple of its kind,
+        whether it targets this side, and its details.
+        """
+        key = (deck, discard, self.get_turn_levels(status_levels))
+        scripts = self.scripts.get(key)
+        if scripts is None:
+            groups = {}
+            for (deck, discard, actions_id), chance in self._create_scripts(*key).items():
+                groups.setdefault(actions_id, []).append((deck, discard, chance))
+            scripts = self.scripts[key] = [
+                (actions_id, sum(chance for _, _, chance in piles), piles)
+                for actions_id, piles in groups.items()
+                ]
+        return scripts
+
+    def get_defense_reach(self, deck, discard, status_levels, opponent) -> int:
+        """
+        Get the most Defense this side's next turn can take off the opponent,
+        through physical hits and by removing Defense outright. Piles are
+        drawn the way _create_scripts draws them, without working out the
+        chance of each script.
+        """
+        turn_levels = self.get_turn_levels(status_levels)
+        key = (deck, discard, turn_levels)
+        reach = self.defense_reach.get(key)
+        if reach is not None:
+            return reach
+        cards_to_draw = self.get_turn_values(turn_levels)[2]
+        start_id = self._get_turn_state_id((self.max_values, (), turn_levels, 0))
+        deck_size = sum(deck)
+        if deck_size >= cards_to_draw:
+            reach = max(
+                self._get_draw_reach(start_id, cards_to_draw, drawn, opponent)
+                for drawn, _ in self._get_draw_chances(deck, cards_to_draw)
+                )
+        else:
+            reshuffled_draws = min(cards_to_draw - deck_size, sum(discard))
+            draw_chances = self._get_draw_chances(discard, reshuffled_draws)
+            reach = max(
+                self._get_actions_reach(first_actions_id, opponent) + max(
+                    self._get_draw_reach(first_id, reshuffled_draws, drawn, opponent)
+                    for drawn, _ in draw_chances
+                    )
+                for first_id, _, first_actions_id in
+                self._get_draws(start_id, deck_size)[deck]
+                )
+        self.defense_reach[key] = reach
+        return reach
+
+    def _get_draw_reach(self, turn_state_id, cards_to_draw, drawn, opponent) -> int:
+        """
+        Get the most Defense drawing a set of cards from a turn state can
+        take off the opponent.
+        """
+        return max(
+            self._get_actions_reach(actions_id, opponent)
+            for _, _, actions_id in self._get_draws(turn_state_id, cards_to_draw)[drawn]
+            )
+
+    def _get_actions_reach(self, actions_id, opponent) -> int:
+        """
+        Get the Defense an action list takes off the opponent.
+        """
+        reach = self.actions_reach.get(actions_id)
+        if reach is not None:
+            return reach
+        index = opponent.defense_index
+        reach = 0
+        for action in self.action_lists[actions_id]:
+            if action[1]:
+                continue
+            if action[0] == DAMAGE:
+                if action[2] == PHYSICAL_ID and action[3] > 0:
+                    reach += max(opponent.combatant.modifier_manager.get_net_damage(
+                        PHYSICAL_ID, action[3]
+                        ), 0)
+            elif action[0] == CHANGE_STATUS and action[2] == index and action[3] < 0:
+                reach -= action[3]
+        self.actions_reach[actions_id] = reach
+        return reach
+
+    def _create_scripts(self, deck, discard, turn_levels) -> dict:
+        """
+        Work out the scripts from the chance of drawing each set of cards and
+        what the turn does with each set. If the deck runs out, the whole deck
+        is drawn first and the rest comes from the reshuffled discard pile,
+        which doesn't include the cards already in hand.
+        """
+        cards_to_draw = self.get_turn_values(turn_levels)[2]
+        start_id = self._get_turn_state_id((self.max_values, (), turn_levels, 0))
+        deck_size = sum(deck)
+        scripts = {}
+        if deck_size >= cards_to_draw:
+            draws = self._get_draws(start_id, cards_to_draw)
+            for drawn, draw_chance in self._get_draw_chances(deck, cards_to_draw):
+                new_deck = _subtract(deck, drawn)
+                new_discards = {}
+                for (_, consumed, actions_id), chance in draws[drawn].items():
+                    new_discard = new_discards.get(consumed)
+                    if new_discard is None:
+                        new_discard = new_discards[consumed] = _subtract(
+                            _add(discard, drawn), consumed
+                            )
+                    script = (new_deck, new_discard, actions_id)
+                    scripts[script] = scripts.get(script, 0.0) + draw_chance * chance
+            return scripts
+
+        reshuffled_draws = min(cards_to_draw - deck_size, sum(discard))
+        draw_chances = self._get_draw_chances(discard, reshuffled_draws)
+        for (first_id, first_consumed, first_actions_id), first_chance in \
+                self._get_draws(start_id, deck_size)[deck].items():
+            draws = self._get_draws(first_id, reshuffled_draws)
+            for drawn, draw_chance in draw_chances:
+                new_deck = _subtract(discard, drawn)
+                hand = _subtract(_add(deck, drawn), first_consumed)
+                new_discards = {}
+                for (_, consumed, actions_id), chance in draws[drawn].items():
+                    if actions_id:
+                        actions_id = self._add_actions(first_actions_id, actions_id)
+                    else:
+                        actions_id = first_actions_id
+                    new_discard = new_discards.get(consumed)
+                    if new_discard is None:
+                        new_discard = new_discards[consumed] = _subtract(hand, consumed)
+                    script = (new_deck, new_discard, actions_id)
+                    scripts[script] = scripts.get(script, 0.0) \
+                        + first_chance * draw_chance * chance
+        return scripts
+
+    def _get_draw_chances(self, pile, cards_to_draw) -> list:
+        """
+        Get the chance of drawing each set of cards from a pile, keeping it
+        for the next time the pile comes up.
+        """
+        key = (pile, cards_to_draw)
+        draw_chances = self.draw_chances.get(key)
+        if draw_chances is None:
+            draw_chances = self.draw_chances[key] = _get_draw_chances(pile, cards_to_draw)
+        return draw_chances
+
+    def _get_draws(self, turn_state_id, cards_to_draw) -> dict:
+        """
+        Work out what drawing a number of cards does from a turn state, for
+        every set of cards that could be drawn. Each card is played straight
+        away if the first-playable rule would play it, which leads to the same
+        plays as drawing the whole hand first. A card that can't be played yet
+        is set aside, in hand order, in case it can be played later in the
+        turn. Every order of a set of cards is as likely as any other whatever
+        the deck holds, so this only depends on the turn state. Return, for
+        each set, the chance of each (turn state id, consumables used, actions
+        id) outcome.
+        """
+        key = (turn_state_id, cards_to_draw)
+        draws = self.draws.get(key)
+        if draws is not None:
+            return draws
+        empty_pile = self.empty_pile
+        transitions = self.transitions
+        # Count the orders of drawing each set that lead to each outcome
+        positions = {(empty_pile, empty_pile, turn_state_id, 0): 1}
+        for _ in range(cards_to_draw):
+            drawn_positions = {}
+            for (drawn, consumed, state_id, actions_id), orders in positions.items():
+                for kind in range(len(drawn)):
+                    transition = transitions.get((kind, state_id))
+                    if transition is None:
+                        transition = transitions[(kind, state_id)] = \
+                            self._draw_card(kind, state_id)
+                    next_state_id, consumed_kinds, added_id = transition
+                    next_consumed = consumed
+                    for consumed_kind in consumed_kinds:
+                        next_consumed = next_consumed[:consumed_kind] \
+                            + (next_consumed[consumed_kind] + 1,) + next_consumed[consumed_kind + 1:]
+                    position = (
+                        drawn[:kind] + (drawn[kind] + 1,) + drawn[kind + 1:], next_consumed,
+                        next_state_id,
+                        self._add_actions(actions_id, added_id) if added_id else actions_id
+                        )
+                    drawn_positions[position] = drawn_positions.get(position, 0) + orders
+            positions = drawn_positions
+
+        draws = self.draws[key] = {}
+        for (drawn, consumed, state_id, actions_id), orders in positions.items():
+            total_orders = factorial(cards_to_draw)
+            for count in drawn:
+                total_orders //= factorial(count)
+            outcomes = draws.setdefault(drawn, {})
+            outcomes[(state_id, consumed, actions_id)] = orders / total_orders
+        return draws
+
+    def _get_turn_state_id(self, turn_state) -> int:
+        """
+        Number a turn state, keeping it in turn_states.
+        """
+        turn_state_id = self.turn_state_ids.get(turn_state)
+        if turn_state_id is None:
+            turn_state_id = self.turn_state_ids[turn_state] = len(self.turn_states)
+            self.turn_states.append(turn_state)
+        return turn_state_id
+
+    def _get_actions_id(self, actions) -> int:
+        """
+        Number a list of actions, keeping it in action_lists.
+        """
+        actions_id = self.action_ids.get(actions)
+        if actions_id is None:
+            actions_id = self.action_ids[actions] = len(self.action_lists)
+            self.action_lists.append(actions)
+        return actions_id
+
+    def _add_actions(self, actions_id, added_id) -> int:
+        """
+        Add the actions of one draw to a script's actions.
+        """
+        key = (actions_id, added_id)
+        combined_id = self.combined_actions.get(key)
+        if combined_id is None:
+            actions = self.action_lists[actions_id]
+            for action in self.action_lists[added_id]:
+                actions = _add_action(actions, action)
+            combined_id = self.combined_actions[key] = self._get_actions_id(actions)
+        return combined_id
+
+    def _can_play(self, kind, turn_state) -> bool:
+        """
+        Check if the first-playable rule could play a card now.
+        """
+        resources, _, turn_levels, plays = turn_state
+        costs, _, _, _, allowed, play_limit = self.get_turn_values(turn_levels)
+        return allowed[kind] and (play_limit is None or plays < play_limit) \
+            and costs[kind] <= resources[self.resource_indices[kind]]
+
+    def _draw_card(self, kind, turn_state_id) -> tuple:
+        """
+        Play a drawn card if the first-playable rule would play it, or else
+        set it aside, then play any card set aside earlier that can now be
+        played. Return the id of the new turn state, the kinds of consumables
+        used up and the id of the actions taken.
+        """
+        turn_state = self.turn_states[turn_state_id]
+        consumed = []
+        actions = ()
+        if self._can_play(kind, turn_state):
+            turn_state, actions = self._play_card(kind, turn_state, consumed, actions)
+            while turn_state[1]:
+                skipped = turn_state[1]
+                for index, skipped_kind in enumerate(skipped):
+                    if self._can_play(skipped_kind, turn_state):
+                        break
+                else:
+                    break
+                turn_state = (turn_state[0], skipped[:index] + skipped[index + 1:]) \
+                    + turn_state[2:]
+                turn_state, actions = self._play_card(
+                    skipped_kind, turn_state, consumed, actions
+                    )
+        elif self.can_become_playable:
+            resources, skipped, turn_levels, plays = turn_state
+            play_limit = self.get_turn_values(turn_levels)[5]
+            # Nothing more is played once the limit is reached
+            if play_limit is None or plays < play_limit:
+                turn_state = (resources, skipped + (kind,), turn_levels, plays)
+        return (
+            self._get_turn_state_id(turn_state), tuple(consumed),
+            self._get_actions_id(actions)
+            )
+
+    def _play_card(self, kind, turn_state, consumed, actions) -> tuple:
+        """
+        Spend a card's cost and record its effects, as CombatManager.play_card
+        does. Attribute statuses on this side change straight away, since
+        they can change the costs and levels of the cards after them.
+        """
+        resources, skipped, turn_levels, plays = turn_state
+        resources = list(resources)
+        resources[self.resource_indices[kind]] -= self.get_turn_values(turn_levels)[0][kind]
+        for index, effect in enumerate(self.cards[kind].effects):
+            # Earlier effects may have changed attributes, so look this up each time
+            level = self.get_turn_values(turn_levels)[1][kind][index]
+            reference = effect.reference
+            on_self = reference.target_type_enum != c.TargetTypes.TARGET
+            if isinstance(reference, DamageEffect):
+                actions += ((DAMAGE, on_self, reference.damage_type_enum.name, level),)
+            elif isinstance(reference, ChangeResourceEffect):
+                resource_index = RESOURCE_IDS.index(reference.resource_enum.name)
+                if resource_index == HEALTH_INDEX:
+                    actions += ((RESTORE, on_self, level),)
+                elif on_self:
+                    resources[resource_index] = min(
+                        max(resources[resource_index] + level, c.MIN_RESOURCE),
+                        self.max_values[resource_index]
+                        )
+                # The opponent's stamina and magicka refill before it plays
+            elif isinstance(reference, ChangeStatusEffect) and level != 0:
+                status_index = self.status_ids.index(reference.status_ref.status_id)
+                actions += ((CHANGE_STATUS, on_self, status_index, level),)
+                if on_self and status_index in self.turn_indices:
+                    turn_levels = _change_level(
+                        turn_levels, self.turn_indices.index(status_index), level
+                        )
+        if self.is_consumable[kind]:
+            consumed.append(kind)
+        if self.has_play_limit:
+            plays += 1
+        return (tuple(resources), skipped, turn_levels, plays), actions
+
+
+class MatchupSolver:
+    """
+    Solves a combat between the player and an enemy, with both sides playing
+    the first affordable card in hand as CombatSession does.
+
+    The state at the start of each turn is both sides' health, the number of
+    each kind of card in their decks and discard piles, and their status
+    levels. Decks are always in random order, so the cards in them can be
+    counted rather than ordered. The chance of being in each state is carried
+    forward turn by turn, playing every script of the side whose turn it is
+    against the other side, until the combat is decided or the turn limit is
+    reached.
+
+    Combats can drag on with ever smaller chances, so the solver stops once
+    the chance left is below a tolerance, or once the states outgrow a limit,
+    and reports the chance it didn't resolve. Past the tolerance, it doesn't
+    report expected turns, since the combats it left out are the longest.
+
+    The solver is exact, and meant for small decks and short matchups, such
+    as checking the odds of a new card or enemy against a handful of cards.
+    The number of states grows with every way both decks and discard piles
+    can be split, so it is not a faster way to estimate big matchups than
+    CombatSession runs. Against the fighter's starting deck, rats and cave
+    rats solve exactly in about the time of a few thousand runs. Mudcrabs,
+    giant cave rats, sewer rats, scribs and the diseased beasts take
+    hundreds of thousands of states and ten seconds or more, so with the
+    default limit they come back within a second with part of the chance
+    unresolved. Use the Tournament for those.
+
+    Defense piles up into new states that mostly play out the same. With
+    cap_defense, it is capped at enough to block the opponent's biggest
+    possible turn for MATCHUP_SOLVER_DEFENSE_TURNS turns, which cuts the
+    states down but makes the result approximate.
+
+    Only matchups whose cards deal damage, change resources and apply or
+    remove Defense, attribute statuses, diseases that limit the cards played
+    in a turn and paralysis can be solved. Anything else, such as poison,
+    evasion, reflection or resistances, raises a ValueError.
+    """
+    SUPPORTED_STATUSES = (
+        DefenseStatus, ModifyAttributeStatus, RestrictCardTypeStatus, LimitCardPlayStatus
+        )
+
+    def __init__(self, registries):
+        """
+        Initialize a new MatchupSolver.
+        """
+        self.registries = registries
+        self.outcomes = {}
+        self.cap_defense = False
+
+    def solve_matchup(
+            self, character_class, enemy_id, max_turns=c.MAX_COMBAT_TURNS,
+            tolerance=c.MATCHUP_SOLVER_TOLERANCE, max_states=c.MATCHUP_SOLVER_MAX_STATES,
+            cap_defense=False
+            ) -> MatchupResult:
+        """
+        Solve a combat between a new player of a class and a new enemy.
+        """
+        registries = self.registries
+        event_manager = registries.statuses.event_manager
+        player = Player(registries, character_class, event_manager)
+        enemy = registries.enemies.create_enemy(enemy_id, registries, None)
+        return self.solve(player, enemy, max_turns, tolerance, max_states, cap_defense)
+
+    def solve(
+            self, player, enemy, max_turns=c.MAX_COMBAT_TURNS,
+            tolerance=c.MATCHUP_SOLVER_TOLERANCE, max_states=c.MATCHUP_SOLVER_MAX_STATES,
+            cap_defense=False
+            ) -> MatchupResult:
+        """
+        Solve a combat between the player and the enemy, starting with the
+        player's turn from their current health, piles and statuses. The
+        solver stops early once the chance that the combat is still going is
+        below the tolerance, or as soon as either side's turn would lead to
+        more than max_states states, and reports what's left as unresolved.
+
+        With cap_defense, Defense left at the end of a turn is capped as the
+        class describes, which keeps the state count down at the cost of
+        exactness. With a tolerance of zero and no state limit, every combat
+        is followed to its end.
+        """
+        status_ids = self._get_status_ids(player, enemy)
+        player_model = CombatantModel(player, status_ids, self.registries)
+        enemy_model = CombatantModel(enemy, status_ids, self.registries)
+        self.outcomes = {}
+        self.cap_defense = cap_defense
+
+        states = {(self._get_side(player_model), self._get_side(enemy_model)): 1.0}
+        win_chance = 0.0
+        loss_chance = 0.0
+        total_turns = 0.0
+        turns_to_kill = 0.0
+        state_count = len(states)
+        turn = 0
+        is_over_limit = False
+        while states and turn < max_turns and not is_over_limit:
+            if sum(states.values()) < tolerance:
+                break
+            won = lost = 0.0
+            for active, passive, is_enemy_turn in (
+                    (player_model, enemy_model, False), (enemy_model, player_model, True)
+                    ):
+                next_states = self._play_turn(
+                    active, passive, states, is_enemy_turn, max_states
+                    )
+                if next_states is None:
+                    is_over_limit = True
+                    break
+                states = next_states
+                won += states.pop(PLAYER_WON, 0.0)
+                lost += states.pop(PLAYER_LOST, 0.0)
+                state_count += len(states)
+            win_chance += won
+            loss_chance += lost
+            total_turns += (won + lost) * turn
+            turns_to_kill += won * (turn + 1)
+            if not is_over_limit:
+                turn += 1
+
+        timeout_chance = 0.0
+        unresolved_chance = float(sum(states.values()))
+        if turn == max_turns:
+            timeout_chance, unresolved_chance = unresolved_chance, 0.0
+            total_turns += timeout_chance * max_turns
+        expected_turns = expected_turns_to_kill = None
+        # The combats left unresolved are the longest ones, so the means are
+        # only given once they make no real difference
+        if unresolved_chance <= tolerance:
+            resolved_chance = win_chance + loss_chance + timeout_chance
+            if resolved_chance:
+                expected_turns = total_turns / resolved_chance
+            if win_chance:
+                expected_turns_to_kill = turns_to_kill / win_chance
+        return MatchupResult(
+            win_chance=win_chance,
+            loss_chance=loss_chance,
+            timeout_chance=timeout_chance,
+            unresolved_chance=unresolved_chance,
+            expected_turns=expected_turns,
+            expected_turns_to_kill=expected_turns_to_kill,
+            states=state_count
+            )
+
+    def _play_turn(self, active, passive, states, is_enemy_turn, max_states=None):
+        """
+        Carry the chance of each state through one side's turn. States are
+        (player, enemy) pairs of sides, and a combat that ends during the turn
+        ends up as PLAYER_WON or PLAYER_LOST. Return None as soon as the turn
+        leads to more than max_states states.
+        """
+        outcomes = self.outcomes
+        next_states = {}
+        for state, chance in states.items():
+            active_side, passive_side = (state[1], state[0]) if is_enemy_turn else state
+            health, deck, discard, status_levels = active_side
+            passive_health, passive_deck, passive_discard, passive_levels = passive_side
+            key = (is_enemy_turn, health, status_levels, passive_health, passive_levels)
+            resolved = outcomes.get(key)
+            if resolved is None:
+                resolved = outcomes[key] = {}
+            for actions_id, actions_chance, piles in active.get_scripts(
+                    deck, discard, status_levels
+                    ):
+                outcome = resolved.get(actions_id)
+                if outcome is None:
+                    outcome = resolved[actions_id] = self._resolve_actions(
+                        active, passive, active.action_lists[actions_id], health,
+                        status_levels, passive_health, passive_levels
+                        )
+                end = self._get_end(active, passive, outcome, passive_deck, passive_discard)
+                if end is PLAYER_WON or end is PLAYER_LOST:
+                    next_states[end] = next_states.get(end, 0.0) + chance * actions_chance
+                    continue
+                new_health, new_levels, passive_side = end
+                for deck, discard, script_chance in piles:
+                    active_side = (new_health, deck, discard, new_levels)
+                    next_state = (passive_side, active_side) if is_enemy_turn \
+                        else (active_side, passive_side)
+                    next_states[next_state] = next_states.get(next_state, 0.0) \
+                        + chance * script_chance
+            if max_states is not None and len(next_states) > max_states:
+                return None
+        return next_states
+
+    def _get_end(self, active, passive, outcome, passive_deck, passive_discard):
+        """
+        Turn the outcome of a script into the active side's new health and
+        status levels and the passive side's new state, capping the active
+        side's Defense if the solver does.
+        """
+        if outcome is PLAYER_WON or outcome is PLAYER_LOST:
+            return outcome
+        new_health, new_levels, new_passive_health, new_passive_levels = outcome
+        index = active.defense_index
+        if self.cap_defense and index is not None and new_levels[index]:
+            # Any hand the passive side could draw is a set of its cards
+            reach = passive.get_defense_reach(
+                _add(passive_deck, passive_discard), passive.empty_pile, new_passive_levels,
+                active
+                )
+            cap = c.MATCHUP_SOLVER_DEFENSE_TURNS * (reach + 1)
+            if new_levels[index] > cap:
+                new_levels = new_levels[:index] + (cap,) + new_levels[index + 1:]
+        passive_side = (new_passive_health, passive_deck, passive_discard, new_passive_levels)
+        return new_health, new_levels, passive_side
+
+    def _resolve_actions(
+            self, active, passive, actions, health, status_levels,
+            passive_health, passive_levels
+            ):
+        """
+        Apply a script's actions to both sides, then count down the active
+        side's statuses as the end of its turn does. Return the new health and
+        status levels of both sides, or the result if the combat ends.
+        """
+        for action in actions:
+            kind, on_self = action[0], action[1]
+            if kind == DAMAGE:
+                _, _, damage_type, level = action
+                if on_self:
+                    damage, status_levels = active.calculate_damage(
+                        level, damage_type, status_levels
+                        )
+                    health = max(health - damage, c.MIN_RESOURCE)
+                else:
+                    damage, passive_levels = passive.calculate_damage(
+                        level, damage_type, passive_levels
+                        )
+                    passive_health = max(passive_health - damage, c.MIN_RESOURCE)
+            elif kind == RESTORE:
+                level = action[2]
+                if on_self:
+                    health = min(
+                        max(health + level, c.MIN_RESOURCE), active.max_values[HEALTH_INDEX]
+                        )
+                else:
+                    passive_health = min(
+                        max(passive_health + level, c.MIN_RESOURCE),
+                        passive.max_values[HEALTH_INDEX]
+                        )
+            else:
+                _, _, status_index, level = action
+                if on_self:
+                    status_levels = _change_level(status_levels, status_index, level)
+                else:
+                    passive_levels = _change_level(passive_levels, status_index, level)
+            if health <= 0 or passive_health <= 0:
+                player_alive = passive_health > 0 if active.is_enemy else health > 0
+                enemy_alive = health > 0 if active.is_enemy else passive_health > 0
+                return PLAYER_WON if player_alive and not enemy_alive else PLAYER_LOST
+        # Every status goes down a level at the end of the turn
+        status_levels = tuple(max(level - 1, 0) for level in status_levels)
+        return health, status_levels, passive_health, passive_levels
+
+    def _get_status_ids(self, player, enemy) -> list:
+        """
+        List the statuses either side's cards can change, checking that the
+        solver supports every card effect along the way.
+        """
+        status_ids = []
+        for combatant in (player, enemy):
+            card_manager = combatant.card_manager
+            for card in (*card_manager.deck, *card_manager.hand, *card_manager.discard_pile):
+                for effect in card.effects:
+                    reference = effect.reference
+                    if isinstance(reference, ChangeStatusEffect):
+                        status = reference.status_ref
+                        if not isinstance(status, self.SUPPORTED_STATUSES):
+                            raise ValueError(
+                                f"{card.name}: the {status.status_id} status is not "
+                                "supported by the solver."
+                                )
+                        if status.status_id not in status_ids:
+                            status_ids.append(status.status_id)
+                    elif not isinstance(
+                            reference, (NoEffect, DamageEffect, ChangeResourceEffect)
+                            ):
+                        raise ValueError(
+                            f"{card.name}: the {reference.effect_id} effect is not "
+                            "supported by the solver."
+                            )
+            for status_id, leveled_status in combatant.status_manager.statuses.items():
+                if not isinstance(leveled_status.reference, self.SUPPORTED_STATUSES):
+                    raise ValueError(
+                        f"The {status_id} status is not supported by the solver."
+                        )
+                if status_id not in status_ids:
+                    status_ids.append(status_id)
+        return status_ids
+
+    def _get_side(self, model) -> tuple:
+        """
+        Get the state of one side at the start of a turn: health, the card
+        counts of the deck and discard pile, and status levels.
+        """
+        card_manager = model.combatant.card_manager
+        return (
+            model.combatant.get_health(),
+            model.get_pile_counts(card_manager.deck),
+            model.get_pile_counts(card_manager.discard_pile),
+            model.get_status_levels()
+            )
+
+
+def _change_level(status_levels, index, amount) -> tuple:
+    """
+    Change one status level as StatusManager.change_status does.
+    """
+    level = max(status_levels[index] + amount, 0)
+    return status_levels[:index] + (level,) + status_levels[index + 1:]
+
+
+def _add_action(actions, action) -> tuple:
+    """
+    Add an action to the end of a script's actions, then move it ahead of
+    any later actions it can swap with and sorts before. Scripts that play
+    the same cards in a different order then end up the same and merge.
+    """
+    index = len(actions)
+    while index > 0 and actions[index - 1] > action \
+            and _commutes(actions[index - 1], action):
+        index -= 1
+    return actions[:index] + (action,) + actions[index:]
+
+
+def _commutes(first, second) -> bool:
+    """
+    Check if two actions have the same result in either order. Actions on
+    different sides only clash if both could end the combat. On the same
+    side, hits commute because Defense blocks the same total whatever their
+    order, while a status change can change what a hit does, and healing
+    and damage can cross the maximum or zero health in a different order.
+    """
+    can_kill = [
+        kind == DAMAGE or (kind == RESTORE and level < 0)
+        for kind, level in ((first[0], first[-1]), (second[0], second[-1]))
+        ]
+    if first[1] != second[1]:
+        return not all(can_kill)
+    kinds = {first[0], second[0]}
+    if kinds == {DAMAGE}:
+        return True
+    if DAMAGE in kinds:
+        return False
+    if first[0] != second[0]:
+        return True
+    if first[0] == CHANGE_STATUS and first[2] != second[2]:
+        return True
+    return (first[-1] >= 0) == (second[-1] >= 0)
+
+
+def _add(first, second) -> tuple:
+    """
+    Add two piles of card counts.
+    """
+    return tuple([count + added for count, added in zip(first, second)])
+
+
+def _subtract(first, second) -> tuple:
+    """
+    Take one pile of card counts from another.
+    """
+    return tuple([count - taken for count, taken in zip(first, second)])
+
+
+def _get_draw_chances(pile, cards_to_draw) -> list:
+    """
+    List every set of cards that could be drawn from a pile, as card counts,
+    with the chance of drawing it.
+    """
+    draws = [((), 1)]
+    remaining = sum(pile)
+    for count in pile:
+        remaining -= count
+        draws = [
+            (drawn + (taken,), ways * comb(count, taken))
+            for drawn, ways in draws
+            for taken in range(
+                max(cards_to_draw - sum(drawn) - remaining, 0),
+                min(count, cards_to_draw - sum(drawn)) + 1
+                )
+            ]
+    total_ways = comb(sum(pile), cards_to_draw)
+    return [(drawn, ways / total_ways) for drawn, ways in draws]
@@ -14,6 +14,9 @@ class ModifierManager:
     resistances. Each modifier lists contributions by status id, and the
     ModifierManager is responsible for accumulating these contributions and
     applying them to the game state.
+
+    Running totals per resource and per damage type are kept alongside the
+    pools so lookups don't have to walk every modifier.
     """
     def __init__(self, status_registry):
         """
@@ -31,6 +34,7 @@ class ModifierManager:
             # self.cost_modifiers,
             self.damage_modifiers
             ]
+        self.recalculate_totals()
 
     def reset_modifier_pool(self, modifier_pool):
         """
@@ -40,6 +44,7 @@ class ModifierManager:
         """
         for modifier in modifier_pool.values():
             modifier.reset()
+        self.recalculate_totals()
 
     def reset_all(self):
         """
@@ -48,6 +53,45 @@ class ModifierManager:
         for pool in self.modifier_pools:
             self.reset_modifier_pool(pool)
 
+    def snapshot(self) -> tuple:
+        """
+        Capture every modifier contribution and the running totals.
+        """
+        return (
+            tuple(modifier.contribution for modifier in self.resource_modifiers.values()),
+            tuple(modifier.contribution for modifier in self.damage_modifiers.values()),
+            tuple(self.resource_totals.items()),
+            tuple(self.damage_totals.items())
+            )
+
+    def restore(self, snapshot):
+        """
+        Put every modifier contribution and running total back the way it was
+        when the snapshot was taken.
+        """
+        resource_contributions, damage_contributions, resource_totals, damage_totals = snapshot
+        for modifier, contribution in zip(self.resource_modifiers.values(), resource_contributions):
+            modifier.contribution = contribution
+        for modifier, contribution in zip(self.damage_modifiers.values(), damage_contributions):
+            modifier.contribution = contribution
+        self.resource_totals = dict(resource_totals)
+        self.damage_totals = dict(damage_totals)
+
+    def recalculate_totals(self):
+        """
+        Rebuild the running totals from the contributions in the pools.
+        """
+        self.resource_totals = {}
+        for modifier in self.resource_modifiers.values():
+            resource_id = modifier.resource_id
+            self.resource_totals[resource_id] = \
+                self.resource_totals.get(resource_id, 0) + modifier.contribution
+        self.damage_totals = {}
+        for modifier in self.damage_modifiers.values():
+            damage_type = modifier.damage_type
+            self.damage_totals[damage_type] = \
+                self.damage_totals.get(damage_type, 0) + modifier.contribution
+
     # Effect modifiers
 
     # def _initialize_effect_modifiers(self, status_registry) -> dict:
@@ -152,22 +196,22 @@ class ModifierManager:
         for modifier in self.resource_modifiers.values():
             if modifier.matches(resource_id):
                 modifier.contribution = 0
+        self.resource_totals[resource_id] = 0
 
     def clear_resource_modifiers(self, status_id):
         """
         Remove max value modifier contribution from a specific status.
         """
         if status_id in self.resource_modifiers:
-            self.resource_modifiers[status_id].contribution = 0
+            modifier = self.resource_modifiers[status_id]
+            self.resource_totals[modifier.resource_id] -= modifier.contribution
+            modifier.contribution = 0
 
     def get_max_resource(self, resource_id, base_max_value) -> int:
         """
         Get the (modified) maximum value of the resource.
         """
-        net_contribution = 0
-        for modifier in self.resource_modifiers.values():
-            if modifier.matches(resource_id):
-                net_contribution += modifier.contribution
+        net_contribution = self.resource_totals.get(resource_id, 0)
         return max(base_max_value + net_contribution, c.MIN_RESOURCE)
 
     def modify_max_resource(self, resource, status_id, amount):
@@ -175,9 +219,9 @@ class ModifierManager:
         Change the maximum value by the given amount.
         """
         if status_id in self.resource_modifiers:
-            old_value = self.resource_modifiers[status_id].contribution
-            new_value = old_value + amount
-            self.resource_modifiers[status_id].contribution = new_value
+            modifier = self.resource_modifiers[status_id]
+            modifier.contribution += amount
+            self.resource_totals[modifier.resource_id] += amount
             resource.change_value(amount, self)
 
     # Draw modifiers
@@ -227,30 +271,40 @@ class ModifierManager:
         """
         Update the contribution amount in the modifier pool.
         """
-        old_value = self.damage_modifiers[status_id].contribution
-        new_value = old_value + contribution
-        self.damage_modifiers[status_id].contribution = new_value
+        modifier = self.damage_modifiers[status_id]
+        modifier.contribution += contribution
+        self.damage_totals[modifier.damage_type] += contribution
 
     def calculate_damage(self, damage_type, amount, logger) -> float:
         """
         Return net damage after applying modifiers.
         """
-        net_contribution = 0
-        for modifier in self.damage_modifiers.values():
-            if modifier.matches(damage_type):
-                net_contribution += modifier.contribution
-                if modifier.contribution > 0:
-                    logger.log(
-                        f"Weakness to {damage_type} increased damage by {modifier.contribution:.0%}.",
-                        True
-                        )
-                elif modifier.contribution < 0:
-                    logger.log(
-                        f"Resistance to {damage_type} decreased damage by {-modifier.contribution:.0%}.",
-                        True
-                        )
-        amount = max(round((1 + net_contribution) * amount), 0)
-        return amount
+        net_contribution = self.damage_totals.get(damage_type, 0)
+        if net_contribution > 0:
+            logger.log(
+                c.LogLevel.DEBUG, "Weakness to {} increased damage by {:.0%}.",
+                damage_type, net_contribution, subsystem="modifiers"
+                )
+        elif net_contribution < 0:
+            logger.log(
+                c.LogLevel.DEBUG, "Resistance to {} decreased damage by {:.0%}.",
+                damage_type, -net_contribution, subsystem="modifiers"
+                )
+        return self.get_net_damage(damage_type, amount)
+
+    def get_net_damage(self, damage_type, amount) -> int:
+        """
+        Return net damage after applying modifiers, without logging.
+        """
+        return self.apply_net_contribution(self.damage_totals.get(damage_type, 0), amount)
+
+    @staticmethod
+    def apply_net_contribution(net_contribution, amount) -> int:
+        """
+        Return net damage for a net weakness (positive) or resistance
+        (negative) contribution.
+        """
+        return max(round((1 + net_contribution) * amount), 0)
 
     # Cost modifiers
 
@@ -325,6 +379,8 @@ class Modifier:
     This is the base class representing a modifier that comes from an active
     status.
     """
+    __slots__ = ("contribution",)
+
     def __init__(self):
         """
         Initialize a new Modifier.
@@ -365,6 +421,8 @@ class ResourceModifier(Modifier):
     This class represents a modifier that changes the maximum value of a
     resource.
     """
+    __slots__ = ("resource_id",)
+
     def __init__(self, resource_id):
         """
         Initialize a new ResourceModifier.
@@ -384,6 +442,8 @@ class DamageModifier(Modifier):
     This class represents a modifier that changes the amount of incoming damage
     based on its damage type.
     """
+    __slots__ = ("damage_type",)
+
     def __init__(self, damage_type):
         """
         Initialize a new DamageModifier.
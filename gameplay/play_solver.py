@@ -0,0 +1,424 @@
+"""
+This module defines the PlaySolver class, which suggests the best order in
+which to play the cards in a combatant's hand this turn.
+"""
+from core.effects import ChangeResourceEffect, ChangeStatusEffect, DamageEffect
+from core.statuses import LimitCardPlayStatus
+from gameplay.damage_calculator import DefenderState
+import utils.constants as c
+
+HEALTH_ID = c.Resources.HEALTH.name
+STAMINA_ID = c.Resources.STAMINA.name
+PHYSICAL_ID = c.DamageTypes.PHYSICAL.name
+
+class PlaySolver:
+    """
+    Finds the sequence of plays from the hand with the highest expected
+    damage to the opponent or the most survival (health restored and Defense
+    gained), breaking ties with the other objective and then by playing
+    fewer cards.
+
+    The search is a memoized DP over the remaining stamina and magicka, the
+    cards left in hand (identical cards are counted, not ordered), the
+    opponent's remaining Defense and the combatant's missing health, so it
+    never enumerates permutations. Cards whose outcome doesn't depend on when
+    they are played are left out of that search and chosen afterwards by a
+    knapsack over the resources left, which keeps full hands fast. Stamina
+    and magicka beyond what the cards left in hand could spend, and missing
+    health beyond what they could restore, make no difference, so states
+    are capped there and large pools add no states. Cards with none of the
+    effects the solver tracks are never worth playing and are left out.
+    Most full hands solve within a frame. A hand of a dozen different
+    physical attacks against Defense is the slow case, since every subset of
+    it is its own state, and can take a few frames.
+
+    Card costs and restrictions are read once at the start of the turn.
+    Statuses other than Defense that change during the turn are not modeled,
+    nor are drawn or randomly discarded cards. Defense is used up as if every
+    hit landed without a critical hit.
+    """
+    def __init__(self, registries, combat_manager):
+        """
+        Initialize a new PlaySolver.
+        """
+        self.registries = registries
+        self.combat_manager = combat_manager
+
+    def suggest_plays(
+            self, combatant, opponent, objective=c.PlayObjectives.DAMAGE
+            ) -> tuple:
+        """
+        Return the cards to play in order, with the expected damage and
+        survival of playing them. An empty list means ending the turn.
+        """
+        turn = self._get_turn_data(combatant, opponent, objective)
+        options = [option for option in self._create_options(combatant) if option["steps"]]
+        ordered, unordered = self._split_options(options, turn)
+        self._add_caps(ordered, unordered, turn)
+
+        resources = combatant.resources
+        play_limit = self._get_play_limit(combatant)
+        counts = tuple(len(option["cards"]) for option in ordered)
+        stamina, magicka, missing_health = self._cap_state(
+            resources[STAMINA_ID].current,
+            resources[c.Resources.MAGICKA.name].current,
+            turn["max_values"][HEALTH_ID] - combatant.get_health(),
+            counts, turn
+            )
+        state = (
+            stamina, magicka, counts, turn["defense"], missing_health,
+            play_limit if play_limit is not None else len(combatant.card_manager.hand)
+            )
+        memo = {}
+        knapsack_memo = {}
+
+        def solve(state) -> tuple:
+            """
+            Return the best (primary, secondary, -plays) score reachable from
+            a state, and the ordered option to play next or None to finish
+            with the unordered ones.
+            """
+            result = memo.get(state)
+            if result is not None:
+                return result
+            stamina, magicka, counts, _, _, plays_left = state
+            best = (
+                self._solve_knapsack(
+                    unordered, 0, stamina, magicka, plays_left, knapsack_memo
+                    )[0],
+                None
+                )
+            if plays_left > 0:
+                for index, option in enumerate(ordered):
+                    if counts[index] == 0:
+                        continue
+                    outcome = self._play_option(option, state, index, turn)
+                    if outcome is None:
+                        continue
+                    gain, next_state = outcome
+                    (primary, secondary, plays), _ = solve(next_state)
+                    score = (primary + gain[0], secondary + gain[1], plays - 1)
+                    if score > best[0]:
+                        best = (score, index)
+            memo[state] = best
+            return best
+
+        plays = []
+        score, index = solve(state)
+        while index is not None:
+            option = ordered[index]
+            plays.append(option["cards"][len(option["cards"]) - state[2][index]])
+            state = self._play_option(option, state, index, turn)[1]
+            _, index = solve(state)
+        stamina, magicka, _, _, _, plays_left = state
+        for index in range(len(unordered)):
+            _, copies = self._solve_knapsack(
+                unordered, index, stamina, magicka, plays_left, knapsack_memo
+                )
+            option = unordered[index]
+            plays.extend(option["cards"][:copies])
+            if option["resource"] == STAMINA_ID:
+                stamina -= option["cost"] * copies
+            else:
+                magicka -= option["cost"] * copies
+            plays_left -= copies
+
+        primary, secondary, _ = score
+        if turn["is_damage"]:
+            return plays, primary, secondary
+        return plays, secondary, primary
+
+    def _solve_knapsack(self, options, index, stamina, magicka, plays_left, memo) -> tuple:
+        """
+        Return the best score from playing copies of the options from index
+        onwards with the resources left, and how many copies of the option
+        at index to play.
+        """
+        if index == len(options):
+            return (0.0, 0.0, 0), 0
+        key = (index, stamina, magicka, plays_left)
+        result = memo.get(key)
+        if result is not None:
+            return result
+        option = options[index]
+        cost = option["cost"]
+        is_stamina = option["resource"] == STAMINA_ID
+        primary_gain, secondary_gain = option["gain"]
+        best = None
+        for copies in range(min(len(option["cards"]), plays_left) + 1):
+            spent = cost * copies
+            if spent > (stamina if is_stamina else magicka):
+                break
+            (primary, secondary, plays), _ = self._solve_knapsack(
+                options, index + 1,
+                stamina - spent if is_stamina else stamina,
+                magicka if is_stamina else magicka - spent,
+                plays_left - copies, memo
+                )
+            score = (
+                primary + primary_gain * copies,
+                secondary + secondary_gain * copies,
+                plays - copies
+                )
+            if best is None or score > best[0]:
+                best = (score, copies)
+        memo[key] = best
+        return best
+
+    def _get_play_limit(self, combatant):
+        """
+        Get how many more cards can be played this turn, or None if there is
+        no limit.
+        """
+        play_limit = None
+        for leveled_status in combatant.status_manager.statuses.values():
+            status = leveled_status.reference
+            if isinstance(status, LimitCardPlayStatus):
+                remaining = max(status.card_limit - combatant.cards_played_this_turn, 0)
+                play_limit = remaining if play_limit is None else min(play_limit, remaining)
+        return play_limit
+
+    def _create_options(self, combatant) -> list:
+        """
+        Group the playable cards in hand by card id and work out what
+        playing one of each group does.
+        """
+        attribute_registry = self.registries.attributes
+        combat_manager = self.combat_manager
+        options = {}
+        for card in combatant.card_manager.hand:
+            option = options.get(card.card_id)
+            if option is not None:
+                option["cards"].append(card)
+                continue
+            if not combat_manager.card_can_be_played(combatant, card):
+                continue
+            steps = []
+            levels = card.get_effect_levels(combatant, attribute_registry)
+            for effect, level in zip(card.effects, levels):
+                if combat_manager.effect_can_resolve(combatant, effect.str_id):
+                    step = self._create_step(effect.reference, level)
+                    if step is not None:
+                        steps.append(step)
+            options[card.card_id] = {
+                "cards": [card],
+                "resource": card.get_resource(),
+                "cost": card.get_cost(combatant, attribute_registry),
+                "steps": steps
+            }
+        return list(options.values())
+
+    def _create_step(self, effect, level):
+        """
+        Describe an effect as one of the changes the solver tracks, or None if
+        it doesn't track what the effect does.
+        """
+        is_target = effect.target_type_enum == c.TargetTypes.TARGET
+        if isinstance(effect, DamageEffect):
+            damage_type = effect.damage_type_enum.name
+            if is_target:
+                return ("HIT", damage_type, level)
+            return ("SELF_DAMAGE", damage_type, level)
+        if isinstance(effect, ChangeResourceEffect):
+            # Resources can only be restored, and only on oneself
+            return ("RESTORE", effect.resource_enum.name, level)
+        if isinstance(effect, ChangeStatusEffect) \
+                and effect.status_ref.status_id == c.StatusNames.DEFENSE.name:
+            if not effect.matches(c.EffectNames.APPLY.name):
+                level = -level
+            return ("DEFENSE", is_target, level)
+        return None
+
+    def _split_options(self, options, turn) -> tuple:
+        """
+        Separate the options whose outcome depends on what was played before
+        them from those that can be played in any order. An option's outcome
+        depends on the order if it restores resources, spends a resource
+        that something restores, changes or runs into the opponent's Defense,
+        or loses health while something restores it.
+        """
+        all_steps = [step for option in options for step in option["steps"]]
+        restored = {step[1] for step in all_steps if step[0] == "RESTORE"}
+        has_physical_hits = any(
+            step[0] == "HIT" and step[1] == PHYSICAL_ID for step in all_steps
+            )
+        changes_defense = any(
+            step[0] == "DEFENSE" and step[1] for step in all_steps
+            )
+        defense_matters = has_physical_hits and (turn["defense"] > 0 or changes_defense)
+
+        ordered = []
+        unordered = []
+        for option in options:
+            is_ordered = option["resource"] in restored and option["cost"] > 0
+            for step in option["steps"]:
+                kind = step[0]
+                if kind == "RESTORE" or (kind == "SELF_DAMAGE" and HEALTH_ID in restored):
+                    is_ordered = True
+                elif defense_matters and (
+                        (kind == "HIT" and step[1] == PHYSICAL_ID)
+                        or (kind == "DEFENSE" and step[1])
+                        ):
+                    is_ordered = True
+            if is_ordered:
+                ordered.append(option)
+            else:
+                option["gain"] = self._apply_steps(
+                    option["steps"], 0, 0, turn["defense"], 0, turn
+                    )[0]
+                unordered.append(option)
+        return ordered, unordered
+
+    def _get_turn_data(self, combatant, opponent, objective) -> dict:
+        """
+        Gather what stays the same for the whole turn: the objective, the
+        combatant's maximum resources, the chances of evading and of a
+        critical hit, and the opponent's state as the damage calculator sees
+        it.
+        """
+        damage_calculator = opponent.damage_calculator
+        defender_state = DefenderState.from_combatants(opponent, combatant)
+        return {
+            "is_damage": objective == c.PlayObjectives.DAMAGE,
+            # The same hits keep being resolved against the same Defense
+            "hits": {},
+            "max_values": {
+                resource_id: resource.get_max(combatant.modifier_manager)
+                for resource_id, resource in combatant.resources.items()
+                },
+            "evade_chance": damage_calculator.get_evade_chance(opponent),
+            "crit_chance": damage_calculator.get_crit_chance(combatant),
+            "defense": defender_state.defense,
+            "damage_calculator": damage_calculator,
+            "defender_state": defender_state
+        }
+
+    def _play_option(self, option, state, index, turn):
+        """
+        Play one card of an option from a state. Return the (primary,
+        secondary) gain and the next state, or None if the card can't be
+        afforded.
+        """
+        stamina, magicka, counts, defense, missing_health, plays_left = state
+        cost = option["cost"]
+        if option["resource"] == STAMINA_ID:
+            if stamina < cost:
+                return None
+            stamina -= cost
+        else:
+            if magicka < cost:
+                return None
+            magicka -= cost
+        gain, stamina, magicka, defense, missing_health = self._apply_steps(
+            option["steps"], stamina, magicka, defense, missing_health, turn
+            )
+        counts = counts[:index] + (counts[index] - 1,) + counts[index + 1:]
+        stamina, magicka, missing_health = self._cap_state(
+            stamina, magicka, missing_health, counts, turn
+            )
+        return gain, (stamina, magicka, counts, defense, missing_health, plays_left - 1)
+
+    def _add_caps(self, ordered, unordered, turn):
+        """
+        Record what each ordered option's cards could spend and restore, and
+        what the unordered cards could spend between them, for _cap_state.
+        """
+        caps = []
+        for option in ordered:
+            is_stamina = option["resource"] == STAMINA_ID
+            restored = sum(
+                step[2] for step in option["steps"]
+                if step[0] == "RESTORE" and step[1] == HEALTH_ID
+                )
+            caps.append((is_stamina, option["cost"], restored))
+        turn["caps"] = caps
+        turn["needs"] = {}
+        turn["unordered_costs"] = [0, 0]
+        for option in unordered:
+            is_stamina = option["resource"] == STAMINA_ID
+            turn["unordered_costs"][0 if is_stamina else 1] += \
+                option["cost"] * len(option["cards"])
+
+    def _cap_state(self, stamina, magicka, missing_health, counts, turn) -> tuple:
+        """
+        Cap stamina and magicka at what the cards left could spend and
+        missing health at what they could restore. Anything above that plays
+        out the same way, since restoring only ever adds.
+        """
+        needs = turn["needs"].get(counts)
+        if needs is None:
+            stamina_needed, magicka_needed = turn["unordered_costs"]
+            health_restored = 0
+            for (is_stamina, cost, restored), count in zip(turn["caps"], counts):
+                if is_stamina:
+                    stamina_needed += cost * count
+                else:
+                    magicka_needed += cost * count
+                health_restored += restored * count
+            needs = turn["needs"][counts] = (stamina_needed, magicka_needed, health_restored)
+        stamina_needed, magicka_needed, health_restored = needs
+        return (
+            min(stamina, stamina_needed), min(magicka, magicka_needed),
+            min(missing_health, health_restored)
+            )
+
+    def _apply_steps(self, steps, stamina, magicka, defense, missing_health, turn) -> tuple:
+        """
+        Work out what a card's effects do. Return the (primary, secondary)
+        gain and the resources, Defense and missing health afterwards.
+        """
+        max_values = turn["max_values"]
+        damage = 0.0
+        survival = 0
+        for step in steps:
+            kind = step[0]
+            if kind == "HIT":
+                key = (step, defense)
+                hit = turn["hits"].get(key)
+                if hit is None:
+                    hit = turn["hits"][key] = self._resolve_hit(
+                        step[1], step[2], defense, turn
+                        )
+                damage += hit[0]
+                defense = hit[1]
+            elif kind == "SELF_DAMAGE":
+                survival -= step[2]
+                missing_health = min(missing_health + step[2], max_values[HEALTH_ID])
+            elif kind == "DEFENSE":
+                _, is_target, level = step
+                if is_target:
+                    defense = max(defense + level, 0)
+                else:
+                    survival += level
+            else:
+                _, resource_id, amount = step
+                if resource_id == HEALTH_ID:
+                    restored = min(amount, missing_health)
+                    survival += restored
+                    missing_health -= restored
+                elif resource_id == STAMINA_ID:
+                    stamina = min(stamina + amount, max_values[resource_id])
+                else:
+                    magicka = min(magicka + amount, max_values[resource_id])
+        gain = (damage, survival) if turn["is_damage"] else (survival, damage)
+        return gain, stamina, magicka, defense, missing_health
+
+    def _resolve_hit(self, damage_type, amount, defense, turn) -> tuple:
+        """
+        Get the expected damage of a hit against the opponent, and the
+        Defense left if the hit lands without a critical hit.
+        """
+        evade_chance = turn["evade_chance"]
+        crit_chance = turn["crit_chance"]
+        get_mitigated_hit = turn["damage_calculator"].get_mitigated_hit
+        state = turn["defender_state"]
+        normal_damage, remaining_defense = get_mitigated_hit(
+            state, amount, damage_type, defense, self.registries
+            )
+        critical_damage, _ = get_mitigated_hit(
+            state, amount * c.CRIT_MULTIPLIER, damage_type, defense, self.registries
+            )
+        expected = (1 - evade_chance) * (
+            (1 - crit_chance) * normal_damage + crit_chance * critical_damage
+            )
+        return expected, remaining_defense
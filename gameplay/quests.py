@@ -1,7 +1,6 @@
 """
 This module defines the Quest and QuestRegistry classes.
 """
-import random
 from utils.utils import load_json
 from gameplay.encounters import Encounter
 
@@ -9,32 +8,23 @@ class Quest:
     """
     This class represents a series of encounters.
     """
-    def __init__(
-            self, quest_id, description, encounters,
-            registries
-            ):
+    def __init__(self, quest_id, description, encounters):
         """
         Initialize a new Quest.
         """
         self.quest_id = quest_id
         self.description = description
-        self.encounters = []
-        for encounter in encounters:
-            enemy = registries.enemies.create_enemy(
-                encounter, registries, None
-                )
-            self.encounters.append(Encounter(enemy))
+        self.encounters = [Encounter(enemy_id) for enemy_id in encounters]
 
 class QuestRegistry:
     """
     This class holds quest data loaded from JSON.
     """
-    def __init__(
-            self, quests_path, enemy_groups_path, registries
-            ):
+    def __init__(self, quests_path, enemy_groups_path, enemy_registry, rng):
         """
         Initialize a new QuestRegistry.
         """
+        self.rng = rng
         self.quests = []
         quest_data = load_json(quests_path)
         enemy_group_data = load_json(enemy_groups_path)
@@ -44,10 +34,12 @@ class QuestRegistry:
                 )
             encounters = quest_details.get("ENCOUNTERS", [])
             encounters = self.setup_encounters(encounters, enemy_group_data)
-            quest = Quest(
-                quest_id, description, encounters,
-                registries
-                )
+            for enemy_id in encounters:
+                if enemy_id not in enemy_registry.enemy_prototypes:
+                    raise ValueError(
+                        f"Unknown enemy '{enemy_id}' in quest '{quest_id}'."
+                        )
+            quest = Quest(quest_id, description, encounters)
             self.quests.append(quest)
 
     def setup_encounters(self, encounter_data, enemy_groups) -> list:
@@ -59,7 +51,7 @@ class QuestRegistry:
         for encounter in encounter_data:
             enemy_table = enemy_groups.get(encounter, {})
             enemies, weights = zip(*list(enemy_table.items()))
-            enemy = random.choices(enemies, weights=weights, k=1)[0]
+            enemy = self.rng.choices(enemies, weights=weights, k=1)[0]
             encounters.append(enemy)
         encounters.append(boss)
         return encounters
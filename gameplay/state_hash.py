@@ -0,0 +1,155 @@
+"""
+This module defines the StateHash class, an incrementally updated 64-bit
+Zobrist hash of a combatant's state, and the TranspositionTable class, a
+bounded cache keyed on those hashes.
+"""
+from collections import OrderedDict
+from hashlib import blake2b
+import utils.constants as c
+
+# Keys are derived from their parts rather than drawn at random, so hashes
+# match across processes and runs.
+_zobrist_keys = {}
+HASH_MASK = (1 << 64) - 1
+
+def _create_key(parts) -> int:
+    """
+    Derive and cache the key for a tuple of parts.
+    """
+    digest = blake2b(repr(parts).encode(), digest_size=8).digest()
+    key = _zobrist_keys[parts] = int.from_bytes(digest, "little")
+    return key
+
+def get_zobrist_key(*parts) -> int:
+    """
+    Get the 64-bit key for one component of the state, such as a status at a
+    certain level.
+    """
+    return _zobrist_keys.get(parts) or _create_key(parts)
+
+
+class StateHash:
+    """
+    Zobrist-style hash of one combatant's card piles, status levels and
+    current resource values. The hash is the sum of the keys of everything
+    in the state, modulo 2**64, so each change only adds and subtracts the
+    keys involved, however big the state is. Summing rather than XORing the
+    keys lets a pile hold several copies of a card without tracking counts,
+    which makes each pile a multiset of card names. A level or value of zero
+    contributes nothing.
+    """
+    __slots__ = ("side", "value")
+
+    def __init__(self, side):
+        """
+        Initialize a new StateHash. The side keeps the player's and enemy's
+        keys apart.
+        """
+        self.side = side
+        self.value = 0
+
+    def change_level(self, kind, item_id, old_level, new_level):
+        """
+        Record a status level or resource value changing.
+        """
+        value = self.value
+        if old_level:
+            parts = (self.side, kind, item_id, old_level)
+            value -= _zobrist_keys.get(parts) or _create_key(parts)
+        if new_level:
+            parts = (self.side, kind, item_id, new_level)
+            value += _zobrist_keys.get(parts) or _create_key(parts)
+        self.value = value & HASH_MASK
+
+    def add_card(self, pile, card_name):
+        """
+        Record a card being added to a pile.
+        """
+        parts = (self.side, pile, card_name)
+        self.value = (self.value + (_zobrist_keys.get(parts) or _create_key(parts))) \
+            & HASH_MASK
+
+    def remove_card(self, pile, card_name):
+        """
+        Record a card being removed from a pile.
+        """
+        parts = (self.side, pile, card_name)
+        self.value = (self.value - (_zobrist_keys.get(parts) or _create_key(parts))) \
+            & HASH_MASK
+
+    def move_card(self, card_name, from_pile, to_pile):
+        """
+        Record a card moving from one pile to another.
+        """
+        side = self.side
+        from_parts = (side, from_pile, card_name)
+        to_parts = (side, to_pile, card_name)
+        self.value = (
+            self.value
+            - (_zobrist_keys.get(from_parts) or _create_key(from_parts))
+            + (_zobrist_keys.get(to_parts) or _create_key(to_parts))
+            ) & HASH_MASK
+
+    def snapshot(self) -> int:
+        """
+        Capture the hash.
+        """
+        return self.value
+
+    def restore(self, snapshot):
+        """
+        Put the hash back the way it was when the snapshot was taken.
+        """
+        self.value = snapshot
+
+
+class TranspositionTable:
+    """
+    A bounded cache of evaluations keyed on state hashes. When it is full,
+    the least recently used entry is dropped.
+    """
+    def __init__(self, max_entries=c.TRANSPOSITION_TABLE_SIZE):
+        """
+        Initialize a new TranspositionTable.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """
+        Look up an evaluation, marking it as recently used.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key, value):
+        """
+        Store an evaluation, dropping the least recently used one if the
+        table is full.
+        """
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every entry and reset the hit counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
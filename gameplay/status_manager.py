@@ -10,12 +10,13 @@ class StatusManager:
     This class maintains a list of active statuses and handles their
     application, removal, and activation.
     """
-    def __init__(self, event_manager):
+    def __init__(self, event_manager, state_hash):
         """
         Initialize a new StatusManager.
         """
         self.statuses = {}
         self.event_manager = event_manager
+        self.state_hash = state_hash
 
     def _delete(self, status_id, subject):
         """
@@ -27,6 +28,26 @@ class StatusManager:
         # leveled_status.reference.expire(subject, self.event_manager.logger)
         del self.statuses[status_id]
 
+    def snapshot(self) -> tuple:
+        """
+        Capture the active statuses and their levels, in activation order.
+        """
+        return tuple(
+            (leveled_status, leveled_status.base_level)
+            for leveled_status in self.statuses.values()
+            )
+
+    def restore(self, snapshot):
+        """
+        Reactivate the statuses from a snapshot at their captured levels.
+        Status side effects are not triggered; the modifier manager and the
+        state hash are restored separately.
+        """
+        self.statuses = {}
+        for leveled_status, level in snapshot:
+            leveled_status.base_level = level
+            self.statuses[leveled_status.str_id] = leveled_status
+
     def get_leveled_status(self, status_id) -> LeveledMechanic:
         """
         Return the LeveledMechanic object representing the status and its level.
@@ -55,6 +76,7 @@ class StatusManager:
             leveled_status = LeveledMechanic(status, amount)
             self.statuses[status_id] = leveled_status
             change = amount
+            self.state_hash.change_level("STATUS", status_id, 0, amount)
         else:
             # Update the leveled status
             status = leveled_status.reference
@@ -63,8 +85,12 @@ class StatusManager:
             change = current_level if delete else new_level - current_level
             if delete or new_level == 0:
                 self._delete(status_id, subject)
+                self.state_hash.change_level("STATUS", status_id, current_level, 0)
             else:
                 leveled_status.change_level(change)
+                self.state_hash.change_level(
+                    "STATUS", status_id, current_level, new_level
+                    )
 
         # Handle consequences of statuses being changed or removed
         if status.applies_immediately:
@@ -115,14 +141,14 @@ class StatusManager:
             change = -self.statuses[status_id].get_level()
             self.change_status(status_id, change, subject, status_registry, delete=True)
 
-    def trigger_statuses_on_turn(self, subject, status_registry):
+    def trigger_statuses_on_turn(self, subject, registries):
         """
         Loop over active statuses and invite them to trigger their on-turn effects.
         """
         for leveled_status in self.statuses.values():
             status = leveled_status.reference
             level = leveled_status.get_level()
-            status.trigger_on_turn(subject, level, status_registry)
+            status.trigger_on_turn(subject, level, registries)
             if not subject.is_alive():
                 return
         # Trigger recalculations after statuses resolve
@@ -0,0 +1,187 @@
+"""
+This module defines the Tournament class, which plays every starting deck
+against every enemy prototype many times across a pool of worker processes.
+"""
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+import utils.constants as c
+from utils.utils import load_json
+from core.registries import Registries
+from core.player import Player
+from gameplay.combat_session import CombatSession
+from gameplay.enemy_policies import MCTSPolicy
+
+# Each worker process loads its own registries once and reuses them.
+_worker_registries = None
+
+def _initialize_worker():
+    """
+    Load the registries for this worker process.
+    """
+    global _worker_registries
+    _worker_registries = Registries(CombatSession.create_event_manager())
+
+def _run_matchup(character_class, enemy_id, combats, seed, enemy_search_ms,
+                 enemy_search_iterations) -> dict:
+    """
+    Play a batch of combats between a class deck and an enemy and return the
+    totals.
+    """
+    registries = _worker_registries
+    registries.rng.seed(seed)
+    enemy_policy = None
+    if enemy_search_iterations is not None:
+        enemy_policy = MCTSPolicy(max_iterations=enemy_search_iterations, seed=seed)
+    elif enemy_search_ms is not None:
+        enemy_policy = MCTSPolicy(enemy_search_ms, seed=seed)
+    event_manager = registries.statuses.event_manager
+    totals = {
+        "combats": 0,
+        "wins": 0,
+        "timeouts": 0,
+        "turns_to_kill": 0,
+        "error": None
+    }
+    for _ in range(combats):
+        try:
+            player = Player(registries, character_class, event_manager)
+            enemy = registries.enemies.create_enemy(enemy_id, registries, None)
+            result = CombatSession(
+                player, enemy, registries, enemy_policy=enemy_policy
+                ).run()
+        except Exception as e:
+            totals["error"] = repr(e)
+            break
+        totals["combats"] += 1
+        if result.player_won:
+            totals["wins"] += 1
+            totals["turns_to_kill"] += result.turns + 1
+        elif result.timed_out:
+            totals["timeouts"] += 1
+    return totals
+
+
+class Tournament:
+    """
+    This class runs the win-rate matrix of class decks vs enemy prototypes.
+    """
+    FIELDS = [
+        "character_class", "enemy", "combats", "wins", "win_rate",
+        "average_turns_to_kill", "timeouts", "error"
+        ]
+
+    def __init__(self, combats_per_matchup, max_workers=None, chunk_size=50, seed=None,
+                 enemy_search_ms=None, enemy_search_iterations=None):
+        """
+        Initialize a new Tournament. With enemy_search_ms, enemies search for
+        their plays with that many milliseconds per turn, and with
+        enemy_search_iterations they run that many search iterations per
+        decision instead. With a seed, every run with the same settings
+        produces the same results, except when enemies search by time, since
+        how far a timed search gets depends on the machine's load.
+        """
+        self.combats_per_matchup = combats_per_matchup
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.enemy_search_ms = enemy_search_ms
+        self.enemy_search_iterations = enemy_search_iterations
+        self.character_classes = list(load_json(c.JSON_PATHS['starting_decks']))
+        self.enemy_ids = self._list_enemy_ids()
+        self.results = []
+
+    def _list_enemy_ids(self) -> list:
+        """
+        Get the ids of every enemy prototype in the data files.
+        """
+        enemy_ids = []
+        for path in c.JSON_PATHS['enemies']:
+            enemy_ids.extend(load_json(path).keys())
+        return enemy_ids
+
+    def _create_jobs(self) -> list:
+        """
+        Split every matchup into chunks so the work spreads evenly over the
+        pool. Each chunk gets its own seed so results don't depend on which
+        worker runs it.
+        """
+        jobs = []
+        for character_class in self.character_classes:
+            for enemy_id in self.enemy_ids:
+                remaining = self.combats_per_matchup
+                chunk_index = 0
+                while remaining > 0:
+                    combats = min(remaining, self.chunk_size)
+                    seed = None
+                    if self.seed is not None:
+                        seed = f"{self.seed}:{character_class}:{enemy_id}:{chunk_index}"
+                    jobs.append((character_class, enemy_id, combats, seed))
+                    remaining -= combats
+                    chunk_index += 1
+        return jobs
+
+    def run(self) -> list:
+        """
+        Play every matchup and return one result row per matchup.
+        """
+        jobs = self._create_jobs()
+        matchups = {}
+        with ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_initialize_worker
+                ) as executor:
+            futures = [
+                (character_class, enemy_id, executor.submit(
+                    _run_matchup, character_class, enemy_id, combats, seed,
+                    self.enemy_search_ms, self.enemy_search_iterations
+                    ))
+                for character_class, enemy_id, combats, seed in jobs
+                ]
+            for character_class, enemy_id, future in futures:
+                totals = future.result()
+                key = (character_class, enemy_id)
+                if key not in matchups:
+                    matchups[key] = totals
+                    continue
+                for field in ["combats", "wins", "timeouts", "turns_to_kill"]:
+                    matchups[key][field] += totals[field]
+                matchups[key]["error"] = matchups[key]["error"] or totals["error"]
+
+        self.results = [
+            self._create_row(character_class, enemy_id, totals)
+            for (character_class, enemy_id), totals in matchups.items()
+            ]
+        return self.results
+
+    def _create_row(self, character_class, enemy_id, totals) -> dict:
+        """
+        Turn the accumulated totals for a matchup into a result row.
+        """
+        combats = totals["combats"]
+        wins = totals["wins"]
+        return {
+            "character_class": character_class,
+            "enemy": enemy_id,
+            "combats": combats,
+            "wins": wins,
+            "win_rate": wins / combats if combats else None,
+            "average_turns_to_kill": totals["turns_to_kill"] / wins if wins else None,
+            "timeouts": totals["timeouts"],
+            "error": totals["error"]
+        }
+
+    def write_json(self, path):
+        """
+        Write the results to a JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.results, file, indent=2)
+
+    def write_csv(self, path):
+        """
+        Write the results to a CSV file.
+        """
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.results)
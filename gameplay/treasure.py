@@ -1,7 +1,6 @@
 """
 This module defines the Treasure class which represents rewards in game.
 """
-import random
 from utils.utils import load_json
 import utils.constants as c
 
@@ -9,12 +8,14 @@ class Treasure:
     """
     This class represents rewards from a single encounter.
     """
-    def __init__(self, treasure_data, card_rewards):
+    __slots__ = ("gold", "exp", "cards", "is_boss")
+
+    def __init__(self, treasure_data, card_rewards, rng):
         """
         Initialize a new Treasure.
         """
         gold_range = treasure_data.get("gold")
-        self.gold = random.randint(*gold_range)
+        self.gold = rng.randint(*gold_range)
         self.exp = treasure_data.get("exp")
         card_group_id = treasure_data.get("cards")
         self.cards = None # card_rewards[card_group_id]
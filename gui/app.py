@@ -7,6 +7,8 @@ from kivy.core.window import Window
 from kivy.uix.widget import Widget
 from kivy.lang import Builder
 from kivy.config import Config
+from kivy.clock import Clock
+import utils.constants as c
 from gui.combat_screen import CombatScreen
 from gui.town_screen import TownScreen
 from gui.quest_screen import QuestScreen
@@ -59,7 +61,13 @@ class CardGameApp(App):
         Window.bind(on_key_down=self.on_key_down)
         town_screen = TownScreen(self.game)
         self.game.add_widget(town_screen)
+        if self.event_manager.queued:
+            Clock.schedule_interval(self.process_events, 0)
         return self.game
+
+    def process_events(self, dt):
+        """Processes a frame's worth of queued events."""
+        self.event_manager.process_events(c.MAX_EVENTS_PER_FRAME)
     
     def on_key_down(self, window, key, scancode, codepoint, modifier):
         """Handles key down events for the application."""
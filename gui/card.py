@@ -48,8 +48,10 @@ class Card(Widget):
         self.border_color = type_colors['border']
         self.resource_cost_color = constants.RESOURCE_COLORS[type_colors['resource']]
         self.cost_indicator = constants.RESOURCE_INDICATOR_OFFSETS[type_colors['indicator']]
+        self.card_data = card_data
         self.name = card_data['name']
         self.card_id = card_data['id']
+        self.instance_id = card_data['instance_id']
         self.art_texture = AssetCache.get_texture(f'gui/assets/cards/{self.card_id}.png')
         self.art_bg_texture = AssetCache.get_texture(f'gui/assets/cards/{self.card_type}_bg.png')
         self.cost = str(card_data['cost'])
@@ -55,6 +55,37 @@ class Hand(FloatLayout):
             card.move_to_discard()
             self.position_cards()
     
+    def sync_hand(self, cards_data: list):
+        """
+        Show the given cards in hand order. Widgets are only created for
+        cards that aren't already shown and removed for cards that left, and
+        the hand is laid out once.
+        """
+        widgets = {card.instance_id: card for card in self.children}
+        instance_ids = {card_data['instance_id'] for card_data in cards_data}
+        for instance_id, card in widgets.items():
+            if instance_id not in instance_ids:
+                self.screen.tooltip.remove_tooltip(card)
+                self.remove_widget(card)
+
+        ordered_cards = []
+        for card_data in cards_data:
+            card = widgets.get(card_data['instance_id'])
+            if card is None:
+                card = Card(card_data, self.screen)
+            elif card.card_data != card_data:
+                card.render_card(card_data)
+            card.is_draggable = True
+            ordered_cards.append(card)
+
+        # Children are kept in hand order so a card's index matches the hand
+        if self.children != ordered_cards:
+            for card in self.children[:]:
+                self.remove_widget(card)
+            for card in reversed(ordered_cards):
+                self.add_widget(card)
+        self.position_cards()
+
     def clear_hand(self):
         """Clears all cards from the hand."""
         for card in self.children[:]:
@@ -1,13 +1,16 @@
 """
 Main entry point for the card game application.
 """
+import utils.constants as c
 from utils.event_manager import EventManager
+from gameplay.enemy_policies import MCTSPolicy
 from core.game import Game
 from gui.app import CardGameApp
 from controller import Controller
 
-event_manager = EventManager()
-game = Game(event_manager)
+event_manager = EventManager(queued=c.QUEUE_EVENTS)
+enemy_policy = MCTSPolicy() if c.USE_ENEMY_SEARCH else None
+game = Game(event_manager, enemy_policy=enemy_policy)
 app = CardGameApp(event_manager)
 controller = Controller(game, app, event_manager)
 controller.start_game()
@@ -0,0 +1,54 @@
+"""
+Command line entry point for running headless combat simulations.
+"""
+import argparse
+from gameplay.tournament import Tournament
+
+def main():
+    """
+    Parse arguments and run the tournament.
+    """
+    parser = argparse.ArgumentParser(
+        description="Play every class deck against every enemy prototype."
+        )
+    parser.add_argument(
+        "-n", "--combats", type=int, default=100,
+        help="number of combats per matchup"
+        )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="number of worker processes (default: one per core)"
+        )
+    parser.add_argument(
+        "-s", "--seed", type=int, default=None,
+        help="random seed, for reproducible results"
+        )
+    parser.add_argument(
+        "-e", "--enemy-search-ms", type=float, default=None,
+        help="let enemies search for their plays with this many milliseconds per turn"
+        )
+    parser.add_argument(
+        "-i", "--enemy-search-iterations", type=int, default=None,
+        help="let enemies search for their plays with this many iterations per "
+        "decision; unlike -e, reproducible with -s"
+        )
+    parser.add_argument(
+        "-o", "--output", default="tournament_results.json",
+        help="output file; a .csv extension writes CSV, anything else JSON"
+        )
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        args.combats, args.workers, seed=args.seed,
+        enemy_search_ms=args.enemy_search_ms,
+        enemy_search_iterations=args.enemy_search_iterations
+        )
+    tournament.run()
+    if args.output.lower().endswith(".csv"):
+        tournament.write_csv(args.output)
+    else:
+        tournament.write_json(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Tests for DamageCalculator's exact damage distribution.
+"""
+import math
+import unittest
+from core.player import Player
+from core.registries import Registries
+from gameplay.combat_session import CombatSession
+import utils.constants as c
+
+SAMPLES = 4000
+SETUPS = (
+    ({c.StatusNames.EVASION.name: 3}, {}, 6, c.DamageTypes.PHYSICAL.name),
+    (
+        {c.StatusNames.EVASION.name: 2, c.StatusNames.DEFENSE.name: 4},
+        {c.StatusNames.HIDDEN.name: 3}, 5, c.DamageTypes.PHYSICAL.name
+        ),
+    (
+        {c.StatusNames.REFLECT.name: 2, c.StatusNames.SPELL_ABSORPTION.name: 1},
+        {c.StatusNames.HIDDEN.name: 5}, 4, c.DamageTypes.FIRE.name
+        ),
+    (
+        {c.StatusNames.EVASION.name: 4, c.StatusNames.SPELL_ABSORPTION.name: 3},
+        {c.StatusNames.HIDDEN.name: 2}, 7, c.DamageTypes.SHOCK.name
+        )
+    )
+
+class DamageDistributionTest(unittest.TestCase):
+    """
+    calculate_damage_distribution must match the frequencies of many
+    seeded calculate_damage rolls.
+    """
+    def setUp(self):
+        event_manager = CombatSession.create_event_manager()
+        self.registries = Registries(event_manager, seed=3)
+        self.player = Player(self.registries, "FIGHTER", event_manager)
+        self.enemy = self.registries.enemies.create_enemy("RAT", self.registries, None)
+
+    def set_statuses(self, combatant, statuses):
+        status_registry = self.registries.statuses
+        combatant.status_manager.reset_statuses(combatant, status_registry)
+        for status_id, level in statuses.items():
+            combatant.status_manager.change_status(status_id, level, combatant, status_registry)
+
+    def test_distribution_matches_samples(self):
+        player = self.player
+        enemy = self.enemy
+        calculator = enemy.damage_calculator
+        for defender_statuses, attacker_statuses, amount, damage_type in SETUPS:
+            self.set_statuses(enemy, defender_statuses)
+            self.set_statuses(player, attacker_statuses)
+            distribution = calculator.calculate_damage_distribution(
+                enemy, player, amount, damage_type, self.registries
+                )
+            player_snapshot = player.snapshot()
+            enemy_snapshot = enemy.snapshot()
+            counts = {}
+            for _ in range(SAMPLES):
+                damage = calculator.calculate_damage(
+                    enemy, player, amount, damage_type, self.registries
+                    )
+                counts[damage] = counts.get(damage, 0) + 1
+                player.restore(player_snapshot)
+                enemy.restore(enemy_snapshot)
+            with self.subTest(defender=defender_statuses, attacker=attacker_statuses):
+                self.assertAlmostEqual(sum(distribution.values()), 1.0)
+                self.assertLessEqual(set(counts), set(distribution))
+                for damage, probability in distribution.items():
+                    # Allow five standard errors either way
+                    tolerance = 5 * math.sqrt(probability * (1 - probability) / SAMPLES)
+                    self.assertAlmostEqual(
+                        counts.get(damage, 0) / SAMPLES, probability,
+                        delta=max(tolerance, 1e-9)
+                        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for DamageMatrix against DamageCalculator.
+"""
+import unittest
+from core.player import Player
+from core.registries import Registries
+from gameplay.combat_session import CombatSession
+from gameplay.damage_matrix import DamageMatrix, DefenderState
+import utils.constants as c
+
+STATUS_SETUPS = (
+    {},
+    {c.StatusNames.DEFENSE.name: 3},
+    {c.StatusNames.REFLECT.name: 2},
+    {c.StatusNames.SPELL_ABSORPTION.name: 3},
+    {c.StatusNames.REFLECT.name: 4, c.StatusNames.SPELL_ABSORPTION.name: 1},
+    {c.StatusNames.EVASION.name: 2, c.StatusNames.REFLECT.name: 1}
+    )
+
+class DamageMatrixTest(unittest.TestCase):
+    """
+    The matrix must give the same expected damage as the calculator.
+    """
+    @classmethod
+    def setUpClass(cls):
+        event_manager = CombatSession.create_event_manager()
+        cls.registries = registries = Registries(event_manager, seed=1)
+        cls.matrix = DamageMatrix(registries)
+        cls.player = Player(registries, "FIGHTER", event_manager)
+        cls.enemy = registries.enemies.create_enemy("RAT", registries, None)
+        # One card with a single damage hit for each damage type
+        cls.cards = {}
+        for card_id in registries.cards.card_prototypes:
+            try:
+                card = registries.cards.create_card(card_id, registries.effects)
+            except (KeyError, ValueError):
+                continue
+            hits = cls.matrix.get_damage_hits(card)
+            if len(hits) == 1 and hits[0][0] not in cls.cards:
+                cls.cards[hits[0][0]] = (card_id, hits[0][1])
+
+    def set_statuses(self, statuses):
+        registries = self.registries
+        enemy = self.enemy
+        enemy.status_manager.reset_statuses(enemy, registries.statuses)
+        for status_id, level in statuses.items():
+            enemy.status_manager.change_status(status_id, level, enemy, registries.statuses)
+
+    def calculate_damage(self, attacker, amount, damage_type) -> float:
+        """
+        Get the damage calculate_damage deals, or its expected value when
+        the defender can evade, leaving both combatants unchanged.
+        """
+        enemy = self.enemy
+        calculator = enemy.damage_calculator
+        if c.StatusNames.EVASION.name in enemy.status_manager.statuses:
+            return calculator.calculate_expected_damage(
+                enemy, attacker, amount, damage_type, self.registries
+                )
+        player_snapshot = self.player.snapshot()
+        enemy_snapshot = enemy.snapshot()
+        try:
+            return calculator.calculate_damage(
+                enemy, attacker, amount, damage_type, self.registries
+                )
+        finally:
+            self.player.restore(player_snapshot)
+            enemy.restore(enemy_snapshot)
+
+    def test_matrix_matches_calculator(self):
+        self.assertIn(c.DamageTypes.PHYSICAL.name, self.cards)
+        self.assertGreater(len(self.cards), 2)
+        card_ids = [card_id for card_id, _ in self.cards.values()]
+        for statuses in STATUS_SETUPS:
+            self.set_statuses(statuses)
+            for attacker in (self.player, None):
+                state = DefenderState.from_combatants(self.enemy, attacker)
+                _, expected = self.matrix.calculate_expected_damage([state], card_ids)
+                for index, (damage_type, (card_id, amount)) in enumerate(self.cards.items()):
+                    with self.subTest(
+                            statuses=statuses, card=card_id,
+                            attacker=attacker is not None
+                            ):
+                        self.assertAlmostEqual(
+                            expected[index, 0],
+                            self.calculate_damage(attacker, amount, damage_type)
+                            )
+
+    def test_reflect_needs_attacker(self):
+        self.set_statuses({c.StatusNames.REFLECT.name: 2})
+        self.assertTrue(DefenderState.from_combatants(self.enemy, self.player).has_attacker)
+        self.assertFalse(DefenderState.from_combatants(self.enemy).has_attacker)
+        self.assertFalse(DefenderState.from_combatants(self.enemy, self.enemy).has_attacker)
+
+
+if __name__ == "__main__":
+    unittest.main()
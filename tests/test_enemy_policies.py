@@ -0,0 +1,74 @@
+"""
+Tests for the MCTSPolicy enemy search.
+"""
+import unittest
+from core.player import Player
+from core.registries import Registries
+from gameplay.combat_manager import CombatManager
+from gameplay.combat_session import CombatSession
+from gameplay.enemy_policies import MCTSPolicy
+import utils.constants as c
+
+class MCTSPolicyTest(unittest.TestCase):
+    """
+    A search with a fixed number of iterations and a seed is reproducible,
+    leaves the combat as it found it, and sends no events to the game.
+    """
+    def setUp(self):
+        self.event_manager = event_manager = CombatSession.create_event_manager()
+        self.registries = registries = Registries(event_manager, seed=5)
+        self.combat_manager = CombatManager(event_manager)
+        self.player = Player(registries, "FIGHTER", event_manager)
+        self.enemy = enemy = registries.enemies.create_enemy("SCRIB", registries, None)
+        self.combat_manager.start_combat(self.player, enemy)
+        self.combat_manager.beginning_of_turn(enemy, self.player, registries)
+        # With an empty deck, drawing a card shuffles the discard pile back in
+        card_manager = enemy.card_manager
+        card_manager.discard_pile.extend(card_manager.deck)
+        card_manager.deck.clear()
+        card_manager.hand.extend(
+            registries.cards.create_card("PREPAREDNESS", registries.effects)
+            for _ in range(2)
+            )
+        enemy.resources[c.Resources.STAMINA.name].set_current(5)
+        self.events = []
+        event_manager.subscribe(
+            'empty_discard_pile', lambda: self.events.append('empty_discard_pile')
+            )
+
+    def search(self, seed) -> tuple:
+        """
+        Run a seeded search and return its choice and the root's statistics.
+        """
+        policy = MCTSPolicy(max_iterations=200, seed=seed)
+        card = policy.choose_card(self.combat_manager, self.player, self.enemy, self.registries)
+        root = policy.get_node(self.player, self.enemy)
+        visits = [(action, edge.visits) for action, edge in root.edges.items()]
+        return card, visits
+
+    def test_search_is_reproducible(self):
+        card, visits = self.search(7)
+        self.assertEqual(self.search(7), (card, visits))
+        self.assertEqual(sum(visit_count for _, visit_count in visits), 200)
+
+    def test_search_leaves_combat_unchanged(self):
+        snapshot = self.combat_manager.snapshot(self.player, self.enemy)
+        state_hash = self.combat_manager.get_state_hash(self.player, self.enemy)
+        rng_state = self.registries.rng.getstate()
+        deck_order = [card.name for card in self.player.card_manager.deck]
+        self.search(7)
+        self.assertEqual(self.combat_manager.snapshot(self.player, self.enemy), snapshot)
+        self.assertEqual(self.combat_manager.get_state_hash(self.player, self.enemy), state_hash)
+        self.assertEqual(self.registries.rng.getstate(), rng_state)
+        self.assertEqual([card.name for card in self.player.card_manager.deck], deck_order)
+
+    def test_search_sends_no_events(self):
+        self.search(7)
+        self.assertEqual(self.events, [])
+        for combatant in (self.player, self.enemy):
+            for owner in (combatant, combatant.card_manager, combatant.status_manager):
+                self.assertIs(owner.event_manager, self.event_manager)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for EventManager's queued mode.
+"""
+import unittest
+from unittest import mock
+import utils.constants as c
+from utils.event_manager import EventManager
+
+class QueuedEventManagerTest(unittest.TestCase):
+    """
+    Events wait in a priority queue until process_events.
+    """
+    def setUp(self):
+        self.event_manager = EventManager(queued=True)
+        self.calls = []
+        for event_type in ("low", "normal", "high", "update_stats"):
+            self.event_manager.subscribe(
+                event_type,
+                lambda *args, event_type=event_type, **kwargs:
+                    self.calls.append((event_type, args, kwargs))
+                )
+        patcher = mock.patch.dict(c.EVENT_PRIORITIES, {"low": -5, "high": 5})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dispatch_waits_for_processing(self):
+        self.event_manager.dispatch("normal", 1)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.event_manager.process_events(), 1)
+        self.assertEqual(self.calls, [("normal", (1,), {})])
+
+    def test_priority_order(self):
+        for event_type in ("low", "update_stats", "normal", "high"):
+            self.event_manager.dispatch(event_type)
+        self.event_manager.process_events()
+        self.assertEqual(
+            [event_type for event_type, _, _ in self.calls],
+            ["high", "normal", "low", "update_stats"]
+            )
+
+    def test_fifo_within_priority(self):
+        for index in range(5):
+            self.event_manager.dispatch("normal", index)
+        self.event_manager.process_events()
+        self.assertEqual([args[0] for _, args, _ in self.calls], list(range(5)))
+
+    def test_identical_update_stats_coalesce(self):
+        self.event_manager.dispatch("update_stats", "player", full=True)
+        self.event_manager.dispatch("update_stats", "player", full=True)
+        self.event_manager.dispatch("update_stats", "enemy", full=True)
+        self.event_manager.dispatch("update_stats", "player", full=False)
+        self.assertEqual(self.event_manager.process_events(), 3)
+        self.assertEqual(self.calls, [
+            ("update_stats", ("player",), {"full": True}),
+            ("update_stats", ("enemy",), {"full": True}),
+            ("update_stats", ("player",), {"full": False})
+            ])
+
+    def test_coalescing_ends_once_processed(self):
+        self.event_manager.dispatch("update_stats", "player")
+        self.event_manager.process_events()
+        self.event_manager.dispatch("update_stats", "player")
+        self.assertEqual(self.event_manager.process_events(), 1)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_events_queued_during_processing(self):
+        def chain(depth):
+            if depth:
+                self.event_manager.dispatch("chain", depth - 1)
+        self.event_manager.subscribe("chain", chain)
+        self.event_manager.subscribe("chain", lambda depth: self.calls.append(("chain", depth)))
+        self.event_manager.dispatch("chain", 3)
+        self.event_manager.dispatch("normal")
+        self.assertEqual(self.event_manager.process_events(), 5)
+        self.assertEqual(self.calls, [
+            ("chain", 3), ("normal", (), {}), ("chain", 2), ("chain", 1), ("chain", 0)
+            ])
+
+    def test_max_events(self):
+        for index in range(5):
+            self.event_manager.dispatch("normal", index)
+        self.assertEqual(self.event_manager.process_events(max_events=2), 2)
+        self.assertEqual([args[0] for _, args, _ in self.calls], [0, 1])
+        self.assertEqual(self.event_manager.process_events(max_events=10), 3)
+        self.assertEqual(self.event_manager.process_events(), 0)
+        self.assertEqual([args[0] for _, args, _ in self.calls], list(range(5)))
+
+    def test_profiled_processing(self):
+        self.event_manager.enable_profiling()
+        self.event_manager.dispatch("normal")
+        self.event_manager.process_events()
+        summary = self.event_manager.profiler.get_summary_data()
+        self.assertEqual(summary["events"]["normal"]["dispatches"], 1)
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Regression tests for EventProfiler.
+"""
+import json
+import unittest
+from tempfile import TemporaryDirectory
+from utils.event_manager import EventManager
+
+class EventProfilerResetTest(unittest.TestCase):
+    """
+    Resetting from inside a profiled dispatch, as /e reset does.
+    """
+    def setUp(self):
+        self.event_manager = EventManager()
+        self.event_manager.enable_profiling()
+        self.profiler = self.event_manager.profiler
+        self.event_manager.subscribe("command", lambda: self.profiler.reset())
+
+    def test_reset_inside_dispatch_keeps_depth(self):
+        self.event_manager.dispatch("command")
+        self.assertEqual(self.profiler.depth, 0)
+        self.event_manager.dispatch("other")
+        self.assertEqual(self.profiler.get_summary_data()["events"]["other"]["max_depth"], 1)
+
+    def test_dump_after_reset(self):
+        self.event_manager.dispatch("command")
+        with TemporaryDirectory() as directory:
+            path = f"{directory}/event_profile.json"
+            self.profiler.write_json(path)
+            with open(path) as file:
+                summary = json.load(file)
+        command = summary["events"]["command"]
+        self.assertEqual(command["dispatches"], 0)
+        self.assertEqual(command["max_depth"], 0)
+        self.assertEqual(len(command["callbacks"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
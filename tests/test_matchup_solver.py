@@ -0,0 +1,195 @@
+"""
+Tests for MatchupSolver against CombatSession runs and an exhaustive search.
+"""
+import itertools
+import math
+import random
+import unittest
+from core.player import Player
+from core.registries import Registries
+from gameplay.combat_session import CombatSession
+from gameplay.matchup_solver import MatchupSolver
+import utils.constants as c
+
+HEALTH_ID = c.Resources.HEALTH.name
+COMBATS = 2000
+
+class OrderedRandom(random.Random):
+    """
+    Shuffles cards into a chosen order of card names, and otherwise leaves
+    them alone.
+    """
+    def __init__(self):
+        super().__init__(0)
+        self.order = None
+
+    def shuffle(self, x):
+        if self.order is None:
+            return
+        remaining = list(x)
+        for index, name in enumerate(self.order):
+            card = next(card for card in remaining if card.name == name)
+            remaining.remove(card)
+            x[index] = card
+        self.order = None
+
+
+class MatchupSolverTest(unittest.TestCase):
+    """
+    The solver's odds must match seeded CombatSession runs and, for a tiny
+    deck, every possible order of the cards.
+    """
+    def setUp(self):
+        self.event_manager = CombatSession.create_event_manager()
+        self.registries = Registries(self.event_manager, seed=1)
+        self.solver = MatchupSolver(self.registries)
+
+    def run_sessions(self, enemy_id) -> tuple:
+        """
+        Run seeded combats and return the win rate, the mean turns and the
+        mean turns to kill.
+        """
+        registries = self.registries
+        registries.rng.seed(2)
+        wins = turns = turns_to_kill = 0
+        for _ in range(COMBATS):
+            player = Player(registries, "FIGHTER", self.event_manager)
+            enemy = registries.enemies.create_enemy(enemy_id, registries, None)
+            result = CombatSession(player, enemy, registries).run()
+            turns += result.turns
+            if result.player_won:
+                wins += 1
+                turns_to_kill += result.turns + 1
+        return wins / COMBATS, turns / COMBATS, turns_to_kill / max(wins, 1)
+
+    def test_rat_matches_combat_sessions(self):
+        result = self.solver.solve_matchup("FIGHTER", "RAT")
+        self.assertLessEqual(result.unresolved_chance, c.MATCHUP_SOLVER_TOLERANCE)
+        win_rate, turns, turns_to_kill = self.run_sessions("RAT")
+        self.assertAlmostEqual(result.win_chance, win_rate, delta=0.01)
+        # Turns are mostly 0 or 1, so their standard deviation is below 1
+        tolerance = 5 / math.sqrt(COMBATS)
+        self.assertAlmostEqual(result.expected_turns, turns, delta=tolerance)
+        self.assertAlmostEqual(result.expected_turns_to_kill, turns_to_kill, delta=tolerance)
+
+    def test_mudcrab_bounds_combat_sessions(self):
+        result = self.solver.solve_matchup("FIGHTER", "MUDCRAB")
+        # The state limit stops the solver early, so its means are withheld
+        self.assertGreater(result.unresolved_chance, c.MATCHUP_SOLVER_TOLERANCE)
+        self.assertIsNone(result.expected_turns)
+        self.assertIsNone(result.expected_turns_to_kill)
+        win_rate, _, _ = self.run_sessions("MUDCRAB")
+        tolerance = 5 * math.sqrt(0.25 / COMBATS)
+        self.assertGreaterEqual(win_rate, result.win_chance - tolerance)
+        self.assertLessEqual(win_rate, result.win_chance + result.unresolved_chance + tolerance)
+
+    def test_solving_leaves_combatants_unchanged(self):
+        player = Player(self.registries, "FIGHTER", self.event_manager)
+        enemy = self.registries.enemies.create_enemy("RAT", self.registries, None)
+        deltas = dict(player.attribute_deltas)
+        version = player.attribute_version
+        self.solver.solve(player, enemy, max_turns=2)
+        self.assertEqual(player.attribute_deltas, deltas)
+        self.assertEqual(player.attribute_version, version)
+
+    def create_tiny_matchup(self) -> tuple:
+        """
+        Create a player and an enemy whose decks are small enough for every
+        order of their cards to be tried.
+        """
+        registries = self.registries
+        player = Player(registries, "FIGHTER", self.event_manager)
+        enemy = registries.enemies.create_enemy("MUDCRAB", registries, None)
+        for combatant, card_ids in (
+                (player, ["IRON_LONGSWORD", "MISS", "MISS", "BARGAIN_POTION_HEALTH"]),
+                (enemy, ["SHARP_CLAWS", "SHARP_CLAWS", "HARD_CARAPACE", "MISS"])
+                ):
+            deck = combatant.card_manager.deck
+            deck.clear()
+            deck.extend(
+                registries.cards.create_card(card_id, registries.effects)
+                for card_id in card_ids
+                )
+        player.resources[HEALTH_ID].set_current(4)
+        enemy.resources[HEALTH_ID].max_value = 9
+        enemy.resources[HEALTH_ID].set_current(9)
+        return player, enemy
+
+    def search_all_orders(self, player, enemy, max_turns) -> dict:
+        """
+        Play the combat through the real CombatSession for every order each
+        side's cards can be drawn in, merging positions with the same state
+        hash, and return the exact odds.
+        """
+        registries = self.registries
+        session = CombatSession(player, enemy, registries, max_turns)
+        combat_manager = session.combat_manager
+        rngs = {}
+        for combatant in (player, enemy):
+            rngs[combatant] = combatant.card_manager.rng = OrderedRandom()
+        combat_manager.start_combat(player, enemy)
+        positions = {0: (combat_manager.snapshot(player, enemy), 1.0)}
+        odds = {"win": 0.0, "loss": 0.0, "turns": 0.0, "turns_to_kill": 0.0}
+        for turn in range(max_turns):
+            for combatant in (player, enemy):
+                next_positions = {}
+                for snapshot, chance in positions.values():
+                    combat_manager.restore(snapshot, player, enemy)
+                    card_manager = combatant.card_manager
+                    # Every card is drawn each turn, from the deck or else
+                    # from the reshuffled discard pile
+                    pile = card_manager.deck or card_manager.discard_pile
+                    orders = sorted(set(itertools.permutations(card.name for card in pile)))
+                    for order in orders:
+                        combat_manager.restore(snapshot, player, enemy)
+                        if card_manager.deck:
+                            cards = list(card_manager.deck)
+                            rngs[combatant].order = order
+                            rngs[combatant].shuffle(cards)
+                            card_manager.deck.clear()
+                            card_manager.deck.extend(cards)
+                        else:
+                            rngs[combatant].order = order
+                        if combatant is player:
+                            session.play_player_turn()
+                        else:
+                            combat_manager.do_enemy_turn(player, enemy, registries)
+                        order_chance = chance / len(orders)
+                        if session.is_combat_over():
+                            if player.is_alive():
+                                odds["win"] += order_chance
+                                odds["turns_to_kill"] += order_chance * (turn + 1)
+                            else:
+                                odds["loss"] += order_chance
+                            odds["turns"] += order_chance * turn
+                            continue
+                        key = combat_manager.get_state_hash(player, enemy)
+                        _, previous = next_positions.get(key, (None, 0.0))
+                        next_positions[key] = (
+                            combat_manager.snapshot(player, enemy), previous + order_chance
+                            )
+                positions = next_positions
+        odds["timeout"] = sum(chance for _, chance in positions.values())
+        odds["turns"] += odds["timeout"] * max_turns
+        return odds
+
+    def test_tiny_deck_matches_exhaustive_search(self):
+        max_turns = 6
+        player, enemy = self.create_tiny_matchup()
+        result = self.solver.solve(player, enemy, max_turns, tolerance=0, max_states=None)
+        player, enemy = self.create_tiny_matchup()
+        odds = self.search_all_orders(player, enemy, max_turns)
+        for outcome in ("win", "loss", "timeout"):
+            self.assertGreater(odds[outcome], 0)
+        self.assertEqual(result.unresolved_chance, 0.0)
+        self.assertAlmostEqual(result.win_chance, odds["win"])
+        self.assertAlmostEqual(result.loss_chance, odds["loss"])
+        self.assertAlmostEqual(result.timeout_chance, odds["timeout"])
+        self.assertAlmostEqual(result.expected_turns, odds["turns"])
+        self.assertAlmostEqual(
+            result.expected_turns_to_kill, odds["turns_to_kill"] / odds["win"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
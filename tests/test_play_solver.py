@@ -0,0 +1,149 @@
+"""
+Tests for PlaySolver against an exhaustive search of play orders.
+"""
+import itertools
+import random
+import unittest
+from core.player import Player
+from core.registries import Registries
+from gameplay.combat_manager import CombatManager
+from gameplay.combat_session import CombatSession
+from gameplay.play_solver import PlaySolver
+import utils.constants as c
+
+STAMINA_ID = c.Resources.STAMINA.name
+MAGICKA_ID = c.Resources.MAGICKA.name
+HEALTH_ID = c.Resources.HEALTH.name
+
+class PlaySolverBruteForceTest(unittest.TestCase):
+    """
+    The DP and knapsack split must find the same best score as trying every
+    order of every subset of the hand.
+    """
+    @classmethod
+    def setUpClass(cls):
+        event_manager = CombatSession.create_event_manager()
+        cls.registries = registries = Registries(event_manager, seed=1)
+        cls.combat_manager = CombatManager(event_manager)
+        cls.solver = PlaySolver(registries, cls.combat_manager)
+        cls.player = Player(registries, "FIGHTER", event_manager)
+        cls.enemy = registries.enemies.create_enemy("RAT", registries, None)
+        cls.combat_manager.start_combat(cls.player, cls.enemy)
+        cls.combat_manager.beginning_of_turn(cls.player, cls.enemy, registries)
+        cls.card_ids = []
+        for card_id in registries.cards.card_prototypes:
+            try:
+                registries.cards.create_card(card_id, registries.effects)
+            except (KeyError, ValueError):
+                continue
+            cls.card_ids.append(card_id)
+
+    def search_all_orders(self, objective) -> tuple:
+        """
+        Score every order of every subset of the hand with the solver's own
+        step rules, and return the best (primary, secondary, -plays) score.
+        """
+        solver = self.solver
+        player = self.player
+        turn = solver._get_turn_data(player, self.enemy, objective)
+        hand = [
+            option for option in solver._create_options(player) for _ in option["cards"]
+            ]
+        best = None
+        for size in range(len(hand) + 1):
+            for order in itertools.permutations(range(len(hand)), size):
+                stamina = player.resources[STAMINA_ID].current
+                magicka = player.resources[MAGICKA_ID].current
+                defense = turn["defense"]
+                missing_health = turn["max_values"][HEALTH_ID] - player.get_health()
+                primary = secondary = 0.0
+                for index in order:
+                    option = hand[index]
+                    if option["resource"] == STAMINA_ID:
+                        if stamina < option["cost"]:
+                            break
+                        stamina -= option["cost"]
+                    else:
+                        if magicka < option["cost"]:
+                            break
+                        magicka -= option["cost"]
+                    gain, stamina, magicka, defense, missing_health = solver._apply_steps(
+                        option["steps"], stamina, magicka, defense, missing_health, turn
+                        )
+                    primary += gain[0]
+                    secondary += gain[1]
+                else:
+                    score = (round(primary, 9), round(secondary, 9), -size)
+                    if best is None or score > best:
+                        best = score
+        return best
+
+    def replay(self, plays, objective) -> tuple:
+        """
+        Score the suggested plays in order with the solver's step rules.
+        """
+        solver = self.solver
+        player = self.player
+        turn = solver._get_turn_data(player, self.enemy, objective)
+        options = {
+            option["cards"][0].card_id: option for option in solver._create_options(player)
+            }
+        stamina = player.resources[STAMINA_ID].current
+        magicka = player.resources[MAGICKA_ID].current
+        defense = turn["defense"]
+        missing_health = turn["max_values"][HEALTH_ID] - player.get_health()
+        primary = secondary = 0.0
+        for card in plays:
+            option = options[card.card_id]
+            if option["resource"] == STAMINA_ID:
+                stamina -= option["cost"]
+            else:
+                magicka -= option["cost"]
+            self.assertGreaterEqual(min(stamina, magicka), 0)
+            gain, stamina, magicka, defense, missing_health = solver._apply_steps(
+                option["steps"], stamina, magicka, defense, missing_health, turn
+                )
+            primary += gain[0]
+            secondary += gain[1]
+        return round(primary, 9), round(secondary, 9), -len(plays)
+
+    def test_random_hands_match_exhaustive_search(self):
+        registries = self.registries
+        player = self.player
+        enemy = self.enemy
+        rng = random.Random(0)
+        for _ in range(150):
+            player.card_manager.hand[:] = [
+                registries.cards.create_card(card_id, registries.effects)
+                for card_id in rng.choices(self.card_ids, k=rng.randint(1, 6))
+                ]
+            player.resources[STAMINA_ID].set_current(rng.randint(0, 8))
+            player.resources[MAGICKA_ID].set_current(rng.randint(0, 8))
+            player.resources[HEALTH_ID].set_current(rng.randint(1, player.get_max_health()))
+            player.status_manager.reset_statuses(player, registries.statuses)
+            enemy.status_manager.reset_statuses(enemy, registries.statuses)
+            if rng.random() < 0.5:
+                enemy.status_manager.change_status(
+                    c.StatusNames.DEFENSE.name, rng.randint(1, 6), enemy, registries.statuses
+                    )
+            if rng.random() < 0.3:
+                enemy.status_manager.change_status(
+                    c.StatusNames.EVASION.name, rng.randint(1, 3), enemy, registries.statuses
+                    )
+            for objective in c.PlayObjectives:
+                plays, damage, survival = self.solver.suggest_plays(player, enemy, objective)
+                if objective == c.PlayObjectives.DAMAGE:
+                    primary, secondary = damage, survival
+                else:
+                    primary, secondary = survival, damage
+                with self.subTest(
+                        hand=[card.name for card in player.card_manager.hand],
+                        objective=objective.name
+                        ):
+                    score = (round(primary, 9), round(secondary, 9), -len(plays))
+                    self.assertEqual(score, self.search_all_orders(objective))
+                    self.assertEqual(self.replay(plays, objective), score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for RegistryBundle invalidation.
+"""
+import importlib
+import os
+import pickle
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+import core.registry_bundle as registry_bundle
+from core.registries import Registries
+from core.registry_bundle import RegistryBundle
+from utils.event_manager import EventManager
+
+MODULE_NAME = "bundle_test_module"
+MODULE_SOURCE = '''
+class Thing:
+    def __init__(self, event_manager):
+        self.event_manager = event_manager
+        self.value = 1
+'''
+
+class RegistryBundleTest(unittest.TestCase):
+    """
+    A bundle is only loaded while both the data and the source of the
+    classes pickled in it are unchanged.
+    """
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        root = self.directory.name
+        self.data_directory = os.path.join(root, "data")
+        os.makedirs(self.data_directory)
+        with open(os.path.join(self.data_directory, "cards.json"), "w") as file:
+            file.write("{}")
+        self.module_path = os.path.join(root, f"{MODULE_NAME}.py")
+        with open(self.module_path, "w") as file:
+            file.write(MODULE_SOURCE)
+        sys.path.insert(0, root)
+        self.addCleanup(sys.path.remove, root)
+        self.addCleanup(sys.modules.pop, MODULE_NAME, None)
+        patcher = mock.patch.object(registry_bundle, "PROJECT_DIRECTORY", root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bundle_path = os.path.join(root, "cache", "registries.bundle")
+        self.event_manager = EventManager()
+        module = importlib.import_module(MODULE_NAME)
+        RegistryBundle(self.data_directory, self.bundle_path).save(
+            {"things": [module.Thing(self.event_manager)]}, self.event_manager
+            )
+
+    def load(self):
+        return RegistryBundle(self.data_directory, self.bundle_path).load(self.event_manager)
+
+    def test_round_trip_reconnects_event_manager(self):
+        loaded = self.load()
+        self.assertEqual(loaded["things"][0].value, 1)
+        self.assertIs(loaded["things"][0].event_manager, self.event_manager)
+
+    def test_data_change_invalidates(self):
+        with open(os.path.join(self.data_directory, "cards.json"), "w") as file:
+            file.write('{"IRON_HELM": {}}')
+        self.assertIsNone(self.load())
+
+    def test_source_change_invalidates(self):
+        with open(self.module_path, "a") as file:
+            file.write("\n    def describe(self):\n        return str(self.value)\n")
+        self.assertIsNone(self.load())
+
+    def test_header_lists_pickled_modules(self):
+        with open(self.bundle_path, "rb") as file:
+            _, module_names, _ = pickle.load(file)
+        self.assertIn(MODULE_NAME, module_names)
+
+    def test_registries_list_their_class_modules(self):
+        registries = Registries(self.event_manager, use_bundle=False)
+        compiled = {name: getattr(registries, name) for name in Registries.COMPILED_REGISTRIES}
+        RegistryBundle(self.data_directory, self.bundle_path).save(compiled, self.event_manager)
+        with open(self.bundle_path, "rb") as file:
+            _, module_names, _ = pickle.load(file)
+        for module_name in ("core.cards", "core.effects", "core.statuses"):
+            self.assertIn(module_name, module_names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for the incrementally updated StateHash.
+"""
+import unittest
+from core.player import Player
+from core.registries import Registries
+from gameplay.combat_session import CombatSession
+from gameplay.enemy_policies import MCTSPolicy
+from gameplay.state_hash import HASH_MASK, get_zobrist_key
+
+def recompute_hash(combatant) -> int:
+    """
+    Sum the keys of everything in a combatant's state from scratch.
+    """
+    side = combatant.state_hash.side
+    card_manager = combatant.card_manager
+    value = 0
+    for pile, cards in (
+            ("DECK", card_manager.deck), ("HAND", card_manager.hand),
+            ("DISCARD", card_manager.discard_pile),
+            ("CONSUMED", card_manager.consumed_pile)
+            ):
+        for card in cards:
+            value += get_zobrist_key(side, pile, card.name)
+    for status_id, leveled_status in combatant.status_manager.statuses.items():
+        if leveled_status.base_level:
+            value += get_zobrist_key(side, "STATUS", status_id, leveled_status.base_level)
+    for resource_id, resource in combatant.resources.items():
+        if resource.current:
+            value += get_zobrist_key(side, "RESOURCE", resource_id, resource.current)
+    return value & HASH_MASK
+
+
+class StateHashTest(unittest.TestCase):
+    """
+    The incremental hash must always equal the hash of the state computed
+    from scratch.
+    """
+    def create_session(self, enemy_id, seed) -> CombatSession:
+        event_manager = CombatSession.create_event_manager()
+        registries = Registries(event_manager, seed=seed)
+        player = Player(registries, "FIGHTER", event_manager)
+        enemy = registries.enemies.create_enemy(enemy_id, registries, None)
+        return CombatSession(
+            player, enemy, registries,
+            enemy_policy=MCTSPolicy(max_iterations=20, seed=seed)
+            )
+
+    def assert_hashes_match(self, session):
+        for combatant in (session.player, session.enemy):
+            self.assertEqual(combatant.state_hash.value, recompute_hash(combatant))
+
+    def test_hash_matches_after_full_combat(self):
+        for enemy_id, seed in (("GIANT_CAVE_RAT", 1), ("SCRIB", 0), ("SCRIB", 1)):
+            with self.subTest(enemy=enemy_id):
+                session = self.create_session(enemy_id, seed)
+                result = session.run()
+                self.assertGreater(result.turns, 0)
+                self.assert_hashes_match(session)
+
+    def test_hash_matches_after_restore(self):
+        session = self.create_session("SCRIB", 0)
+        player = session.player
+        enemy = session.enemy
+        registries = session.registries
+        combat_manager = session.combat_manager
+        combat_manager.start_combat(player, enemy)
+        snapshot = combat_manager.snapshot(player, enemy)
+        state_hash = combat_manager.get_state_hash(player, enemy)
+        for _ in range(3):
+            session.play_player_turn()
+            combat_manager.do_enemy_turn(player, enemy, registries)
+        self.assertFalse(session.is_combat_over())
+        self.assert_hashes_match(session)
+        combat_manager.restore(snapshot, player, enemy)
+        self.assert_hashes_match(session)
+        self.assertEqual(combat_manager.get_state_hash(player, enemy), state_hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 """
 This module contains constants needed across the codebase.
 """
-from enum import Enum
+from enum import Enum, IntEnum
 
 class ClassSpecializations(Enum):
     """
@@ -194,6 +194,13 @@ MAX_HAND_SIZE = 12
 MIN_DECK_SIZE = 10
 MAX_DECK_SIZE = 50
 MAX_CARD_FREQUENCY = 5
+MAX_COMBAT_TURNS = 100
+USE_ENEMY_SEARCH = False
+ENEMY_SEARCH_BUDGET_MS = 50
+TRANSPOSITION_TABLE_SIZE = 100000
+MATCHUP_SOLVER_TOLERANCE = 1e-6
+MATCHUP_SOLVER_MAX_STATES = 25000
+MATCHUP_SOLVER_DEFENSE_TURNS = 3
 NORMAL_CARD_REWARD = 1
 BOSS_CARD_REWARD = 2
 BOSS_ID = "BOSS"
@@ -254,6 +261,42 @@ class WeightClasses(Enum):
     MEDIUM = "Medium"
     HEAVY = "Heavy"
 
+DATA_DIRECTORY = "data"
+REGISTRY_BUNDLE_PATH = "cache/registries.bundle"
+
+class PlayObjectives(Enum):
+    """
+    What the best-play hint tries to maximize.
+    """
+    DAMAGE = "Damage"
+    SURVIVAL = "Survival"
+
+
+class LogLevel(IntEnum):
+    """
+    Severity of a log message. Messages below the logger's level are dropped
+    before they are formatted.
+    """
+    DEBUG = 10
+    INFO = 20
+    OFF = 100
+
+
+LOG_DIRECTORY = "logs"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_QUEUE_SIZE = 10000
+LOG_FLUSH_INTERVAL = 0.5  # Seconds
+EVENT_PROFILE_PATH = "logs/event_profile.json"
+
+# Queued event mode, where the GUI drains events a batch per frame
+QUEUE_EVENTS = False
+MAX_EVENTS_PER_FRAME = 20
+EVENT_PRIORITIES = {
+    "update_stats": -10
+}
+COALESCED_EVENTS = {"update_stats"}
+
 JSON_PATHS = {
     "cards": [
         "data/cards/weapons.json",
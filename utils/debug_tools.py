@@ -2,14 +2,16 @@
 This module contains tools for in-game debugging.
 """
 import utils.constants as c
+from gameplay.play_solver import PlaySolver
 
 class DebugTools:
     """
     Class for in-game debugging tools.
     """
-    def __init__(self, event_manager, registries):
+    def __init__(self, event_manager, registries, combat_manager):
         self.event_manager = event_manager
         self.registries = registries
+        self.play_solver = PlaySolver(registries, combat_manager)
         self.commands = {
             "HELP": DebugCommand(
                 "/h[elp] [<command>]",
@@ -34,6 +36,18 @@ class DebugTools:
                 "Sets a player's resource or attribute to a given value.",
                 "Usage: <combatant> must be self or target. <stat> must be the name of a resource or character attribute. <value> must be an integer.\nUse /s <combatant> max <resource> <value> to set a resource's maximum value.",
                 self.set_stat_cmd
+            ),
+            "EVENTS": DebugCommand(
+                "/e[vents] [on|off|reset|dump]",
+                "Shows the slowest event callbacks while event profiling is on.",
+                f"Usage: on starts profiling, off stops it, reset clears what was recorded, and dump writes it to {c.EVENT_PROFILE_PATH}.",
+                self.event_profile_cmd
+            ),
+            "BEST": DebugCommand(
+                "/b[est] [damage|survival]",
+                "Suggests the best order to play the cards in hand.",
+                "Usage: damage (the default) maximizes expected damage to the target. survival maximizes health restored and defense gained.",
+                self.best_play_cmd
             )
         }
     
@@ -181,17 +195,59 @@ class DebugTools:
             resource = target.resources[stat_id]
             if is_max:
                 resource.max_value = value
-                resource.current = resource.clamp_value(resource.current, mm)
+                resource.set_current(resource.clamp_value(resource.current, mm))
                 return True, f"Set {target_str.lower()} max {stat_id.lower()} = {value}."
             else:
                 value = resource.clamp_value(value, mm)
-                resource.current = value
+                resource.set_current(value)
                 return True, f"Set {target_str.lower()} {stat_id.lower()} = {value}."
         elif stat_id in list(c.Attributes.__members__):
-            target.attributes[stat_id] = value
+            target.set_attribute(stat_id, value)
             return True, f"Set {target_str.lower()} {stat_id.lower()} = {value}."
         return False, "Stat must be a valid resource or attribute."
 
+    def event_profile_cmd(self, player, enemy, args) -> tuple:
+        """
+        Controls event profiling and shows what it has recorded.
+        """
+        action = args[0] if args else "SHOW"
+        if action == "ON":
+            self.event_manager.enable_profiling()
+            return True, "Event profiling on."
+        if action == "OFF":
+            self.event_manager.disable_profiling()
+            return True, "Event profiling off."
+        profiler = self.event_manager.profiler
+        if profiler is None:
+            return False, "Event profiling is off. Use /e on to start it."
+        if action == "RESET":
+            profiler.reset()
+            return True, "Event profile cleared."
+        if action == "DUMP":
+            try:
+                profiler.write_json(c.EVENT_PROFILE_PATH)
+            except OSError as e:
+                return False, f"Could not write event profile: {e}"
+            return True, f"Wrote event profile to {c.EVENT_PROFILE_PATH}."
+        if action == "SHOW":
+            return True, profiler.format_summary()
+        return False, "Action must be on, off, reset, or dump."
+
+    def best_play_cmd(self, player, enemy, args) -> tuple:
+        """
+        Suggests the order to play the player's hand in.
+        """
+        objective_id = args[0] if args else c.PlayObjectives.DAMAGE.name
+        if objective_id not in c.PlayObjectives.__members__:
+            return False, "Objective must be damage or survival."
+        plays, damage, survival = self.play_solver.suggest_plays(
+            player, enemy, c.PlayObjectives[objective_id]
+            )
+        if not plays:
+            return True, "Best play: end the turn."
+        card_names = ", ".join(card.name for card in plays)
+        return True, f"Best play: {card_names} (expected damage {damage:.1f}, survival {survival:g})."
+
 class DebugCommand():
     """
     Represents a debug command with its execution logic.
@@ -1,11 +1,22 @@
 """Centralized event system to broadcast events between game and GUI."""
+import heapq
+from itertools import count
+from time import perf_counter
+import utils.constants as c
 from utils.logger import Logger
+from utils.event_profiler import EventProfiler
 
 class EventManager:
     """Class to manage subscribing to and dispatching events."""
-    def __init__(self):
+    def __init__(self, logger=None, queued=False):
         self.listeners = {}
-        self.logger = Logger()
+        self.logger = logger if logger is not None else Logger()
+        self.profiler = None
+        # In queued mode events wait in a priority queue for process_events
+        self.queued = queued
+        self.event_queue = []
+        self.pending_events = set()
+        self.sequence = count()
 
     def subscribe(self, event_type, callback):
         """Register a callback function for an event."""
@@ -13,8 +24,73 @@ class EventManager:
             self.listeners[event_type] = []
         self.listeners[event_type].append(callback)
 
+    def enable_profiling(self):
+        """Start recording dispatch counts and callback timings."""
+        if self.profiler is None:
+            self.profiler = EventProfiler()
+
+    def disable_profiling(self):
+        """Stop recording and discard what was recorded."""
+        self.profiler = None
+
     def dispatch(self, event_type, *args, **kwargs):
-        """Notify all listeners of an event."""
-        if event_type in self.listeners:
+        """Notify all listeners of an event, or queue it in queued mode."""
+        if self.queued:
+            self.queue_event(event_type, args, kwargs)
+        elif self.profiler is not None:
+            self.dispatch_profiled(event_type, *args, **kwargs)
+        elif event_type in self.listeners:
             for callback in self.listeners[event_type]:
                 callback(*args, **kwargs)
+
+    def queue_event(self, event_type, args, kwargs):
+        """
+        Add an event to the queue. A coalesced event is dropped if an
+        identical one is already waiting.
+        """
+        key = None
+        if event_type in c.COALESCED_EVENTS:
+            key = (event_type, args, tuple(sorted(kwargs.items())))
+            if key in self.pending_events:
+                return
+            self.pending_events.add(key)
+        # Higher priorities come out first, ties in the order they were queued
+        priority = c.EVENT_PRIORITIES.get(event_type, 0)
+        heapq.heappush(
+            self.event_queue,
+            (-priority, next(self.sequence), event_type, args, kwargs, key)
+            )
+
+    def process_events(self, max_events=None) -> int:
+        """
+        Notify listeners of queued events in priority order, including events
+        queued while processing. Return how many events were processed.
+        """
+        processed = 0
+        while self.event_queue and (max_events is None or processed < max_events):
+            _, _, event_type, args, kwargs, key = heapq.heappop(self.event_queue)
+            if key is not None:
+                self.pending_events.discard(key)
+            if self.profiler is not None:
+                self.dispatch_profiled(event_type, *args, **kwargs)
+            else:
+                for callback in self.listeners.get(event_type, []):
+                    callback(*args, **kwargs)
+            processed += 1
+        return processed
+
+    def dispatch_profiled(self, event_type, *args, **kwargs):
+        """Notify all listeners of an event, timing each callback."""
+        profiler = self.profiler
+        profiler.enter_dispatch(event_type)
+        try:
+            for callback in self.listeners.get(event_type, []):
+                start = perf_counter()
+                try:
+                    callback(*args, **kwargs)
+                finally:
+                    profiler.record_callback(
+                        event_type, callback, (perf_counter() - start) * 1000
+                        )
+        finally:
+            profiler.exit_dispatch()
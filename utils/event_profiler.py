@@ -0,0 +1,148 @@
+"""
+This module defines the EventProfiler class, which records how often each
+event is dispatched and how long its callbacks take.
+"""
+import json
+import os
+from bisect import bisect_left
+
+# Upper bounds of the callback timing histogram buckets, in milliseconds
+HISTOGRAM_BOUNDS = [0.01, 0.1, 1, 10, 100, 1000]
+
+class CallbackStats:
+    """
+    Timing totals and histogram for one callback of one event type.
+    """
+    __slots__ = ("calls", "total_time", "max_time", "histogram")
+
+    def __init__(self):
+        """
+        Initialize a new CallbackStats.
+        """
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def record(self, elapsed_ms):
+        """
+        Add one call that took elapsed_ms milliseconds.
+        """
+        self.calls += 1
+        self.total_time += elapsed_ms
+        self.max_time = max(self.max_time, elapsed_ms)
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS, elapsed_ms)] += 1
+
+    def get_stats_data(self) -> dict:
+        """
+        Get the stats as a dictionary.
+        """
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS]
+        labels.append(f">{HISTOGRAM_BOUNDS[-1]}ms")
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_time,
+            "mean_ms": self.total_time / self.calls if self.calls else 0.0,
+            "max_ms": self.max_time,
+            "histogram": dict(zip(labels, self.histogram))
+        }
+
+
+class EventProfiler:
+    """
+    Collects per-event dispatch counts, per-callback timings, and how deeply
+    dispatches nest inside each other.
+    """
+    def __init__(self):
+        """
+        Initialize a new EventProfiler.
+        """
+        self.depth = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Clear everything recorded so far. The current depth is kept, since
+        a reset can happen inside a dispatch that is still running.
+        """
+        self.event_counts = {}
+        self.callback_stats = {}
+        self.max_depths = {}
+        self.max_depth = 0
+
+    def enter_dispatch(self, event_type):
+        """
+        Record the start of a dispatch, which may be nested in another one.
+        """
+        self.depth += 1
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+        if self.depth > self.max_depths.get(event_type, 0):
+            self.max_depths[event_type] = self.depth
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def exit_dispatch(self):
+        """
+        Record the end of a dispatch.
+        """
+        self.depth -= 1
+
+    def record_callback(self, event_type, callback, elapsed_ms):
+        """
+        Record how long a callback took to handle an event.
+        """
+        key = (event_type, getattr(callback, "__qualname__", repr(callback)))
+        stats = self.callback_stats.get(key)
+        if stats is None:
+            stats = self.callback_stats[key] = CallbackStats()
+        stats.record(elapsed_ms)
+
+    def get_summary_data(self) -> dict:
+        """
+        Get everything recorded as a JSON-serializable dictionary. A callback
+        can finish after a reset without its dispatch having been counted, so
+        its event may have no count or depth.
+        """
+        event_types = list(self.event_counts)
+        event_types += [event_type for event_type, _ in self.callback_stats]
+        events = {}
+        for event_type in dict.fromkeys(event_types):
+            events[event_type] = {
+                "dispatches": self.event_counts.get(event_type, 0),
+                "max_depth": self.max_depths.get(event_type, 0),
+                "callbacks": {}
+            }
+        for (event_type, callback_name), stats in self.callback_stats.items():
+            events[event_type]["callbacks"][callback_name] = stats.get_stats_data()
+        return {"max_depth": self.max_depth, "events": events}
+
+    def format_summary(self, limit=10) -> str:
+        """
+        Get a short text summary of the slowest callbacks.
+        """
+        if not self.event_counts:
+            return "No events recorded."
+        dispatches = sum(self.event_counts.values())
+        lines = [
+            f"{dispatches} dispatches of {len(self.event_counts)} events, "
+            f"max depth {self.max_depth}."
+            ]
+        slowest = sorted(
+            self.callback_stats.items(),
+            key=lambda item: item[1].total_time, reverse=True
+            )
+        for (event_type, callback_name), stats in slowest[:limit]:
+            lines.append(
+                f"{event_type} -> {callback_name}: {stats.calls} calls, "
+                f"{stats.total_time:.2f}ms total, {stats.max_time:.2f}ms max"
+                )
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        """
+        Write the summary to a JSON file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.get_summary_data(), file, indent=2)
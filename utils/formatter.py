@@ -2,10 +2,18 @@
 import utils.constants as c
 import re
 
+SUBJECT_PATTERN = re.compile(r'\{([^{}|]+?\|[^{}|]+?)\}')
+
 class Formatter:
     """
     This class is responsible for formatting strings and data for display.
     """
+    # Rendered descriptions are shared by every Formatter.
+    # (status, level, use_generic, is_player) -> description
+    status_descriptions = {}
+    # (effect, level) -> description
+    effect_descriptions = {}
+
     def format_effect_data(self, effects, card=None, owner=None, attribute_registry=None) -> dict:
         """
         Format the effect data for display.
@@ -13,10 +21,14 @@ class Formatter:
         card_strings = [ ]
         tooltip_strings = [ ]
 
-        for leveled_effect in effects:
+        if card is not None:
+            levels = card.get_effect_levels(owner, attribute_registry)
+        else:
+            levels = [leveled_effect.get_level() for leveled_effect in effects]
+
+        for leveled_effect, level in zip(effects, levels):
             effect = leveled_effect.reference
             name = effect.name
-            level = leveled_effect.get_level(card, owner, attribute_registry)
             description = effect.description
             tooltip_line = f"{name} level {level}"
             tooltip_line = self.apply_font_color(tooltip_line, 'ffffff')
@@ -33,7 +45,7 @@ class Formatter:
                 else:
                     tooltip_line = f"{tooltip_line}:\n{description}"
             elif description:
-                description = description.format(level=self.apply_font_color(level, '6486ff'))
+                description = self.format_effect_description(effect, level)
                 tooltip_line = f"{tooltip_line}:\n{description}"                
 
             card_line = f"{name} {level}"
@@ -47,12 +59,35 @@ class Formatter:
         }
         return formatted_strings
 
+    def format_effect_description(self, effect, level) -> str:
+        """
+        Format an effect's description for the given level.
+        """
+        key = (effect, level)
+        description = Formatter.effect_descriptions.get(key)
+        if description is None:
+            description = effect.description.format(
+                level=self.apply_font_color(level, '6486ff')
+                )
+            Formatter.effect_descriptions[key] = description
+        return description
+
     def format_status_data(self, status, level, use_generic=False, is_player=True) -> str:
         """
         Format the status data for display.
         """
-        description = status.description
+        key = (status, level, use_generic, is_player)
+        description = Formatter.status_descriptions.get(key)
+        if description is None:
+            values = self.get_status_values(level, use_generic)
+            description = status.description_templates[is_player].format(**values)
+            Formatter.status_descriptions[key] = description
+        return description
 
+    def get_status_values(self, level, use_generic) -> dict:
+        """
+        Get the colored values to fill into a status description.
+        """
         if use_generic:
             values = {
                 'level': 'X',
@@ -70,10 +105,17 @@ class Formatter:
         
         for key, value in values.items():
             values[key] = self.apply_font_color(value, '6486ff')
+        return values
 
-        description = self.subjectify(description, is_player)
-        description = description.format(**values)
-        return description
+    def compile_description_templates(self, description) -> dict:
+        """
+        Resolve the conditional subject forms in a description once for each
+        subject. Keyed by is_player.
+        """
+        return {
+            True: self.subjectify(description, True),
+            False: self.subjectify(description, False)
+        }
 
     def subjectify(self, text, is_player):
         """
@@ -82,7 +124,7 @@ class Formatter:
         def repl(match):
             left, right = match.group(1).split('|', 1)
             return left if is_player else right
-        return re.sub(r'\{([^{}|]+?\|[^{}|]+?)\}', repl, text)
+        return SUBJECT_PATTERN.sub(repl, text)
     
     def apply_font_color(self, text, color):
         """
@@ -0,0 +1,131 @@
+"""
+This module defines the LogWriter class, which appends log lines to a file
+from a background thread so logging doesn't block the game.
+"""
+import atexit
+import os
+import queue
+import threading
+
+class LogWriter:
+    """
+    Buffers log lines in a bounded queue and writes them to disk in batches,
+    rotating the file when it grows past a size limit.
+    """
+    def __init__(self, path, max_bytes, backup_count, queue_size, flush_interval):
+        """
+        Initialize a new LogWriter and start its writer thread.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.lines = queue.Queue(maxsize=queue_size)
+        self.closed = False
+        self.file = None
+        self.file_size = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(
+            target=self._run, name="LogWriter", daemon=True
+            )
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, line):
+        """
+        Queue a line to be written. Blocks if the queue is full.
+        """
+        if not self.closed:
+            self.lines.put(line)
+
+    def flush(self):
+        """
+        Block until every queued line has been written to disk.
+        """
+        self.lines.join()
+
+    def close(self):
+        """
+        Write any queued lines, then stop the writer thread and close the file.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.lines.put(None)
+        self.thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        """
+        Wait for lines and write everything that has queued up in one batch.
+        """
+        running = True
+        while running:
+            try:
+                batch = [self.lines.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    batch.append(self.lines.get_nowait())
+                except queue.Empty:
+                    break
+            received = len(batch)
+            if None in batch:
+                running = False
+                batch = [line for line in batch if line is not None]
+            try:
+                self._write_batch(batch)
+            except OSError:
+                # A failed write shouldn't take the game down with it
+                pass
+            finally:
+                for _ in range(received):
+                    self.lines.task_done()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _write_batch(self, batch):
+        """
+        Write a batch of lines, rotating the file first if it would grow too
+        large.
+        """
+        if not batch:
+            return
+        text = "".join(f"{line}\n" for line in batch)
+        size = len(text.encode())
+        if self.file is None:
+            self._open_file()
+        if self.max_bytes and self.file_size and self.file_size + size > self.max_bytes:
+            self._rotate()
+        self.file.write(text)
+        self.file.flush()
+        self.file_size += size
+
+    def _open_file(self):
+        """
+        Open the log file for appending.
+        """
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.file_size = self.file.tell()
+
+    def _rotate(self):
+        """
+        Shift log.txt to log.1.txt, log.1.txt to log.2.txt and so on, dropping
+        the oldest backup, then start a fresh file.
+        """
+        self.file.close()
+        self.file = None
+        root, extension = os.path.splitext(self.path)
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{root}.{index}{extension}"
+                if os.path.exists(source):
+                    os.replace(source, f"{root}.{index + 1}{extension}")
+            os.replace(self.path, f"{root}.1{extension}")
+        else:
+            os.remove(self.path)
+        self._open_file()
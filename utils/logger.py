@@ -1,26 +1,68 @@
+import os
 from datetime import datetime
+import utils.constants as c
+from utils.log_writer import LogWriter
 
 class Logger:
-    def __init__(self, write_to_file=False):
+    def __init__(self, write_to_file=False, print_debug=True, level=c.LogLevel.DEBUG):
         """
         Initialize a new Logger.
         """
         self.logs = []
         self.write_to_file = write_to_file
+        self.print_debug = print_debug
+        self.level = level
+        self.subsystem_levels = {}
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
+        self.writer = None
+
+    def set_level(self, level, subsystem=None):
+        """
+        Set the minimum level that gets logged, either globally or for one
+        subsystem. Use LogLevel.OFF to silence a subsystem entirely.
+        """
+        if subsystem is None:
+            self.level = level
+        else:
+            self.subsystem_levels[subsystem] = level
+
+    def is_enabled(self, level, subsystem=None) -> bool:
+        """
+        Check if a message at this level would be recorded anywhere.
+        """
+        if level < self.subsystem_levels.get(subsystem, self.level):
+            return False
+        # Debug messages only go to the log file or stdout
+        return level >= c.LogLevel.INFO or self.write_to_file or self.print_debug
+
     # TODO: log messages with more structured data (e.g. type, source, etc.) and use that to enhance the combat log display (e.g. different colors for different types of messages)
-    def log(self, message, is_debug=False):
+    def log(self, message, *args, subsystem=None):
         """
-        Add a new log entry.
+        Add a new log entry. Call as log(level, fmt, *args) to only format the
+        message when the level is enabled, or as log(message, is_debug) with
+        an already formatted message.
         """
+        if isinstance(message, c.LogLevel):
+            level = message
+            if not self.is_enabled(level, subsystem):
+                return
+            message = args[0].format(*args[1:]) if len(args) > 1 else args[0]
+        else:
+            level = c.LogLevel.DEBUG if args and args[0] else c.LogLevel.INFO
+            if not self.is_enabled(level, subsystem):
+                return
+        is_debug = level < c.LogLevel.INFO
         if not is_debug:
             self.logs.append(message)
         if self.write_to_file:
-            log_type = "DEBUG" if is_debug else "INFO"
-            with open(f"logs/log_{self.timestamp}.txt", "a") as file:
-                file.write(f"[{log_type}] {message}" + "\n")
-        elif is_debug:
+            if self.writer is None:
+                self.writer = LogWriter(
+                    os.path.join(c.LOG_DIRECTORY, f"log_{self.timestamp}.txt"),
+                    c.LOG_MAX_BYTES, c.LOG_BACKUP_COUNT,
+                    c.LOG_QUEUE_SIZE, c.LOG_FLUSH_INTERVAL
+                    )
+            self.writer.write(f"[{level.name}] {message}")
+        elif is_debug and self.print_debug:
             print(f"[DEBUG] {message}")
     
     def get_combat_logs(self):
@@ -29,4 +71,19 @@ class Logger:
         """
         combat_log = self.logs[:]
         self.logs.clear()
-        return combat_log
\ No newline at end of file
+        return combat_log
+
+    def flush(self):
+        """
+        Block until every queued log line has been written to the log file.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        """
+        Write any queued log lines and close the log file.
+        """
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
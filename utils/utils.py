@@ -4,7 +4,6 @@ This module contains prototyping and JSON loading logic.
 import json
 import sys
 from abc import ABC, abstractmethod
-from random import random
 
 def load_json(filepath: str):
     """
@@ -17,13 +16,18 @@ def load_json(filepath: str):
         print(f"Error loading JSON file {filepath}:")
         sys.exit(e)
 
-def roll_random_chance(chance: float, luck: int = 0) -> bool:
+def get_luck_chance(chance: float, luck: int) -> float:
     """
-    Determine if a random chance roll is successful.
+    Get the chance of a roll succeeding once luck is taken into account.
     """
     chance += luck * (1 - chance) * 0.01
-    chance = min(max(chance, 0), 1)
-    return random() <= chance
+    return min(max(chance, 0), 1)
+
+def roll_random_chance(chance: float, luck: int, rng) -> bool:
+    """
+    Determine if a random chance roll is successful.
+    """
+    return rng.random() <= get_luck_chance(chance, luck)
 
 class Prototype(ABC):
     """